@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+Bulk Render Benchmark
+Compare rendering the configuration space one document at a time
+(build_claude_md_content + SHA-256 per configuration) with the
+prefix-sharing BulkRenderer, and check that both produce the same hash
+and size for every configuration the naive pass covered.
+
+The naive pass is limited to --naive-limit configurations (spread evenly
+over the space) so it finishes in reasonable time; its throughput is
+extrapolated to the whole space.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bulk_render import LEVEL_FIELDS, BulkRenderer, ConfigSpace  # noqa: E402
+from template_manager import TemplateManager  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark prefix-sharing bulk rendering')
+    parser.add_argument('--max-languages', type=int, default=2)
+    parser.add_argument('--max-frameworks', type=int, default=1)
+    parser.add_argument('--max-databases', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for the bulk render (default: 1)')
+    parser.add_argument('--naive-limit', type=int, default=20000,
+                        help='Configurations rendered one at a time for comparison (default: 20000)')
+    args = parser.parse_args()
+
+    space = ConfigSpace(args.max_languages, args.max_frameworks, args.max_databases)
+    total = space.count()
+
+    with tempfile.TemporaryDirectory(prefix="new-claude-bulk-") as work_dir:
+        output_path = Path(work_dir) / "render.jsonl"
+        summary = BulkRenderer(space).render_all(output_path, workers=args.workers)
+
+        # Naive pass over an evenly spaced sample of the same records
+        step = max(1, total // args.naive_limit)
+        template_manager = TemplateManager(on_warning=lambda message: None)
+        mismatches = checked = 0
+        naive_seconds = 0.0
+        with open(output_path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f):
+                if number % step:
+                    continue
+                record = json.loads(line)
+                start = time.perf_counter()
+                content = template_manager.build_claude_md_content(record['config'], "project", reproducible=True)
+                data = content.encode('utf-8')
+                content_hash = hashlib.sha256(data).hexdigest()
+                naive_seconds += time.perf_counter() - start
+                checked += 1
+                if content_hash != record['sha256'] or len(data) != record['bytes']:
+                    mismatches += 1
+                    if mismatches == 1:
+                        print(f"❌ Mismatch for {json.dumps({k: record['config'][k] for k in LEVEL_FIELDS})}")
+
+    naive_rate = checked / naive_seconds
+    report = {
+        'configurations': total,
+        'bulk': {
+            'workers': args.workers,
+            'seconds': round(summary.seconds, 3),
+            'documents_per_second': round(summary.documents / summary.seconds),
+            'distinct_documents': summary.distinct,
+            'megabytes': round(summary.bytes / 1e6, 1),
+        },
+        'naive': {
+            'sampled': checked,
+            'documents_per_second': round(naive_rate),
+            'estimated_seconds': round(total / naive_rate, 1),
+        },
+        'speedup': round((summary.documents / summary.seconds) / naive_rate, 1),
+        'mismatches': mismatches,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
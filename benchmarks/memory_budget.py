@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+Memory Budget Benchmark
+Render --count configurations (default 100,000) one at a time through
+TemplateManager.build_claude_md_content under tracemalloc, hashing and
+discarding each document as a batch job would, and fail if memory is not
+bounded: the traced peak must stay under --max-peak-mb and the growth
+between the first and last document checkpoints (after template caches
+have warmed up) under --max-growth-mb.
+
+The report lists traced memory and the top growing allocation sites at
+every checkpoint, so a regression points at the line that retains memory.
+--mode bulk runs the same check against the prefix-sharing BulkRenderer.
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bulk_render import LEVEL_FIELDS, BulkRenderer, ConfigSpace  # noqa: E402
+from memory_trace import MemoryTracer  # noqa: E402
+from template_manager import TemplateManager  # noqa: E402
+
+
+def render_naive(space: ConfigSpace, count: int, tracer: MemoryTracer) -> int:
+    """Render the first `count` configurations of the space one document at a time."""
+    with tracer.phase("load templates"):
+        template_manager = TemplateManager(on_warning=lambda message: None)
+        template_manager.prefetch_templates(include_base=True, **template_manager.get_available_templates())
+
+    with tracer.phase("render"):
+        rendered = 0
+        for config in itertools.islice(space.prefixes(len(LEVEL_FIELDS)), count):
+            content = template_manager.build_claude_md_content(config, "project", reproducible=True)
+            hashlib.sha256(content.encode('utf-8')).hexdigest()
+            rendered += 1
+            tracer.document_done()
+    return rendered
+
+
+def render_bulk(space: ConfigSpace, tracer: MemoryTracer) -> int:
+    """Render the whole space with the BulkRenderer, discarding the records."""
+    with tempfile.TemporaryDirectory(prefix="new-claude-memory-") as work_dir:
+        summary = BulkRenderer(space, tracer=tracer).render_all(Path(work_dir) / "render.jsonl")
+    return summary.documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that bulk rendering runs in bounded memory')
+    parser.add_argument('--count', type=int, default=100000, help='Configurations to render in naive mode (default: 100000); bulk renders the whole space')
+    parser.add_argument('--mode', choices=('naive', 'bulk'), default='naive',
+                        help='naive: TemplateManager per document; bulk: BulkRenderer over the space')
+    parser.add_argument('--every', type=int, default=10000, help='Documents between snapshots (default: 10000)')
+    parser.add_argument('--top', type=int, default=5, help='Allocation sites per checkpoint (default: 5)')
+    parser.add_argument('--max-peak-mb', type=float, default=64.0, help='Peak traced memory budget (default: 64)')
+    parser.add_argument('--max-growth-mb', type=float, default=2.0,
+                        help='Allowed growth after the first document checkpoint (default: 2)')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    # Widen the default space until it holds --count configurations
+    space = ConfigSpace()
+    while space.count() < args.count and space.max_databases < 4:
+        space = ConfigSpace(space.max_languages, space.max_frameworks, space.max_databases + 1)
+
+    with MemoryTracer(every=args.every, top=args.top) as tracer:
+        if args.mode == 'naive':
+            documents = render_naive(space, args.count, tracer)
+        else:
+            documents = render_bulk(space, tracer)
+        lines = tracer.format_report()
+        summary = tracer.report()
+
+    for line in lines:
+        print(line)
+
+    failures = []
+    if summary['peak_bytes'] > args.max_peak_mb * 1e6:
+        failures.append(f"peak {summary['peak_bytes'] / 1e6:.2f} MB exceeds {args.max_peak_mb} MB")
+    if summary['steady_growth_bytes'] is None:
+        failures.append("fewer than two document checkpoints; lower --every or raise --count")
+    elif summary['steady_growth_bytes'] > args.max_growth_mb * 1e6:
+        failures.append(f"grew {summary['steady_growth_bytes'] / 1e6:.2f} MB after warm-up "
+                        f"(budget {args.max_growth_mb} MB)")
+
+    report = {
+        'mode': args.mode,
+        'documents': documents,
+        'peak_mb': round(summary['peak_bytes'] / 1e6, 3),
+        'steady_growth_mb': (round(summary['steady_growth_bytes'] / 1e6, 3)
+                             if summary['steady_growth_bytes'] is not None else None),
+        'budget': {'max_peak_mb': args.max_peak_mb, 'max_growth_mb': args.max_growth_mb},
+        'failures': failures,
+        'checkpoints': summary['checkpoints'],
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding='utf-8')
+
+    for failure in failures:
+        print(f"❌ Memory budget exceeded: {failure}")
+    if not failures:
+        print(f"✅ {documents:,} documents within budget "
+              f"(peak {report['peak_mb']} MB, growth {report['steady_growth_mb']:+} MB)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
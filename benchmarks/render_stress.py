@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+Render Stress Benchmark
+Hammer the embeddable render() API from a worker pool and report how
+throughput scales with the number of workers. Every render is checked
+against a single-threaded reference to catch shared-state corruption.
+
+Thread pools prove render() is safe to call concurrently; rendering is
+CPU-bound, so under the GIL thread throughput plateaus. Use
+--executor process to measure the near-linear scaling of a
+process-per-core deployment.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from renderer import render  # noqa: E402
+
+
+SAMPLE_CONFIGS = [
+    {
+        'project_type': "Backend API Service",
+        'languages': ["Python"],
+        'frameworks': ["Django"],
+        'cloud_platform': "AWS",
+        'databases': ["PostgreSQL", "Redis"],
+        'additional_tools': ["Docker", "GitHub Actions"],
+    },
+    {
+        'project_type': "Full-Stack Web Application",
+        'languages': ["TypeScript", "JavaScript"],
+        'frameworks': ["Next.js", "Express"],
+        'cloud_platform': "Google Cloud Platform (GCP)",
+        'databases': ["MongoDB"],
+        'additional_tools': ["Kubernetes"],
+    },
+    {
+        'project_type': "CLI Tool/Utility",
+        'languages': ["Go"],
+        'frameworks': [],
+        'cloud_platform': None,
+        'databases': [],
+        'additional_tools': [],
+    },
+]
+
+
+_expected = None
+
+
+def render_and_check(index: int) -> bool:
+    """Render one sample config and compare it with the reference output."""
+    global _expected
+    if _expected is None:
+        _expected = [render(config, "stress").claude_md for config in SAMPLE_CONFIGS]
+    config = SAMPLE_CONFIGS[index % len(SAMPLE_CONFIGS)]
+    return render(config, "stress").claude_md == _expected[index % len(SAMPLE_CONFIGS)]
+
+
+def run_level(executor: str, workers: int, renders: int) -> dict:
+    """Run `renders` renders on a pool of `workers` and verify every output."""
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        # Warm every worker (imports, template cache) outside the timed region
+        list(pool.map(render_and_check, range(workers)))
+
+        start = time.perf_counter()
+        results = list(pool.map(render_and_check, range(renders), chunksize=max(1, renders // (workers * 8))))
+        elapsed = time.perf_counter() - start
+
+    return {
+        'executor': executor,
+        'workers': workers,
+        'renders': renders,
+        'seconds': round(elapsed, 4),
+        'renders_per_second': round(renders / elapsed, 1),
+        'mismatches': results.count(False),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent stress test for render()')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread',
+                        help='Worker pool type (default: thread)')
+    parser.add_argument('--workers', default='1,2,4,8',
+                        help='Comma-separated worker counts (default: 1,2,4,8)')
+    parser.add_argument('--renders-per-worker', type=int, default=500,
+                        help='Renders per worker at each level (default: 500)')
+    parser.add_argument('--min-efficiency', type=float, default=0.0,
+                        help='Fail if throughput per worker drops below this fraction of the 1-worker rate')
+    args = parser.parse_args()
+
+    levels = [int(w) for w in args.workers.split(',')]
+
+    results = []
+    for workers in levels:
+        results.append(run_level(args.executor, workers, workers * args.renders_per_worker))
+
+    base_rate = results[0]['renders_per_second'] / results[0]['workers']
+    for result in results:
+        result['scaling_efficiency'] = round(result['renders_per_second'] / (base_rate * result['workers']), 3)
+
+    print(json.dumps(results, indent=2))
+
+    failed = False
+    for result in results:
+        if result['mismatches']:
+            print(f"❌ {result['mismatches']} inconsistent renders at {result['workers']} workers")
+            failed = True
+        if result['scaling_efficiency'] < args.min_efficiency:
+            print(f"❌ Scaling efficiency {result['scaling_efficiency']} at {result['workers']} workers "
+                  f"is below {args.min_efficiency}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
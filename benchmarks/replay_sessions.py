@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Session Replay Benchmark
+Drive the complete create_project flow headlessly from a recorded session
+(new-claude --record-session FILE <dir>) and time every step: the work
+before each prompt, and the work after the last answer (file generation
+and summary). Each run creates a fresh project in a temporary directory.
+
+If the session was recorded with --reproducible or --timestamp, every run's
+generated files are also compared with the recorded hashes, so the replay
+doubles as an end-to-end regression test.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from build_cache import BuildCache  # noqa: E402
+from new_claude import ClaudeProjectCreator  # noqa: E402
+from session import SessionExhausted, SessionReplay, load_session  # noqa: E402
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(seconds: list) -> dict:
+    """Latency summary in milliseconds."""
+    return {
+        'mean_ms': round(statistics.fmean(seconds) * 1000, 3),
+        'p50_ms': round(percentile(seconds, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(seconds, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(seconds, 0.99) * 1000, 3),
+    }
+
+
+def replay_once(session: dict, replay: SessionReplay, work_dir: Path, run: int, options: dict) -> dict:
+    """Replay the session once into a fresh directory."""
+    project_path = f"run-{run:05d}/{session['project_name']}"
+    creator = ClaudeProjectCreator(input_source=replay)
+    creator.build_cache = BuildCache(work_dir / "cache")
+
+    replay.restart()
+    start = time.perf_counter()
+    error = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            exit_code = creator.create_project(project_path, **options)
+        except SessionExhausted as e:
+            exit_code, error = 1, str(e)
+    replay.finish()
+    elapsed = time.perf_counter() - start
+
+    mismatched = []
+    if session.get('outputs') and exit_code == 0:
+        hashes = creator.hash_generated_files(work_dir / project_path)
+        mismatched = [name for name, digest in session['outputs'].items() if hashes.get(name) != digest]
+
+    return {
+        'exit_code': exit_code,
+        'error': error or (f"{replay.remaining} recorded answers unused" if replay.remaining else None),
+        'seconds': elapsed,
+        'steps': list(replay.step_seconds),
+        'prompts': list(replay.prompts),
+        'mismatched': mismatched,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded wizard session headlessly')
+    parser.add_argument('session', help='Session file written by new-claude --record-session')
+    parser.add_argument('--runs', type=int, default=1000, help='Number of end-to-end runs (default: 1000)')
+    parser.add_argument('--no-cache', action='store_true', help='Render every run instead of using the build cache')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    session = load_session(Path(args.session))
+    options = dict(session.get('options', {}))
+    if args.no_cache:
+        options['use_cache'] = False
+    replay = SessionReplay.from_session(session)
+
+    runs = []
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="new-claude-replay-") as work_dir:
+        os.chdir(work_dir)
+        try:
+            start = time.perf_counter()
+            for run in range(args.runs):
+                runs.append(replay_once(session, replay, Path(work_dir), run, options))
+            total = time.perf_counter() - start
+        finally:
+            os.chdir(original_cwd)
+
+    # Step i is the work done before prompt i; the final step is everything after the last answer
+    step_count = max(len(run['steps']) for run in runs)
+    prompts = max((run['prompts'] for run in runs), key=len)
+    steps = []
+    for index in range(step_count):
+        samples = [run['steps'][index] for run in runs if len(run['steps']) > index]
+        label = prompts[index].strip() if index < len(prompts) else "after last answer"
+        steps.append({'step': index + 1, 'before': label, **summarize(samples)})
+
+    failures = [run for run in runs if run['exit_code'] != 0 or run['error']]
+    mismatches = [run for run in runs if run['mismatched']]
+    report = {
+        'session': args.session,
+        'runs': args.runs,
+        'seconds': round(total, 3),
+        'sessions_per_second': round(args.runs / total, 1),
+        'end_to_end': summarize([run['seconds'] for run in runs]),
+        'steps': steps,
+        'failures': len(failures),
+        'output_mismatches': len(mismatches),
+        'verified_outputs': sorted(session.get('outputs', {})),
+    }
+
+    report_json = json.dumps(report, indent=2, ensure_ascii=False)
+    print(report_json)
+    if args.output:
+        Path(args.output).write_text(report_json + "\n", encoding='utf-8')
+
+    if failures:
+        print(f"❌ {len(failures)} runs failed (first: {failures[0]['error'] or 'exit code ' + str(failures[0]['exit_code'])})")
+    if mismatches:
+        print(f"❌ {len(mismatches)} runs produced different files: {', '.join(mismatches[0]['mismatched'])}")
+    sys.exit(1 if failures or mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,9 @@ import { promisify } from 'util';
 
 const execAsync = promisify(exec);
 
+// MCP_TIMING_LOG=1 logs "[timing] tool=<name> ms=<duration>" to stderr for every tool call
+const TIMING_LOG = ['1', 'true', 'yes'].includes((process.env.MCP_TIMING_LOG || '').toLowerCase());
+
 class IntelliJMCPServer {
     constructor(projectPath) {
         this.projectPath = path.resolve(projectPath);
@@ -113,36 +116,58 @@ class IntelliJMCPServer {
         }));
 
         // Handle tool calls
-        this.server.setRequestHandler(CallToolRequestSchema, async (request) => {
-            const { name, arguments: args } = request.params;
-
+        // extra.signal aborts when the client sends notifications/cancelled for the request
+        this.server.setRequestHandler(CallToolRequestSchema, async (request, extra) => {
+            if (!TIMING_LOG) {
+                return this.callTool(request, extra?.signal);
+            }
+            const start = performance.now();
+            let status = 'ok';
             try {
-                switch (name) {
-                    case 'read_file':
-                        return await this.readFile(args.path);
-                    case 'write_file':
-                        return await this.writeFile(args.path, args.content);
-                    case 'list_files':
-                        return await this.listFiles(args.directory || '.', args.pattern);
-                    case 'execute_command':
-                        return await this.executeCommand(args.command);
-                    case 'project_structure':
-                        return await this.getProjectStructure(args.maxDepth || 3);
-                    case 'git_status':
-                        return await this.getGitStatus();
-                    case 'find_class':
-                        return await this.findClass(args.className);
-                    default:
-                        throw new Error(`Unknown tool: ${name}`);
+                const result = await this.callTool(request, extra?.signal);
+                if (result.content?.[0]?.text?.startsWith('Error: ')) {
+                    status = 'error';
                 }
+                return result;
             } catch (error) {
-                return {
-                    content: [{ type: 'text', text: `Error: ${error.message}` }]
-                };
+                status = 'error';
+                throw error;
+            } finally {
+                const ms = (performance.now() - start).toFixed(3);
+                console.error(`[timing] tool=${request.params.name} ms=${ms} status=${status}`);
             }
         });
     }
 
+    async callTool(request, signal) {
+        const { name, arguments: args } = request.params;
+
+        try {
+            switch (name) {
+                case 'read_file':
+                    return await this.readFile(args.path);
+                case 'write_file':
+                    return await this.writeFile(args.path, args.content);
+                case 'list_files':
+                    return await this.listFiles(args.directory || '.', args.pattern, signal);
+                case 'execute_command':
+                    return await this.executeCommand(args.command, signal);
+                case 'project_structure':
+                    return await this.getProjectStructure(args.maxDepth || 3);
+                case 'git_status':
+                    return await this.getGitStatus();
+                case 'find_class':
+                    return await this.findClass(args.className, signal);
+                default:
+                    throw new Error(`Unknown tool: ${name}`);
+            }
+        } catch (error) {
+            return {
+                content: [{ type: 'text', text: `Error: ${error.message}` }]
+            };
+        }
+    }
+
     async readFile(filePath) {
         const fullPath = path.join(this.projectPath, filePath);
         const content = await fs.readFile(fullPath, 'utf-8');
@@ -160,15 +185,16 @@ class IntelliJMCPServer {
         };
     }
 
-    async listFiles(directory, pattern) {
+    async listFiles(directory, pattern, signal) {
         const fullPath = path.join(this.projectPath, directory);
-        const files = await this.walkDirectory(fullPath, pattern);
+        const files = await this.walkDirectory(fullPath, pattern, signal);
         return {
             content: [{ type: 'text', text: files.join('\n') }]
         };
     }
 
-    async walkDirectory(dir, pattern) {
+    async walkDirectory(dir, pattern, signal) {
+        if (signal?.aborted) throw signal.reason ?? new Error('Aborted');
         const files = [];
         const entries = await fs.readdir(dir, { withFileTypes: true });
         
@@ -177,7 +203,7 @@ class IntelliJMCPServer {
             const relativePath = path.relative(this.projectPath, fullPath);
             
             if (entry.isDirectory() && !entry.name.startsWith('.')) {
-                files.push(...await this.walkDirectory(fullPath, pattern));
+                files.push(...await this.walkDirectory(fullPath, pattern, signal));
             } else if (entry.isFile()) {
                 if (!pattern || entry.name.match(pattern)) {
                     files.push(relativePath);
@@ -188,9 +214,10 @@ class IntelliJMCPServer {
         return files;
     }
 
-    async executeCommand(command) {
+    async executeCommand(command, signal) {
         try {
-            const { stdout, stderr } = await execAsync(command, { cwd: this.projectPath });
+            // Aborting kills the child process
+            const { stdout, stderr } = await execAsync(command, { cwd: this.projectPath, signal });
             return {
                 content: [{ 
                     type: 'text', 
@@ -262,8 +289,8 @@ class IntelliJMCPServer {
         }
     }
 
-    async findClass(className) {
-        const javaFiles = await this.walkDirectory(this.projectPath, /\.(java|kt)$/);
+    async findClass(className, signal) {
+        const javaFiles = await this.walkDirectory(this.projectPath, /\.(java|kt)$/, signal);
         const matches = [];
         
         for (const file of javaFiles) {
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+"""
+MCP Stub Server
+Stand-in for intellij-mcp-server.js over a synthetic in-memory project
+
+Implements the same seven tools with the same result formats, but over a
+generated project tree held in memory, with a fixed, configurable
+latency per call and configurable file sizes. Benchmarking
+mcp-test-client.py against it measures the client (framing, dispatch,
+pipelining) without Node, disk or page-cache noise, and the numbers
+repeat from run to run:
+
+    python3 mcp-test-client.py mcp-stub-server.py --bench \\
+        --server-args "--latency-ms 2 --file-bytes 65536"
+
+execute_command does not run anything; it echoes the command.
+write_file edits the in-memory tree, and the file then shows up as
+modified in git_status.
+"""
+
+import argparse
+import asyncio
+import random
+import re
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional
+
+from mcp_stdio_server import StdioMCPServer, ToolError
+
+WORDS = ("alpha", "bravo", "delta", "kernel", "vector", "signal", "buffer", "cursor", "widget", "ledger")
+
+
+class SyntheticProject:
+    """A deterministic project tree of Java, Python and Markdown files"""
+
+    def __init__(self, name: str = "project", files: int = 200, fanout: int = 4, depth: int = 3,
+                 file_bytes: int = 2048, seed: int = 0):
+        self.name = name
+        self.files: Dict[str, str] = {}
+        self.modified: List[str] = []
+        rng = random.Random(seed)
+        directories = ["src"]
+        for level in range(1, depth):
+            directories += [f"{parent}/{WORDS[(index + level) % len(WORDS)]}{level}"
+                            for parent in directories if parent.count('/') == level - 1
+                            for index in range(fanout)]
+
+        self.files["README.md"] = self._pad(f"# {name}\n\nSynthetic project for MCP benchmarks.\n", file_bytes, rng)
+        # find_class's default in the benchmark looks for Main
+        self.files["src/Main.java"] = self._pad("public class Main {\n", file_bytes - 2, rng, "    // ") + "}\n"
+        for number in range(max(0, files - 2)):
+            directory = directories[number % len(directories)]
+            kind = (number + number // len(directories)) % 3
+            if kind == 0:
+                class_name = f"{WORDS[number % len(WORDS)].capitalize()}Service{number}"
+                package = directory.replace('/', '.')
+                header = f"package {package};\n\npublic class {class_name} {{\n"
+                self.files[f"{directory}/{class_name}.java"] = self._pad(header, file_bytes - 2, rng, "    // ") + "}\n"
+            elif kind == 1:
+                header = f'"""{WORDS[number % len(WORDS)]} module {number}"""\n\n'
+                self.files[f"{directory}/module_{number}.py"] = self._pad(header, file_bytes, rng, "# ")
+            else:
+                header = f"# Notes {number}\n\n"
+                self.files[f"{directory}/notes_{number}.md"] = self._pad(header, file_bytes, rng)
+
+    @staticmethod
+    def _pad(text: str, size: int, rng: random.Random, prefix: str = "") -> str:
+        """Fill text with word lines up to about `size` characters"""
+        lines = [text]
+        length = len(text)
+        while length < size:
+            line = prefix + " ".join(rng.choice(WORDS) for _ in range(8)) + "\n"
+            lines.append(line)
+            length += len(line)
+        return "".join(lines)
+
+    def _resolve(self, path: str) -> str:
+        """Normalize a project-relative path ('.' is the root)"""
+        parts = [part for part in PurePosixPath(path).parts if part not in ('.', '/')]
+        if '..' in parts:
+            raise ToolError(f"Path outside the project: {path}")
+        return "/".join(parts)
+
+    def read(self, path: str) -> str:
+        key = self._resolve(path)
+        if key not in self.files:
+            raise ToolError(f"ENOENT: no such file or directory, open '{key}'")
+        return self.files[key]
+
+    def write(self, path: str, content: str):
+        key = self._resolve(path)
+        self.files[key] = content
+        if key not in self.modified:
+            self.modified.append(key)
+
+    def walk(self, directory: str = ".", pattern: Optional[str] = None) -> List[str]:
+        """Files under a directory in sorted order; pattern is a regex on the file name"""
+        prefix = self._resolve(directory)
+        prefix = prefix + "/" if prefix else ""
+        regex = re.compile(pattern) if pattern else None
+        return [
+            path for path in sorted(self.files)
+            if path.startswith(prefix) and not any(part.startswith('.') for part in path.split('/')[:-1])
+            and (regex is None or regex.search(path.rsplit('/', 1)[-1]))
+        ]
+
+    def tree(self, max_depth: int) -> str:
+        """The project tree in the format of intellij-mcp-server.js"""
+        root: Dict[str, dict] = {}
+        for path in self.files:
+            node = root
+            parts = path.split('/')
+            for part in parts[:max_depth]:
+                node = node.setdefault(part, {})
+
+        lines = [f"└── {self.name}\n"]
+
+        def add(children: Dict[str, dict], prefix: str):
+            names = sorted(children)
+            for index, name in enumerate(names):
+                last = index == len(names) - 1
+                lines.append(f"{prefix}{'└── ' if last else '├── '}{name}\n")
+                add(children[name], prefix + ('    ' if last else '│   '))
+
+        add(root, "    ")
+        return "".join(lines)
+
+
+def parse_latencies(spec: str) -> Dict[str, float]:
+    """Parse 'tool=ms,...'"""
+    latencies = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, value = item.partition('=')
+        latencies[name] = float(value)
+    return latencies
+
+
+def build_server(project: SyntheticProject, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 tool_latency_ms: Optional[Dict[str, float]] = None, seed: int = 0) -> StdioMCPServer:
+    """
+    Register the intellij-mcp-server.js tools over a synthetic project.
+
+    Args:
+        project: The in-memory tree
+        latency_ms: Delay added to every call
+        jitter_ms: Uniform random extra delay up to this much (seeded)
+        tool_latency_ms: Per-tool delays replacing latency_ms
+        seed: Seed for the jitter
+
+    Returns:
+        The server, ready to run
+    """
+    server = StdioMCPServer("mcp-stub-server")
+    rng = random.Random(seed)
+    tool_latency_ms = tool_latency_ms or {}
+
+    async def delay(tool: str):
+        seconds = (tool_latency_ms.get(tool, latency_ms) + (rng.uniform(0, jitter_ms) if jitter_ms else 0)) / 1000
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    @server.tool("read_file", "Read the contents of a file",
+                 {"path": {"type": "string", "description": "File path relative to project root"}}, ["path"])
+    async def read_file(path: str) -> str:
+        await delay("read_file")
+        return project.read(path)
+
+    @server.tool("write_file", "Write content to a file", {
+        "path": {"type": "string", "description": "File path relative to project root"},
+        "content": {"type": "string", "description": "Content to write"},
+    }, ["path", "content"])
+    async def write_file(path: str, content: str) -> str:
+        await delay("write_file")
+        project.write(path, content)
+        return f"File written successfully: {path}"
+
+    @server.tool("list_files", "List files in a directory", {
+        "directory": {"type": "string", "description": "Directory path relative to project root"},
+        "pattern": {"type": "string", "description": "File pattern (e.g., *.java)"},
+    })
+    async def list_files(directory: str = ".", pattern: Optional[str] = None) -> str:
+        await delay("list_files")
+        return "\n".join(project.walk(directory, pattern))
+
+    @server.tool("execute_command", "Execute a command in the project directory",
+                 {"command": {"type": "string", "description": "Command to execute"}}, ["command"])
+    async def execute_command(command: str) -> str:
+        await delay("execute_command")
+        return f"Command: {command}\n\nOutput:\n\n"
+
+    @server.tool("project_structure", "Get the project structure",
+                 {"maxDepth": {"type": "number", "description": "Maximum depth to traverse"}})
+    async def project_structure(maxDepth: int = 3) -> str:
+        await delay("project_structure")
+        return project.tree(int(maxDepth or 3))
+
+    @server.tool("git_status", "Get git status of the project")
+    async def git_status() -> str:
+        await delay("git_status")
+        status = "".join(f" M {path}\n" for path in project.modified) or "Working directory clean"
+        return f"Git Status:\n{status}"
+
+    @server.tool("find_class", "Find Java/Kotlin classes by name",
+                 {"className": {"type": "string", "description": "Class name to search for"}}, ["className"])
+    async def find_class(className: str) -> str:
+        await delay("find_class")
+        matches = [
+            path for path in project.walk(".", r"\.(java|kt)$")
+            if f"class {className}" in project.files[path] or f"interface {className}" in project.files[path]
+        ]
+        if matches:
+            return f"Found {className} in:\n" + "\n".join(matches)
+        return f"No classes found matching: {className}"
+
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MCP stub server over a synthetic in-memory project')
+    parser.add_argument('project_path', nargs='?', default='project',
+                        help='Only its name is used, as the root of the synthetic tree')
+    parser.add_argument('--files', type=int, default=200, help='Files in the synthetic project (default: 200)')
+    parser.add_argument('--file-bytes', type=int, default=2048,
+                        help='Approximate size of each file, i.e. of read_file results (default: 2048)')
+    parser.add_argument('--fanout', type=int, default=4, help='Subdirectories per directory (default: 4)')
+    parser.add_argument('--depth', type=int, default=3, help='Directory levels under src/ (default: 3)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every call (default: 0)')
+    parser.add_argument('--latency', default='', help='Per-tool delays as tool=ms,... (override --latency-ms)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Seeded random extra delay up to this much')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the project contents and jitter')
+    args = parser.parse_args()
+
+    project = SyntheticProject(PurePosixPath(args.project_path).name or "project", args.files, args.fanout,
+                               args.depth, args.file_bytes, args.seed)
+    server = build_server(project, args.latency_ms, args.jitter_ms, parse_latencies(args.latency), args.seed)
+    server.log(f"MCP stub server running with {len(project.files)} synthetic files")
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,66 +3,782 @@
 """
 MCP Test Client
 Test and debug MCP servers independently
+
+Requests are pipelined over the server's stdio connection: every request
+gets its own ID, a background reader routes each response to the caller
+waiting for that ID, and server notifications are collected separately,
+so any number of tools/call requests can be in flight at once.
+
+--bench load-tests a server: concurrent workers issue a weighted mix of
+tool calls for a fixed duration, and the JSON report (throughput, latency
+percentiles and error rate per tool) can be saved as a baseline and
+compared against on later runs.
+
+Server output is split into messages by MessageFramer rather than
+StreamReader.readline, so there is no 64 KiB line limit; optionally,
+large string values (file contents, long listings) are decoded straight
+into spill files while the message streams in, instead of being held in
+memory.
+
+The server's stderr is drained continuously into a ring buffer (a full
+pipe would stall the server); the recent lines are shown when the
+connection fails. With --server-timing the server is started with
+MCP_TIMING_LOG=1 and the "[timing] tool=... ms=..." lines it then logs are
+collected, so benchmark reports can set server-side latency next to the
+client-side numbers.
+
+MCPServerPool runs N server processes for the same project, each with its
+own pipelined connection, sends every call to the worker with the fewest
+calls in flight and restarts workers that crash; --bench --workers N
+benchmarks a pool and --scaling 1,2,4 shows how throughput scales with
+the pool size.
+
+--record TRACE writes every JSON-RPC message with its timestamp to a JSONL
+trace; --replay TRACE re-issues the recorded requests against a server,
+at their original times or as fast as possible, and diffs each result and
+latency against the recording.
+
+Calls can be bounded by a per-call --timeout (a timed-out request is
+withdrawn with an MCP notifications/cancelled message, and the call
+raises MCPTimeout) and the whole run by --deadline; --max-in-flight caps
+the requests outstanding per connection, so callers beyond the window wait
+for a slot instead of piling more work onto a slow server.
+
+Like a real MCP client, the client opens every connection with the
+initialize / notifications/initialized handshake and keeps the server's
+info, capabilities and tool list. It also times how the server comes up
+(process spawn, first byte on stdout, the initialize round trip and the
+first tool call); --cold-start N starts the server N times and reports
+percentiles of each phase, i.e. how soon a freshly launched server is
+usable.
 """
 
 import asyncio
+import itertools
 import json
+import os
+import random
+import re
+import shlex
+import shutil
+import statistics
 import sys
 import subprocess
+import tempfile
+import time
+from collections import deque
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import argparse
 
 
+class MCPError(RuntimeError):
+    """JSON-RPC error response from the server"""
+
+    def __init__(self, error: Dict[str, Any]):
+        self.code = error.get('code')
+        self.data = error.get('data')
+        super().__init__(f"Server error: {error}")
+
+
+class MCPTimeout(TimeoutError):
+    """A request got no response within its timeout"""
+
+    def __init__(self, method: str, timeout: float, sent: bool = True):
+        self.method = method
+        self.timeout = timeout
+        self.sent = sent  # False if it timed out waiting for an in-flight slot
+        where = "for a response" if sent else "for an in-flight slot"
+        super().__init__(f"{method} timed out after {timeout:g}s waiting {where}")
+
+
+class MessageTooLarge(ValueError):
+    """A server message exceeded the configured size limit"""
+
+
+class SpilledText:
+    """A string value that was written to a file instead of being kept in memory"""
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        self.size = size  # Bytes of UTF-8 text
+
+    def read(self, limit: int = -1) -> str:
+        """Read the text (or its first `limit` characters)"""
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read(limit)
+
+    def __repr__(self):
+        return f"SpilledText({str(self.path)!r}, {self.size})"
+
+
+def text_of(value: Any, limit: int = -1) -> str:
+    """A text value as a string, reading it back if it was spilled to a file"""
+    if isinstance(value, SpilledText):
+        return value.read(limit)
+    return value if limit < 0 else value[:limit]
+
+
+READ_CHUNK_BYTES = 256 * 1024
+SPILL_FLUSH_BYTES = 256 * 1024  # Spilled text is decoded and written in batches of about this size
+
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_SPILL_MARKER = "\x00spilled:"
+
+MAX_STDERR_LINE = 4096  # Longer stderr lines are truncated in the ring buffer
+_TIMING_LINE = re.compile(r'\[timing\]\s+(.*)')
+_TIMING_FIELD = re.compile(r'(\w+)=(\S+)')
+
+
+def parse_timing_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse a '[timing] tool=<name> ms=<duration> [key=value ...]' line logged by the server"""
+    match = _TIMING_LINE.search(line)
+    if not match:
+        return None
+    fields: Dict[str, Any] = dict(_TIMING_FIELD.findall(match.group(1)))
+    try:
+        fields['ms'] = float(fields['ms'])
+    except (KeyError, ValueError):
+        return None
+    if 'id' in fields and fields['id'].isdigit():
+        fields['id'] = int(fields['id'])
+    return fields if 'tool' in fields else None
+
+
+class MessageFramer:
+    """
+    Splits the server's output into newline-delimited JSON messages.
+
+    Messages may be any length (max_message_bytes turns overlong ones into
+    MessageTooLarge). With spill_threshold set, each message is scanned as it
+    arrives and any string value longer than the threshold is decoded into a
+    file under spill_dir as it streams in; the parsed message holds a
+    SpilledText in its place.
+    """
+
+    def __init__(self, max_message_bytes: Optional[int] = None, spill_threshold: Optional[int] = None,
+                 spill_dir: Optional[str] = None, on_invalid: Optional[Callable[[bytes], None]] = None):
+        self.max_message_bytes = max_message_bytes
+        self.spill_threshold = spill_threshold
+        self.spill_dir = Path(spill_dir) if spill_dir else Path(tempfile.gettempdir())
+        self.on_invalid = on_invalid
+        self._buffer = bytearray()  # Current message, minus spilled strings
+        self._carry = b''  # Incomplete escape sequence at the end of the last chunk
+        self._in_string = False
+        self._string_start = 0  # Offset in _buffer just after the current string's opening quote
+        self._spill = None  # Open spill file for the current string
+        self._spill_path: Optional[Path] = None
+        self._spill_size = 0
+        self._spill_pending = bytearray()  # Escaped text not yet decoded into the spill file
+        self._spill_escaped = False  # The spilled text so far ends with an unpaired backslash
+        self._spilled: List[SpilledText] = []
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Add bytes read from the server; returns the messages they complete"""
+        if self._carry:
+            data, self._carry = self._carry + data, b''
+        messages = []
+        start = 0
+        while start < len(data):
+            end = data.find(b'\n', start)
+            self._append(data, start, len(data) if end < 0 else end, end < 0)
+            if end < 0:
+                break
+            messages.extend(self._finish())
+            start = end + 1
+        return messages
+
+    def close(self) -> List[Any]:
+        """End of stream: returns the final message if it was not newline-terminated"""
+        if self._carry:
+            self._keep(self._carry)
+            self._carry = b''
+        return self._finish()
+
+    def _append(self, data: bytes, start: int, stop: int, at_chunk_end: bool):
+        """Add part of one message"""
+        if self.spill_threshold is None:
+            self._keep(data[start:stop])
+            return
+
+        position = start
+        while position < stop:
+            if not self._in_string:
+                quote = data.find(b'"', position, stop)
+                if quote < 0:
+                    self._keep(data[position:stop])
+                    return
+                self._keep(data[position:quote + 1])
+                self._in_string = True
+                self._string_start = len(self._buffer)
+                position = quote + 1
+                continue
+
+            if self._spill is not None:
+                position = self._spill_content(data, position, stop)
+                continue
+
+            match = _STRING_SPECIAL.search(data, position, stop)
+            special = match.start() if match else stop
+            if special > position:
+                self._string_content(data[position:special])
+                if self._spill is not None:  # The string just passed the threshold
+                    position = special
+                    continue
+            if match is None:
+                return
+            if data[special] == 0x22:  # Closing quote
+                self._end_string()
+                position = special + 1
+                continue
+
+            length = self._escape_length(data, special, stop)
+            if length == 0:
+                if at_chunk_end:
+                    self._carry = data[special:stop]
+                    return
+                length = stop - special  # Malformed; json.loads reports it
+            self._string_content(data[special:special + length])
+            position = special + length
+
+    @staticmethod
+    def _escape_length(data: bytes, index: int, stop: int) -> int:
+        """Length of the escape sequence at index (a surrogate pair counts as one); 0 if incomplete"""
+        if index + 1 >= stop:
+            return 0
+        if data[index + 1] != ord('u'):
+            return 2
+        if index + 6 > stop:
+            return 0
+        try:
+            code = int(data[index + 2:index + 6], 16)
+        except ValueError:
+            return 6
+        if 0xD800 <= code < 0xDC00:
+            if index + 12 > stop:
+                return 0
+            if data[index + 6:index + 8] == b'\\u':
+                return 12
+        return 6
+
+    def _keep(self, data: bytes):
+        """Add bytes to the in-memory message"""
+        self._buffer += data
+        if self.max_message_bytes is not None and len(self._buffer) > self.max_message_bytes:
+            raise MessageTooLarge(f"Server message exceeds {self.max_message_bytes:,} bytes")
+
+    def _string_content(self, data: bytes):
+        """Add string content to the message, spilling the string once it passes the threshold"""
+        self._keep(data)
+        if len(self._buffer) - self._string_start > self.spill_threshold:
+            self._spill_pending = bytearray(self._buffer[self._string_start:])
+            del self._buffer[self._string_start:]
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix="mcp-spill-", suffix=".txt", dir=self.spill_dir)
+            self._spill = os.fdopen(fd, 'wb')
+            self._spill_path = Path(path)
+            self._spill_size = 0
+            self._spill_escaped = False
+
+    def _spill_content(self, data: bytes, position: int, stop: int) -> int:
+        """Stream the rest of a spilled string to its file; returns where the scan continues"""
+        body_start = position
+        if self._spill_escaped and position < stop:  # This byte completes an escape from the last chunk
+            body_start += 1
+            self._spill_escaped = False
+        end = _STRING_BODY.match(data, body_start, stop).end()
+        closed = end < stop and data[end] == 0x22
+        if not closed and end < stop:  # Trailing backslash; its escaped byte is in the next chunk
+            self._spill_escaped = True
+            end = stop
+        self._spill_pending += data[position:end]
+        if closed:
+            self._end_string()
+            return end + 1
+        if len(self._spill_pending) >= SPILL_FLUSH_BYTES:
+            self._flush_spill(final=False)
+        return stop
+
+    def _flush_spill(self, final: bool):
+        """Decode pending escaped text into the spill file, keeping back incomplete sequences"""
+        pending = self._spill_pending
+        cut = len(pending) if final else self._safe_cut(pending)
+        if cut:
+            try:
+                data = json.loads(b'"' + pending[:cut] + b'"').encode('utf-8', 'surrogatepass')
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                data = bytes(pending[:cut])  # Malformed escapes: keep the raw text
+            self._spill.write(data)
+            self._spill_size += len(data)
+            del pending[:cut]
+
+    def _safe_cut(self, pending: bytearray) -> int:
+        """Longest prefix that ends neither inside an escape sequence nor inside a UTF-8 character"""
+        # Escapes are at most 12 bytes (a surrogate pair); start at the head of any backslash run
+        position = max(0, len(pending) - 12)
+        while position > 0 and pending[position - 1] == 0x5C:
+            position -= 1
+        while True:
+            index = pending.find(b'\\', position)
+            if index < 0:
+                break
+            length = self._escape_length(pending, index, len(pending))
+            if length == 0:
+                return index
+            position = index + length
+
+        for back in range(1, min(4, len(pending)) + 1):
+            byte = pending[-back]
+            if byte & 0xC0 != 0x80:  # Lead byte (or ASCII) of the last character
+                needed = 1 if byte < 0x80 else 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+                return len(pending) - back if needed > back else len(pending)
+        return len(pending)
+
+    def _end_string(self):
+        """Close the current string, leaving a placeholder for a spilled one"""
+        self._in_string = False
+        if self._spill is None:
+            self._keep(b'"')
+            return
+        self._flush_spill(final=True)
+        self._spill.close()
+        self._spill = None
+        self._spilled.append(SpilledText(self._spill_path, self._spill_size))
+        self._keep(json.dumps(f"{_SPILL_MARKER}{len(self._spilled) - 1}")[1:].encode())
+
+    def _finish(self) -> List[Any]:
+        """Parse the completed message"""
+        data, spilled = self._buffer, self._spilled
+        if self._spill is not None:  # Unterminated string
+            self._spill.close()
+            self._spill = None
+        self._buffer, self._spilled, self._in_string = bytearray(), [], False
+        self._spill_pending, self._spill_escaped = bytearray(), False
+        if not data.strip():
+            return []
+        try:
+            message = json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            if self.on_invalid:
+                self.on_invalid(bytes(data[:200]))
+            return []
+        return [self._restore(message, spilled) if spilled else message]
+
+    def _restore(self, value: Any, spilled: List[SpilledText]) -> Any:
+        """Swap spill placeholders for SpilledText"""
+        if isinstance(value, str) and value.startswith(_SPILL_MARKER):
+            return spilled[int(value[len(_SPILL_MARKER):])]
+        if isinstance(value, dict):
+            return {self._restore_key(key, spilled): self._restore(item, spilled) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._restore(item, spilled) for item in value]
+        return value
+
+    @staticmethod
+    def _restore_key(key: str, spilled: List[SpilledText]) -> str:
+        """Object keys must stay strings: read a spilled key back"""
+        if not key.startswith(_SPILL_MARKER):
+            return key
+        text = spilled[int(key[len(_SPILL_MARKER):])]
+        key = text.read()
+        text.path.unlink()
+        return key
+
+
+TRACE_VERSION = 1
+
+
+def _trace_default(value: Any) -> Any:
+    """JSON form of values that only exist client-side"""
+    if isinstance(value, SpilledText):
+        return {"$spilled": str(value.path), "bytes": value.size}
+    raise TypeError(f"Cannot record {type(value).__name__}")
+
+
+class TrafficRecorder:
+    """Writes JSON-RPC traffic to a JSONL trace"""
+
+    def __init__(self, path: str, server_path: str = "", project_path: str = ""):
+        self.path = Path(path)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._start = time.perf_counter()
+        self._connections = itertools.count()
+        self.messages = 0
+        self._write({
+            "type": "header",
+            "version": TRACE_VERSION,
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "server": str(server_path),
+            "project": str(project_path),
+        })
+
+    def new_connection(self) -> int:
+        """Number a client connection (request IDs are only unique per connection)"""
+        return next(self._connections)
+
+    def record(self, connection: int, direction: str, message: Any):
+        """Log one message ('out' to the server, 'in' from it)"""
+        self._write({
+            "t": round(time.perf_counter() - self._start, 6),
+            "conn": connection,
+            "direction": direction,
+            "message": message,
+        })
+        self.messages += 1
+
+    def _write(self, entry: Dict[str, Any]):
+        self._file.write(json.dumps(entry, default=_trace_default, ensure_ascii=False) + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+PROTOCOL_VERSION = "2025-06-18"
+SUPPORTED_PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
+CLIENT_INFO = {"name": "mcp-test-client", "version": "1.0.0"}
+
+# Start-up phases, in milliseconds since the spawn began
+STARTUP_PHASES = ("spawn_ms", "first_byte_ms", "initialize_rtt_ms", "ready_ms",
+                  "first_tool_call_rtt_ms", "first_tool_call_ms")
+
+
 class MCPTestClient:
-    def __init__(self, server_path: str, project_path: str):
+    def __init__(self, server_path: str, project_path: str, max_message_bytes: Optional[int] = None,
+                 spill_threshold: Optional[int] = None, spill_dir: Optional[str] = None,
+                 stderr_lines: int = 200, server_timing: bool = False,
+                 recorder: Optional[TrafficRecorder] = None, timeout: Optional[float] = None,
+                 max_in_flight: Optional[int] = None, server_args: List[str] = (), handshake: bool = True,
+                 startup_timeout: Optional[float] = None):
         self.server_path = Path(server_path).resolve()
         self.project_path = Path(project_path).resolve()
         self.process = None
+        self.max_message_bytes = max_message_bytes  # None: unbounded
+        self.spill_threshold = spill_threshold  # Spill strings longer than this many bytes to files
+        self.spill_dir = spill_dir  # Parent of this client's spill directory (default: system temp)
+        self._spill_root: Optional[str] = None  # Created on start, removed by cleanup()
+        self.server_timing = server_timing  # Ask the server to log per-call timing lines
+        self.server_args = list(server_args)  # Extra command-line arguments for the server
+        self.recorder = recorder
+        self._trace_connection = recorder.new_connection() if recorder else 0
+        self.timeout = timeout  # Default per-call timeout in seconds (None: wait forever)
+        self.max_in_flight = max_in_flight
+        self.timeouts = 0
+        self.handshake = handshake  # Send initialize / notifications/initialized on start
+        self.startup_timeout = startup_timeout  # For the handshake; `timeout` applies to later calls
+        self.protocol_version: Optional[str] = None  # Negotiated in the handshake
+        self.server_info: Dict[str, Any] = {}
+        self.server_capabilities: Dict[str, Any] = {}
+        self.instructions: Optional[str] = None
+        self.tools: Optional[List[Dict[str, Any]]] = None  # Cached tools/list; dropped on list_changed
+        self.startup: Dict[str, float] = {}  # Start-up timeline, see STARTUP_PHASES
+        self._started_at: Optional[float] = None
+        self.connection_error: Optional[BaseException] = None  # Why the connection stopped working
+        self.notifications = deque(maxlen=100)  # Most recent server notifications
+        self.stderr_lines = deque(maxlen=stderr_lines)  # Most recent server stderr lines
+        self.server_timings = deque(maxlen=100000)  # Parsed timing lines, oldest first
+        self.notification_handlers: List[Callable[[Dict[str, Any]], None]] = []
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._cancelled = set()  # Timed-out request IDs whose late responses are dropped silently
+        self._window = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._write_lock = asyncio.Lock()
 
-    async def start_server(self):
-        """Start the MCP server process"""
+    @property
+    def in_flight(self) -> int:
+        """Requests sent and not yet answered"""
+        return len(self._pending)
+
+    async def start_server(self, announce: bool = True):
+        """Start the MCP server process and open the session"""
+        env = dict(os.environ, MCP_TIMING_LOG='1') if self.server_timing else None
+        # Python servers (mcp-stub-server.py) run under this interpreter, the rest under Node
+        interpreter = sys.executable if self.server_path.suffix == '.py' else 'node'
+        if self.spill_threshold is not None and self._spill_root is None:
+            if self.spill_dir:
+                Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+            self._spill_root = tempfile.mkdtemp(prefix="mcp-spill-", dir=self.spill_dir)
+        self._started_at = time.perf_counter()
         self.process = await asyncio.create_subprocess_exec(
-            'node', str(self.server_path), str(self.project_path),
+            interpreter, str(self.server_path), str(self.project_path), *self.server_args,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stderr=asyncio.subprocess.PIPE,
+            env=env
         )
-        print(f"✅ Started MCP server for: {self.project_path}")
+        self.startup = {"spawn_ms": self._since_start()}
+        self._reader_task = asyncio.create_task(self._read_messages())
+        self._stderr_task = asyncio.create_task(self._pump_stderr())
+        if self.handshake:
+            await self.initialize()
+        if announce:
+            print(f"✅ Started MCP server for: {self.project_path}")
+            if self.server_info:
+                print(f"🤝 {self.server_info.get('name', '?')} {self.server_info.get('version', '')} "
+                      f"(protocol {self.protocol_version}) ready in {self.startup['ready_ms']:.1f} ms")
+
+    def _since_start(self) -> float:
+        """Milliseconds since the server process was spawned"""
+        return round((time.perf_counter() - self._started_at) * 1000, 3)
+
+    async def initialize(self) -> Dict[str, Any]:
+        """
+        MCP handshake: initialize, then notifications/initialized.
+
+        Returns:
+            The initialize result; its server info, capabilities and
+            instructions are kept on the client
+        """
+        sent = time.perf_counter()
+        # The server may still be starting up, so the per-call timeout does not apply (0: no timeout)
+        result = await self.send_request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": CLIENT_INFO,
+        }, timeout=self.startup_timeout or 0)
+        self.startup["initialize_rtt_ms"] = round((time.perf_counter() - sent) * 1000, 3)
+        self.protocol_version = result.get("protocolVersion")
+        if self.protocol_version not in SUPPORTED_PROTOCOL_VERSIONS:
+            print(f"⚠️  Server chose unsupported protocol version {self.protocol_version!r}")
+        self.server_info = result.get("serverInfo") or {}
+        self.server_capabilities = result.get("capabilities") or {}
+        self.instructions = result.get("instructions")
+        await self.send_notification("notifications/initialized")
+        self.startup["ready_ms"] = self._since_start()
+        return result
+
+    async def list_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """The server's tools, following tools/list pagination; cached until the server reports a change"""
+        if self.tools is None or refresh:
+            tools: List[Dict[str, Any]] = []
+            cursor = None
+            while True:
+                result = await self.send_request("tools/list", {"cursor": cursor} if cursor else None)
+                tools.extend(result.get("tools", []))
+                cursor = result.get("nextCursor")
+                if not cursor:
+                    break
+            self.tools = tools
+        return self.tools
+
+    async def _pump_stderr(self):
+        """Drain the server's stderr into the ring buffer"""
+        partial = b''
+        while True:
+            chunk = await self.process.stderr.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            lines = (partial + chunk).split(b'\n')
+            partial = lines.pop()
+            if len(partial) > MAX_STDERR_LINE:
+                lines.append(partial)
+                partial = b''
+            for line in lines:
+                self._record_stderr(line)
+        if partial:
+            self._record_stderr(partial)
+
+    def _record_stderr(self, line: bytes):
+        """Keep one stderr line (truncated) and collect it if it is a timing line"""
+        text = line[:MAX_STDERR_LINE].decode('utf-8', errors='replace').rstrip('\r')
+        self.stderr_lines.append(text)
+        timing = parse_timing_line(text)
+        if timing:
+            self.server_timings.append(timing)
 
-    async def send_request(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send JSON-RPC request to server"""
-        if not self.process:
+    def recent_stderr(self, count: int = 20) -> List[str]:
+        """The last `count` lines the server wrote to stderr"""
+        return list(self.stderr_lines)[-count:]
+
+    def print_recent_stderr(self, count: int = 20):
+        """Show the server's recent stderr, e.g. after an error"""
+        lines = self.recent_stderr(count)
+        if lines:
+            print(f"Server stderr (last {len(lines)} lines):")
+            for line in lines:
+                print(f"  {line}")
+
+    async def _read_messages(self):
+        """Route server messages: responses to their waiting request, the rest to handlers"""
+        error: BaseException = ConnectionError("Server closed the connection")
+        framer = MessageFramer(
+            self.max_message_bytes, self.spill_threshold, self._spill_root,
+            on_invalid=lambda line: print(f"⚠️  Ignoring non-JSON output from server: {line!r}")
+        )
+        try:
+            while True:
+                chunk = await self.process.stdout.read(READ_CHUNK_BYTES)
+                if chunk and "first_byte_ms" not in self.startup:
+                    self.startup["first_byte_ms"] = self._since_start()
+                messages = framer.feed(chunk) if chunk else framer.close()
+                for message in messages:
+                    if self.recorder:
+                        self.recorder.record(self._trace_connection, 'in', message)
+                    for item in message if isinstance(message, list) else [message]:
+                        self._dispatch(item)
+                if not chunk:
+                    break
+        except Exception as e:
+            error = e
+        finally:
+            # Nothing else will answer the outstanding requests
+            self.connection_error = error
+            if self._pending or not self._closing:
+                await asyncio.sleep(0.05)  # Let the stderr pump catch up with the server's last words
+                print(f"❌ Lost connection to the MCP server: {error}")
+                self.print_recent_stderr()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+        # Keep draining after a framing error: a full pipe would stall the server and process.wait()
+        while await self.process.stdout.read(READ_CHUNK_BYTES):
+            pass
+
+    def _dispatch(self, message: Dict[str, Any]):
+        """Handle one decoded JSON-RPC message"""
+        if 'method' not in message:
+            future = self._pending.pop(message.get('id'), None)
+            if future is None and message.get('id') in self._cancelled:
+                self._cancelled.discard(message.get('id'))
+            elif future is None:
+                print(f"⚠️  Response for unknown request id: {message.get('id')!r}")
+            elif not future.done():
+                if 'error' in message:
+                    future.set_exception(MCPError(message['error']))
+                else:
+                    future.set_result(message.get('result', {}))
+        elif 'id' in message:
+            # A request from the server (e.g. ping) must be answered or it will wait forever
+            asyncio.create_task(self._answer_server_request(message))
+        else:
+            if message['method'] == 'notifications/tools/list_changed':
+                self.tools = None
+            self.notifications.append(message)
+            for handler in self.notification_handlers:
+                handler(message)
+
+    async def _answer_server_request(self, request: Dict[str, Any]):
+        """Reply to a server-initiated request"""
+        if request['method'] == 'ping':
+            reply = {"jsonrpc": "2.0", "id": request['id'], "result": {}}
+        else:
+            reply = {"jsonrpc": "2.0", "id": request['id'],
+                     "error": {"code": -32601, "message": f"Method not found: {request['method']}"}}
+        try:
+            await self._send(reply)
+        except (ConnectionError, RuntimeError):
+            pass
+
+    async def _send(self, message: Dict[str, Any]):
+        """Write one message to the server"""
+        if not self.process or self._reader_task is None:
             raise RuntimeError("Server not started")
+        if self.connection_error is not None:
+            raise ConnectionError(f"Server connection lost: {self.connection_error}")
+        async with self._write_lock:
+            if self.recorder:
+                self.recorder.record(self._trace_connection, 'out', message)
+            self.process.stdin.write((json.dumps(message) + '\n').encode())
+            await self.process.stdin.drain()
 
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": method,
-            "params": params or {}
-        }
+    async def send_request(self, method: str, params: Dict[str, Any] = None,
+                           timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Send JSON-RPC request to server and wait for its response.
 
-        request_json = json.dumps(request) + '\n'
-        self.process.stdin.write(request_json.encode())
-        await self.process.stdin.drain()
+        Args:
+            method: JSON-RPC method
+            params: Method parameters
+            timeout: Seconds to wait, including for an in-flight slot (default: self.timeout; 0: no limit)
 
-        # Read response
-        response_data = await self.process.stdout.readline()
-        if not response_data:
-            raise RuntimeError("No response from server")
+        Returns:
+            The result of the response
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout else None
+        if self._window:
+            try:
+                await asyncio.wait_for(self._window.acquire(), timeout or None)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise MCPTimeout(method, timeout, sent=False) from None
+        try:
+            return await self._request(method, params, deadline, timeout)
+        finally:
+            if self._window:
+                self._window.release()
 
-        response = json.loads(response_data.decode())
+    async def _request(self, method: str, params: Optional[Dict[str, Any]], deadline: Optional[float],
+                       timeout: Optional[float]) -> Dict[str, Any]:
+        """Send one request and wait for its response until the deadline"""
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        sent = False
+        try:
+            sent_at = time.perf_counter()
+            await self._send({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params or {}
+            })
+            sent = True
+            if deadline is None:
+                result = await future
+            else:
+                result = await asyncio.wait_for(future, max(0.0, deadline - time.monotonic()))
+            if method == "tools/call" and "first_tool_call_ms" not in self.startup and self._started_at:
+                self.startup["first_tool_call_rtt_ms"] = round((time.perf_counter() - sent_at) * 1000, 3)
+                self.startup["first_tool_call_ms"] = self._since_start()
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            await self._cancel_request(request_id, f"Client timeout after {timeout:g}s")
+            raise MCPTimeout(method, timeout) from None
+        except asyncio.CancelledError:
+            if sent and not future.done():
+                # The caller gave up (e.g. the global deadline); tell the server to stop working on it
+                asyncio.create_task(self._cancel_request(request_id, "Request cancelled by the client"))
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _cancel_request(self, request_id: int, reason: str):
+        """Withdraw a sent request (MCP notifications/cancelled)"""
+        self._cancelled.add(request_id)
+        try:
+            await self.send_notification("notifications/cancelled", {"requestId": request_id, "reason": reason})
+        except (ConnectionError, RuntimeError, OSError):
+            pass
 
-        if "error" in response:
-            raise RuntimeError(f"Server error: {response['error']}")
+    async def send_notification(self, method: str, params: Dict[str, Any] = None):
+        """Send JSON-RPC notification (no response expected)"""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
 
-        return response.get("result", {})
+    async def call_tool(self, name: str, arguments: Dict[str, Any] = None,
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Call one tool"""
+        return await self.send_request("tools/call", {"name": name, "arguments": arguments or {}}, timeout)
+
+    async def call_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Call several tools concurrently; each entry is a result or the exception it raised"""
+        return await asyncio.gather(*(self.call_tool(name, arguments) for name, arguments in calls),
+                                    return_exceptions=True)
 
     async def test_tools_list(self):
         """Test listing available tools"""
         print("\n📋 Testing tools/list...")
-        result = await self.send_request("tools/list")
-        tools = result.get("tools", [])
+        tools = await self.list_tools(refresh=True)
 
         print(f"Found {len(tools)} tools:")
         for tool in tools:
@@ -80,7 +796,11 @@ class MCPTestClient:
             })
 
             content = result['content'][0]['text']
-            print(f"File content ({len(content)} chars):")
+            if isinstance(content, SpilledText):
+                print(f"File content spilled to {content.path} ({content.size:,} bytes)")
+                content = content.read(501)
+            else:
+                print(f"File content ({len(content)} chars):")
             print("-" * 40)
             print(content[:500] + "..." if len(content) > 500 else content)
             print("-" * 40)
@@ -97,7 +817,7 @@ class MCPTestClient:
                 "arguments": {"maxDepth": 3}
             })
 
-            structure = result['content'][0]['text']
+            structure = text_of(result['content'][0]['text'])
             print("Project structure:")
             print(structure)
 
@@ -113,7 +833,7 @@ class MCPTestClient:
                 "arguments": {"directory": directory}
             })
 
-            files = result['content'][0]['text'].split('\n')
+            files = text_of(result['content'][0]['text']).split('\n')
             print(f"Found {len(files)} files:")
             for file in files[:10]:  # Show first 10
                 print(f"  - {file}")
@@ -132,12 +852,40 @@ class MCPTestClient:
                 "arguments": {}
             })
 
-            status = result['content'][0]['text']
+            status = text_of(result['content'][0]['text'])
             print(status)
 
         except Exception as e:
             print(f"❌ Error: {e}")
 
+    async def test_pipelining(self):
+        """Test several concurrent tool calls over the one connection"""
+        print("\n⚡ Testing pipelined tools/call...")
+        calls = [
+            ("project_structure", {"maxDepth": 2}),
+            ("list_files", {"directory": "."}),
+            ("git_status", {}),
+            ("project_structure", {"maxDepth": 1}),
+        ]
+
+        async def timed(name: str, arguments: Dict[str, Any]):
+            start = time.perf_counter()
+            try:
+                await self.call_tool(name, arguments)
+                return name, time.perf_counter() - start, None
+            except Exception as e:
+                return name, time.perf_counter() - start, e
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(timed(name, arguments) for name, arguments in calls))
+        elapsed = time.perf_counter() - start
+
+        for name, seconds, error in results:
+            status = f"❌ {error}" if error else "✅"
+            print(f"  {status} {name}: {seconds * 1000:.1f} ms")
+        sequential = sum(seconds for _, seconds, _ in results)
+        print(f"{len(calls)} calls in {elapsed * 1000:.1f} ms (sum of latencies: {sequential * 1000:.1f} ms)")
+
     async def interactive_test(self):
         """Run interactive test session"""
         print("\n🚀 MCP Test Client - Interactive Mode")
@@ -149,12 +897,14 @@ class MCPTestClient:
         print("  files [dir] - List files in directory")
         print("  git - Show git status")
         print("  call <tool> <json_args> - Call any tool")
+        print("  notifications - Show recent server notifications")
         print("  quit - Exit")
         print()
 
         while True:
             try:
-                command = input("mcp-test> ").strip()
+                # Read input off the event loop so server messages keep being processed
+                command = (await asyncio.get_running_loop().run_in_executor(None, input, "mcp-test> ")).strip()
 
                 if command == "quit":
                     break
@@ -171,6 +921,11 @@ class MCPTestClient:
                     await self.test_list_files(directory)
                 elif command == "git":
                     await self.test_git_status()
+                elif command == "notifications":
+                    for notification in self.notifications:
+                        print(json.dumps(notification))
+                    if not self.notifications:
+                        print("No notifications received")
                 elif command.startswith("call "):
                     parts = command[5:].split(" ", 1)
                     if len(parts) == 2:
@@ -184,12 +939,14 @@ class MCPTestClient:
                             "name": tool_name,
                             "arguments": args
                         })
-                        print(json.dumps(result, indent=2))
+                        print(json.dumps(result, indent=2, default=_trace_default))
                     else:
                         print("Usage: call <tool_name> <json_args>")
                 else:
                     print("Unknown command. Type 'quit' to exit.")
 
+            except EOFError:
+                break
             except KeyboardInterrupt:
                 print("\nUse 'quit' to exit")
             except Exception as e:
@@ -200,13 +957,12 @@ class MCPTestClient:
         print("🧪 Running MCP Server Tests")
         print("=" * 50)
 
-        await self.start_server()
-
         # Run test suite
         await self.test_tools_list()
         await self.test_project_structure()
         await self.test_list_files()
         await self.test_git_status()
+        await self.test_pipelining()
 
         # Try to read a file if any exist
         try:
@@ -214,7 +970,7 @@ class MCPTestClient:
                 "name": "list_files",
                 "arguments": {"directory": "."}
             })
-            files = result['content'][0]['text'].split('\n')
+            files = text_of(result['content'][0]['text']).split('\n')
             if files and files[0]:
                 await self.test_read_file(files[0])
         except:
@@ -224,9 +980,631 @@ class MCPTestClient:
 
     async def cleanup(self):
         """Clean up resources"""
+        self._closing = True
         if self.process:
-            self.process.terminate()
+            if self.process.returncode is None:
+                self.process.terminate()
             await self.process.wait()
+        for task in (self._reader_task, self._stderr_task):
+            if task:
+                task.cancel()
+        if self._spill_root:
+            shutil.rmtree(self._spill_root, ignore_errors=True)
+            self._spill_root = None
+
+
+class MCPServerPool:
+    """Several server processes for one project, with least-loaded dispatch"""
+
+    def __init__(self, server_path: str, project_path: str, size: int = 2, **client_options):
+        self.server_path = Path(server_path).resolve()
+        self.project_path = Path(project_path).resolve()
+        self.size = size
+        self.client_options = client_options  # Passed to every MCPTestClient
+        self.timeout = client_options.get("timeout")
+        self.workers: List[Optional[MCPTestClient]] = [None] * size
+        self.server_timings = deque(maxlen=100000)  # Shared by all workers
+        self.restarts = 0
+        self.connection_error: Optional[BaseException] = None
+        self._restarting: Dict[int, asyncio.Task] = {}
+        self._next = 0
+        self._closing = False
+
+    async def start_server(self):
+        """Start every worker"""
+        await asyncio.gather(*(self._start_worker(index) for index in range(self.size)))
+        print(f"✅ Started {self.size} MCP servers for: {self.project_path}")
+
+    async def _start_worker(self, index: int):
+        """Start (or replace) one worker"""
+        client = MCPTestClient(self.server_path, self.project_path, **self.client_options)
+        client.server_timings = self.server_timings
+        await client.start_server(announce=False)
+        self.workers[index] = client
+
+    @property
+    def startup(self) -> List[Dict[str, float]]:
+        """Each worker's start-up timeline"""
+        return [worker.startup for worker in self.workers if worker is not None]
+
+    def _is_live(self, index: int) -> bool:
+        worker = self.workers[index]
+        return worker is not None and worker.connection_error is None and worker.process.returncode is None
+
+    def _schedule_restart(self, index: int):
+        """Replace a crashed worker in the background"""
+        if index not in self._restarting and not self._closing:
+            self._restarting[index] = asyncio.create_task(self._restart(index))
+
+    async def _restart(self, index: int):
+        """Clean up a crashed worker and start a new one in its slot"""
+        try:
+            old, self.workers[index] = self.workers[index], None
+            if old is not None:
+                await old.cleanup()
+            print(f"🔄 Restarting MCP server {index + 1}/{self.size}")
+            await self._start_worker(index)
+            self.restarts += 1
+        except (OSError, RuntimeError) as e:
+            print(f"❌ Could not restart MCP server {index + 1}: {e}")
+            await asyncio.sleep(0.5)  # Don't respawn in a tight loop
+        finally:
+            del self._restarting[index]
+
+    async def _pick(self) -> MCPTestClient:
+        """Least-loaded live worker; waits for a restart if none is live"""
+        while True:
+            live = []
+            for index in range(self.size):
+                if self._is_live(index):
+                    live.append(index)
+                else:
+                    self._schedule_restart(index)
+            if live:
+                # Fewest calls in flight; rotate the preferred slot so ties spread evenly
+                start, self._next = self._next, (self._next + 1) % self.size
+                best = min(live, key=lambda index: (self.workers[index].in_flight, (index - start) % self.size))
+                return self.workers[best]
+            if self._closing or not self._restarting:
+                raise ConnectionError("No MCP server in the pool is running")
+            await asyncio.wait(list(self._restarting.values()), return_when=asyncio.FIRST_COMPLETED)
+
+    async def send_request(self, method: str, params: Dict[str, Any] = None,
+                           timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a request to the least-loaded worker"""
+        worker = await self._pick()
+        try:
+            return await worker.send_request(method, params, timeout)
+        except ConnectionError:
+            if worker in self.workers:
+                self._schedule_restart(self.workers.index(worker))
+            raise
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any] = None,
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Call one tool on the least-loaded worker"""
+        return await self.send_request("tools/call", {"name": name, "arguments": arguments or {}}, timeout)
+
+    def print_recent_stderr(self, count: int = 20):
+        """Show every worker's recent stderr"""
+        for worker in self.workers:
+            if worker is not None:
+                worker.print_recent_stderr(count)
+
+    async def cleanup(self):
+        """Stop every worker"""
+        self._closing = True
+        for task in list(self._restarting.values()):
+            task.cancel()
+        await asyncio.gather(*(worker.cleanup() for worker in self.workers if worker is not None))
+
+
+# Read-only tools the benchmark can call, with their default arguments
+BENCH_TOOLS = {
+    "read_file": {},  # Paths are taken from list_files before the run
+    "list_files": {"directory": "."},
+    "project_structure": {"maxDepth": 3},
+    "git_status": {},
+    "find_class": {"className": "Main"},
+    "execute_command": {"command": "true"},
+}
+
+DEFAULT_BENCH_MIX = "read_file=5,list_files=2,find_class=1,project_structure=1,git_status=1"
+
+
+def parse_tool_mix(spec: str) -> Dict[str, float]:
+    """Parse 'tool=weight,...' (a bare tool name has weight 1)"""
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, weight = item.partition('=')
+        if name not in BENCH_TOOLS:
+            raise ValueError(f"Unknown benchmark tool: {name} (choose from {', '.join(BENCH_TOOLS)})")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for {name}")
+    if not any(mix.values()):
+        raise ValueError("The tool mix is empty")
+    return mix
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def latency_summary(latencies: List[float], errors: int, timeouts: int = 0) -> Dict[str, Any]:
+    """Request count, error and timeout rates and latency percentiles in milliseconds (timeouts excluded)"""
+    requests = len(latencies)
+    summary = {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "timeouts": timeouts,
+        "timeout_rate": round(timeouts / (requests + timeouts), 4) if timeouts else 0.0,
+    }
+    if latencies:
+        summary.update({
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "max_ms": round(max(latencies) * 1000, 3),
+        })
+    return summary
+
+
+def server_latency_summary(timings) -> Dict[str, Any]:
+    """Per-tool percentiles of the server-side durations from timing lines"""
+    durations: Dict[str, List[float]] = {}
+    for timing in timings:
+        durations.setdefault(timing['tool'], []).append(timing['ms'] / 1000)
+    summary = {}
+    for name, values in durations.items():
+        tool = latency_summary(values, 0)
+        summary[name] = {key: tool[key] for key in ("requests", "mean_ms", "p50_ms", "p95_ms", "p99_ms")}
+    return summary
+
+
+def is_error_result(result: Dict[str, Any]) -> bool:
+    """Tool failures are reported as content, either flagged or as 'Error: ...' text"""
+    if result.get("isError"):
+        return True
+    content = result.get("content") or []
+    return bool(content) and text_of(content[0].get("text") or "", 6) == "Error:"
+
+
+async def bench_arguments(client, mix: Dict[str, float], class_name: Optional[str] = None,
+                          command: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Build the argument sets each benchmarked tool cycles through"""
+    arguments = {name: [dict(BENCH_TOOLS[name])] for name in mix}
+    if class_name:
+        arguments.get("find_class", [{}])[0]["className"] = class_name
+    if command:
+        arguments.get("execute_command", [{}])[0]["command"] = command
+    if "read_file" in mix:
+        result = await client.call_tool("list_files", {"directory": "."})
+        files = [line for line in text_of(result["content"][0]["text"]).split('\n') if line][:100]
+        if files:
+            arguments["read_file"] = [{"path": path} for path in files]
+        else:
+            print("⚠️  No files to read; dropping read_file from the mix")
+            del arguments["read_file"]
+    return arguments
+
+
+async def run_benchmark(client, mix: Dict[str, float], concurrency: int = 8, duration: float = 10.0,
+                        warmup: float = 1.0, seed: int = 0, class_name: Optional[str] = None,
+                        command: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load-test a server with a weighted mix of tool calls.
+
+    Args:
+        client: Anything with an async call_tool(name, arguments)
+        mix: Relative weight of each tool in BENCH_TOOLS
+        concurrency: Calls kept in flight
+        duration: Measured seconds
+        warmup: Seconds of unmeasured calls before the run
+        seed: Seed for the tool sequence
+        class_name: Class to search for with find_class
+        command: Command to run with execute_command
+
+    Returns:
+        Report with throughput and per-tool latency and error rates
+    """
+    arguments = await bench_arguments(client, mix, class_name, command)
+    names = [name for name in mix if name in arguments and mix[name] > 0]
+    weights = [mix[name] for name in names]
+    rng = random.Random(seed)
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    timeouts: Dict[str, int] = {name: 0 for name in names}
+    error_samples: Dict[str, str] = {}
+    counters = {name: itertools.count() for name in names}
+    recording = False
+
+    async def worker(deadline: float):
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            options = arguments[name]
+            call_arguments = options[next(counters[name]) % len(options)]
+            start = time.perf_counter()
+            try:
+                failed = is_error_result(await client.call_tool(name, call_arguments))
+                if failed:
+                    error_samples.setdefault(name, "error result")
+            except MCPTimeout:
+                # Counted apart: a timeout's latency is the timeout, not the server's
+                if recording:
+                    timeouts[name] += 1
+                continue
+            except (MCPError, ConnectionError) as e:
+                failed = True
+                error_samples.setdefault(name, str(e))
+            elapsed = time.perf_counter() - start
+            if recording:
+                latencies[name].append(elapsed)
+                errors[name] += failed
+
+    if warmup > 0:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(deadline) for _ in range(concurrency)))
+
+    recording = True
+    server_timings = getattr(client, "server_timings", None)
+    if server_timings is not None:
+        server_timings.clear()
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(deadline) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    if sum(timeouts.values()):
+        print(f"⚠️  {sum(timeouts.values())} calls timed out")
+        client.print_recent_stderr()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "server": str(getattr(client, "server_path", "")),
+        "project": str(getattr(client, "project_path", "")),
+        "workers": getattr(client, "size", 1),
+        "restarts": getattr(client, "restarts", 0),
+        "concurrency": concurrency,
+        "timeout_s": getattr(client, "timeout", None),
+        "startup": getattr(client, "startup", None),
+        "duration_s": round(elapsed, 3),
+        "mix": {name: mix[name] for name in names},
+        "requests": len(all_latencies),
+        "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed else 0.0,
+        "overall": latency_summary(all_latencies, sum(errors.values()), sum(timeouts.values())),
+        "tools": {name: latency_summary(latencies[name], errors[name], timeouts[name]) for name in names},
+        "server_tools": server_latency_summary(server_timings or []),
+        "error_samples": error_samples,
+    }
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare a benchmark report with a stored one.
+
+    Args:
+        report: Current report from run_benchmark
+        baseline: Earlier report
+        threshold: Allowed change in percent
+
+    Returns:
+        Descriptions of the regressions (empty if none)
+    """
+    def change(current: float, previous: float) -> float:
+        return (current - previous) / previous * 100 if previous else 0.0
+
+    regressions = []
+    print(f"\n{'':28} {'baseline':>12} {'current':>12} {'change':>9}")
+    throughput = change(report["throughput_rps"], baseline.get("throughput_rps", 0))
+    print(f"{'throughput (req/s)':28} {baseline.get('throughput_rps', 0):12.1f} {report['throughput_rps']:12.1f} "
+          f"{throughput:+8.1f}%")
+    if throughput < -threshold:
+        regressions.append(f"throughput dropped {-throughput:.1f}%")
+
+    for name, summary in report["tools"].items():
+        previous = baseline.get("tools", {}).get(name)
+        if not previous or "p95_ms" not in previous or "p95_ms" not in summary:
+            continue
+        p95 = change(summary["p95_ms"], previous["p95_ms"])
+        print(f"{name + ' p95 (ms)':28} {previous['p95_ms']:12.2f} {summary['p95_ms']:12.2f} {p95:+8.1f}%")
+        if p95 > threshold:
+            regressions.append(f"{name} p95 latency rose {p95:.1f}%")
+        if summary["error_rate"] > previous.get("error_rate", 0) + threshold / 100:
+            regressions.append(f"{name} error rate rose to {summary['error_rate']:.1%}")
+        if summary.get("timeout_rate", 0) > previous.get("timeout_rate", 0) + threshold / 100:
+            regressions.append(f"{name} timeout rate rose to {summary['timeout_rate']:.1%}")
+    return regressions
+
+
+async def run_scaling(server_path: str, project_path: str, sizes: List[int], client_options: Dict[str, Any],
+                      mix: Dict[str, float], **bench_options) -> Dict[str, Any]:
+    """
+    Benchmark a fresh pool of each size and compare throughput.
+
+    Args:
+        server_path: MCP server script
+        project_path: Project the servers serve
+        sizes: Pool sizes to measure
+        client_options: Options for each worker's MCPTestClient
+        mix: Tool weights
+        **bench_options: Passed to run_benchmark
+
+    Returns:
+        Summary row per pool size plus the full reports
+    """
+    reports = []
+    for size in sizes:
+        pool = MCPServerPool(server_path, project_path, size, **client_options)
+        try:
+            await pool.start_server()
+            reports.append(await run_benchmark(pool, mix, **bench_options))
+        finally:
+            await pool.cleanup()
+
+    rows = []
+    first = reports[0]["throughput_rps"] or 1
+    print(f"\n{'workers':>8} {'req/s':>10} {'speedup':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for size, report in zip(sizes, reports):
+        overall = report["overall"]
+        row = {
+            "workers": size,
+            "throughput_rps": report["throughput_rps"],
+            "speedup": round(report["throughput_rps"] / first, 2),
+            "p50_ms": overall.get("p50_ms"),
+            "p95_ms": overall.get("p95_ms"),
+            "p99_ms": overall.get("p99_ms"),
+            "error_rate": overall["error_rate"],
+            "restarts": report["restarts"],
+        }
+        rows.append(row)
+        print(f"{size:>8} {row['throughput_rps']:>10.1f} {row['speedup']:>7.2f}x {row['p50_ms'] or 0:>9.2f} "
+              f"{row['p95_ms'] or 0:>9.2f} {row['p99_ms'] or 0:>9.2f} {row['error_rate']:>7.1%}")
+    return {"scaling": rows, "reports": reports}
+
+
+async def measure_cold_start(server_path: str, project_path: str, runs: int, client_options: Dict[str, Any],
+                             tool: str = "list_files", arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Start the server repeatedly and time each phase until its first tool call returns.
+
+    Args:
+        server_path: MCP server script
+        project_path: Project the server serves
+        runs: Server starts to measure
+        client_options: Options for each MCPTestClient
+        tool: Tool called first
+        arguments: Its arguments (default: those in BENCH_TOOLS)
+
+    Returns:
+        Report with percentiles per start-up phase and every run's timeline
+    """
+    if arguments is None:
+        arguments = dict(BENCH_TOOLS.get(tool, {}))
+    samples = []
+    for _ in range(runs):
+        client = MCPTestClient(server_path, project_path, **client_options)
+        try:
+            await client.start_server(announce=False)
+            result = await client.call_tool(tool, arguments)
+            if is_error_result(result):
+                print(f"⚠️  {tool} returned an error: {_preview(result)}")
+            samples.append(dict(client.startup))
+        finally:
+            await client.cleanup()
+
+    phases = {}
+    print(f"\n{'phase':24} {'p50 ms':>9} {'p95 ms':>9} {'min ms':>9} {'max ms':>9}")
+    for phase in STARTUP_PHASES:
+        values = [sample[phase] for sample in samples if phase in sample]
+        if not values:
+            continue
+        phases[phase] = {
+            "p50_ms": percentile(values, 0.50),
+            "p95_ms": percentile(values, 0.95),
+            "min_ms": min(values),
+            "max_ms": max(values),
+        }
+        print(f"{phase:24} {phases[phase]['p50_ms']:>9.1f} {phases[phase]['p95_ms']:>9.1f} "
+              f"{phases[phase]['min_ms']:>9.1f} {phases[phase]['max_ms']:>9.1f}")
+    return {
+        "server": str(Path(server_path).resolve()),
+        "project": str(Path(project_path).resolve()),
+        "runs": runs,
+        "tool": tool,
+        "phases": phases,
+        "samples": samples,
+    }
+
+
+def load_trace(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Read a trace and pair each recorded request with its response.
+
+    Args:
+        path: JSONL trace written by --record
+
+    Returns:
+        (header, calls in send order); a call has t, method, params, and for
+        requests the recorded latency, result and error
+    """
+    header: Dict[str, Any] = {}
+    calls = []
+    waiting = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("type") == "header":
+                header = entry
+                continue
+            messages = entry["message"] if isinstance(entry["message"], list) else [entry["message"]]
+            for message in messages:
+                key = (entry.get("conn", 0), message.get("id"))
+                if entry["direction"] == "out" and "method" in message:
+                    call = {"t": entry["t"], "method": message["method"], "params": message.get("params"),
+                            "notification": "id" not in message}
+                    calls.append(call)
+                    if "id" in message:
+                        waiting[key] = call
+                elif entry["direction"] == "in" and "method" not in message and key in waiting:
+                    call = waiting.pop(key)
+                    call["latency"] = entry["t"] - call["t"]
+                    call["result"] = message.get("result")
+                    call["error"] = message.get("error")
+    return header, calls
+
+
+def _comparable(value: Any) -> Any:
+    """Normalize a result for comparison (spilled text compares by size)"""
+    if isinstance(value, SpilledText):
+        return {"bytes": value.size}
+    if isinstance(value, dict):
+        if "$spilled" in value:
+            return {"bytes": value.get("bytes")}
+        return {key: _comparable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_comparable(item) for item in value]
+    return value
+
+
+def _call_label(call: Dict[str, Any]) -> str:
+    """Tool name for tools/call, otherwise the method"""
+    if call["method"] == "tools/call":
+        return (call.get("params") or {}).get("name", "tools/call")
+    return call["method"]
+
+
+def _preview(value: Any, limit: int = 200) -> str:
+    text = json.dumps(_comparable(value), ensure_ascii=False)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+async def replay_trace(client, calls: List[Dict[str, Any]], timing: str = "original",
+                       concurrency: int = 8) -> Dict[str, Any]:
+    """
+    Re-issue recorded calls and compare them with the recording.
+
+    Args:
+        client: Started MCPTestClient; after its own handshake the recorded one is skipped
+        calls: Calls from load_trace
+        timing: 'original' keeps the recorded send times; 'fast' sends as fast as
+            possible with up to `concurrency` requests in flight
+        concurrency: In-flight limit for 'fast'
+
+    Returns:
+        Report with per-tool recorded and replayed latency and the differing results
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+    first_t = calls[0]["t"] if calls else 0.0
+    start = time.perf_counter()
+
+    async def issue(index: int, call: Dict[str, Any]):
+        if timing == "original":
+            await asyncio.sleep(max(0.0, (call["t"] - first_t) - (time.perf_counter() - start)))
+        async with semaphore:
+            if call["notification"]:
+                await client.send_notification(call["method"], call.get("params"))
+                return
+            sent = time.perf_counter()
+            result, error = None, None
+            try:
+                result = await client.send_request(call["method"], call.get("params"))
+            except MCPError as e:
+                error = {"code": e.code, "message": str(e)}
+            except (ConnectionError, MCPTimeout) as e:
+                error = {"message": str(e)}
+            outcomes[index] = {"latency": time.perf_counter() - sent, "result": result, "error": error}
+
+    tasks = []
+    for index, call in enumerate(calls):
+        if client.protocol_version and call["method"] in ("initialize", "notifications/initialized"):
+            continue  # The client opened its own session
+        if call["method"] == "initialize":
+            # Nothing may overtake the handshake
+            await asyncio.gather(*tasks)
+            await issue(index, call)
+            continue
+        tasks.append(asyncio.create_task(issue(index, call)))
+        if timing == "fast":
+            await asyncio.sleep(0)  # Let the task queue on the semaphore in order
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    tools: Dict[str, Dict[str, Any]] = {}
+    differences = []
+    replayed = mismatches = errors = 0
+    for index, (call, outcome) in enumerate(zip(calls, outcomes)):
+        if outcome is None:
+            continue
+        replayed += 1
+        label = _call_label(call)
+        tool = tools.setdefault(label, {"recorded": [], "replayed": [], "mismatches": 0, "errors": 0})
+        if "latency" in call:
+            tool["recorded"].append(call["latency"])
+        tool["replayed"].append(outcome["latency"])
+        if outcome["error"]:
+            errors += 1
+            tool["errors"] += 1
+        if "latency" not in call:
+            continue  # The recording has no response to compare with
+        same = (bool(outcome["error"]) == bool(call.get("error"))
+                and _comparable(outcome["result"]) == _comparable(call.get("result")))
+        if not same:
+            mismatches += 1
+            tool["mismatches"] += 1
+            if len(differences) < 20:
+                differences.append({
+                    "index": index,
+                    "call": label,
+                    "recorded": _preview(call.get("error") or call.get("result")),
+                    "replayed": _preview(outcome["error"] or outcome["result"]),
+                })
+
+    def summary(values: List[float]) -> Dict[str, Any]:
+        stats = latency_summary(values, 0)
+        return {key: stats[key] for key in ("requests", "p50_ms", "p95_ms", "p99_ms") if key in stats}
+
+    return {
+        "timing": timing,
+        "calls": len(calls),
+        "replayed": replayed,
+        "seconds": round(elapsed, 3),
+        "recorded_seconds": round(calls[-1]["t"] - first_t, 3) if calls else 0.0,
+        "mismatches": mismatches,
+        "errors": errors,
+        "tools": {
+            label: {
+                "recorded": summary(tool["recorded"]),
+                "replayed": summary(tool["replayed"]),
+                "mismatches": tool["mismatches"],
+                "errors": tool["errors"],
+            }
+            for label, tool in tools.items()
+        },
+        "differences": differences,
+    }
+
+
+def print_replay_summary(report: Dict[str, Any]):
+    """Recorded vs replayed latency per call type"""
+    print(f"\n{'call':24} {'count':>6} {'rec p50':>9} {'rep p50':>9} {'rec p95':>9} {'rep p95':>9} {'diffs':>6}")
+    for label, tool in report["tools"].items():
+        recorded, replayed = tool["recorded"], tool["replayed"]
+        print(f"{label:24} {replayed.get('requests', 0):>6} {recorded.get('p50_ms', 0):>9.2f} "
+              f"{replayed.get('p50_ms', 0):>9.2f} {recorded.get('p95_ms', 0):>9.2f} "
+              f"{replayed.get('p95_ms', 0):>9.2f} {tool['mismatches']:>6}")
+    print(f"Replayed {report['replayed']} of {report['calls']} calls in {report['seconds']:.2f}s "
+          f"(recorded over {report['recorded_seconds']:.2f}s)")
+    for difference in report["differences"]:
+        print(f"❌ Call {difference['index']} ({difference['call']}) differs:")
+        print(f"   recorded: {difference['recorded']}")
+        print(f"   replayed: {difference['replayed']}")
 
 
 async def main():
@@ -236,24 +1614,200 @@ async def main():
                         help='Path to project (default: current directory)')
     parser.add_argument('--interactive', '-i', action='store_true',
                         help='Run in interactive mode')
+    parser.add_argument('--max-message-mb', type=float,
+                        help='Fail on server messages larger than this (default: unbounded)')
+    parser.add_argument('--spill-kb', type=int,
+                        help='Write string values larger than this many KiB to files instead of memory')
+    parser.add_argument('--spill-dir', help='Directory for spilled values (default: system temp)')
+    parser.add_argument('--stderr-lines', type=int, default=200,
+                        help='Server stderr lines kept for error reports (default: 200)')
+    parser.add_argument('--server-timing', action='store_true',
+                        help='Start the server with MCP_TIMING_LOG=1 and collect its timing lines')
+    parser.add_argument('--server-args', default='',
+                        help='Extra server arguments, e.g. "--latency-ms 2" for mcp-stub-server.py')
+    parser.add_argument('--timeout', type=float,
+                        help='Seconds to wait for each response before cancelling the call (default: forever)')
+    parser.add_argument('--startup-timeout', type=float,
+                        help='Seconds to wait for the server to answer initialize (default: forever)')
+    parser.add_argument('--deadline', type=float, help='Stop the whole run after this many seconds')
+    parser.add_argument('--max-in-flight', type=int,
+                        help='Requests outstanding per server connection; further calls wait (default: unbounded)')
+    parser.add_argument('--no-handshake', action='store_true',
+                        help='Skip the initialize handshake (servers that do not implement it)')
+    parser.add_argument('--cold-start', type=int, metavar='N',
+                        help='Start the server N times and report the start-up timeline up to the first tool call')
+    parser.add_argument('--cold-start-tool', default='list_files',
+                        help='Tool called first in --cold-start runs (default: list_files)')
+    parser.add_argument('--bench', action='store_true',
+                        help='Load-test the server and print a JSON report')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Benchmark calls kept in flight (default: 8)')
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='Measured benchmark seconds (default: 10)')
+    parser.add_argument('--warmup', type=float, default=1.0,
+                        help='Unmeasured warm-up seconds (default: 1)')
+    parser.add_argument('--mix', default=DEFAULT_BENCH_MIX,
+                        help=f'Tool weights as tool=weight,... (default: {DEFAULT_BENCH_MIX})')
+    parser.add_argument('--class-name', help='Class to look up with find_class (default: Main)')
+    parser.add_argument('--command', help='Command to run with execute_command (default: true)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the tool sequence')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Benchmark a pool of this many server processes (default: 1)')
+    parser.add_argument('--scaling', help='Benchmark pools of these sizes, e.g. 1,2,4,8')
+    parser.add_argument('--record', metavar='TRACE', help='Record all JSON-RPC traffic to this JSONL file')
+    parser.add_argument('--replay', metavar='TRACE', help='Re-issue the requests of a recorded trace and diff the results')
+    parser.add_argument('--replay-timing', choices=('original', 'fast'), default='original',
+                        help='Replay with the recorded timing or as fast as possible (default: original)')
+    parser.add_argument('--output', help='Also write the benchmark, replay or cold-start report to this file')
+    parser.add_argument('--baseline', help='Compare with (or with --save-baseline, write) this report')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the report as the baseline')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Allowed throughput/p95 change against the baseline in percent (default: 10)')
 
     args = parser.parse_args()
 
-    client = MCPTestClient(args.server_path, args.project_path)
+    mix: Dict[str, float] = {}
+    sizes: List[int] = []
+    if args.bench or args.scaling:
+        try:
+            mix = parse_tool_mix(args.mix)
+            sizes = [int(size) for size in args.scaling.split(',')] if args.scaling else []
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+    client_options = {
+        "max_message_bytes": int(args.max_message_mb * 1024 * 1024) if args.max_message_mb else None,
+        "spill_threshold": args.spill_kb * 1024 if args.spill_kb is not None else None,
+        "spill_dir": args.spill_dir,
+        "stderr_lines": args.stderr_lines,
+        "server_timing": args.server_timing,
+        "timeout": args.timeout,
+        "max_in_flight": args.max_in_flight,
+        "server_args": shlex.split(args.server_args),
+        "handshake": not args.no_handshake,
+        "startup_timeout": args.startup_timeout,
+    }
+    bench_options = {
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "class_name": args.class_name,
+        "command": args.command,
+    }
+
+    try:
+        await asyncio.wait_for(run(args, client_options, bench_options, mix, sizes), args.deadline)
+    except asyncio.TimeoutError:
+        print(f"❌ Gave up after the --deadline of {args.deadline:g}s")
+        sys.exit(1)
+
+
+async def run(args: argparse.Namespace, client_options: Dict[str, Any], bench_options: Dict[str, Any],
+              mix: Dict[str, float], sizes: List[int]):
+    """Run the mode selected on the command line"""
+    if args.record:
+        client_options["recorder"] = TrafficRecorder(args.record, args.server_path, args.project_path)
+
+    if args.replay:
+        header, calls = load_trace(args.replay)
+        if not header:
+            print(f"⚠️ {args.replay} has no header line; replaying anyway")
+        client = MCPTestClient(args.server_path, args.project_path, **client_options)
+        try:
+            await client.start_server()
+            report = await replay_trace(client, calls, args.replay_timing, args.concurrency)
+        except Exception as e:
+            print(f"❌ Fatal error: {e}")
+            sys.exit(1)
+        finally:
+            await client.cleanup()
+            if args.record:
+                client_options["recorder"].close()
+        print_replay_summary(report)
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, indent=2) + '\n')
+        if report["mismatches"]:
+            print(f"❌ {report['mismatches']} of {report['replayed']} replayed calls differ from the recording")
+            sys.exit(1)
+        print("✅ Replay matches the recording")
+        return
+
+    if args.cold_start:
+        try:
+            result = await measure_cold_start(args.server_path, args.project_path, args.cold_start,
+                                              client_options, args.cold_start_tool)
+        except Exception as e:
+            print(f"❌ Fatal error: {e}")
+            sys.exit(1)
+        finally:
+            if args.record:
+                client_options["recorder"].close()
+        if args.output:
+            Path(args.output).write_text(json.dumps(result, indent=2) + '\n')
+        return
+
+    if args.scaling:
+        try:
+            result = await run_scaling(args.server_path, args.project_path, sizes, client_options, mix,
+                                       **bench_options)
+        except Exception as e:
+            print(f"❌ Fatal error: {e}")
+            sys.exit(1)
+        finally:
+            if args.record:
+                client_options["recorder"].close()
+        if args.output:
+            Path(args.output).write_text(json.dumps(result, indent=2) + '\n')
+        return
+
+    if args.bench and args.workers > 1:
+        client = MCPServerPool(args.server_path, args.project_path, args.workers, **client_options)
+    else:
+        client = MCPTestClient(args.server_path, args.project_path, **client_options)
 
     try:
         await client.start_server()
 
-        if args.interactive:
+        if args.bench:
+            report = await run_benchmark(client, mix, **bench_options)
+            report_json = json.dumps(report, indent=2)
+            print(report_json)
+            if args.output:
+                Path(args.output).write_text(report_json + '\n')
+
+            if args.baseline and args.save_baseline:
+                Path(args.baseline).write_text(report_json + '\n')
+                print(f"✅ Baseline saved to {args.baseline}")
+            elif args.baseline:
+                baseline = json.loads(Path(args.baseline).read_text())
+                regressions = compare_with_baseline(report, baseline, args.threshold)
+                for regression in regressions:
+                    print(f"❌ Regression: {regression}")
+                if regressions:
+                    sys.exit(1)
+                print(f"✅ Within {args.threshold:g}% of the baseline")
+        elif args.interactive:
             await client.interactive_test()
         else:
             await client.run_tests()
 
+    except asyncio.CancelledError:
+        # --deadline expired; show what the server was doing
+        print("\n⏱️  Deadline reached while waiting on the server")
+        client.print_recent_stderr()
+        raise
     except Exception as e:
         print(f"❌ Fatal error: {e}")
+        if client.connection_error is None:
+            client.print_recent_stderr()
         sys.exit(1)
     finally:
         await client.cleanup()
+        if args.record:
+            client_options["recorder"].close()
+            print(f"📼 Recorded {client_options['recorder'].messages} messages to {args.record}")
 
 
 if __name__ == "__main__":
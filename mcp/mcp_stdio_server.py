@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+"""
+MCP stdio server
+Minimal MCP server over newline-delimited JSON-RPC on stdin/stdout, shared
+by the Python servers in this directory
+
+Every request runs in its own task, so a slow tool call does not hold up
+the requests behind it and responses go out as they complete.
+notifications/cancelled cancels the request's task and suppresses its
+response. With MCP_TIMING_LOG=1 every tool call logs
+"[timing] tool=<name> ms=<duration> status=<ok|error>" to stderr, like
+intellij-mcp-server.js, so mcp-test-client.py --server-timing works with
+either server.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")  # Newest first
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+
+class ToolError(Exception):
+    """A tool failure reported to the client as an error result"""
+
+
+class Tool(NamedTuple):
+    """A registered tool"""
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    handler: Callable[..., Any]
+
+
+def text_result(text: str, is_error: bool = False) -> Dict[str, Any]:
+    """A tools/call result with one text block"""
+    result: Dict[str, Any] = {"content": [{"type": "text", "text": text}]}
+    if is_error:
+        result["isError"] = True
+    return result
+
+
+class StdioMCPServer:
+    """Serves registered tools over stdio"""
+
+    def __init__(self, name: str, version: str = "1.0.0", instructions: Optional[str] = None):
+        self.name = name
+        self.version = version
+        self.instructions = instructions
+        self.tools: Dict[str, Tool] = {}
+        self.timing_log = os.environ.get('MCP_TIMING_LOG', '').lower() in ('1', 'true', 'yes')
+        self.initialized = False
+        self._tasks: Dict[Any, asyncio.Task] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    def tool(self, name: str, description: str, properties: Optional[Dict[str, Any]] = None,
+             required: List[str] = ()) -> Callable:
+        """
+        Decorator registering a tool.
+
+        The handler is called with the call's arguments as keyword arguments and
+        returns a string or a full tools/call result. Coroutine handlers run on the
+        event loop; plain functions run in a worker thread so they cannot stall it.
+
+        Args:
+            name: Tool name
+            description: Description shown in tools/list
+            properties: JSON Schema properties of the arguments
+            required: Required argument names
+
+        Returns:
+            The decorator
+        """
+        def register(handler: Callable[..., Any]) -> Callable[..., Any]:
+            schema: Dict[str, Any] = {"type": "object", "properties": properties or {}}
+            if required:
+                schema["required"] = list(required)
+            self.tools[name] = Tool(name, description, schema, handler)
+            return handler
+        return register
+
+    def run(self):
+        """Serve until stdin closes"""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+    async def serve(self):
+        """Read requests until EOF, then wait for the calls still running"""
+        loop = asyncio.get_running_loop()
+        try:
+            transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+            self._writer = asyncio.StreamWriter(transport, protocol, None, loop)
+        except ValueError:
+            self._writer = None  # stdout is a regular file: plain blocking writes
+
+        async for line in self._read_lines():
+            if line.strip():
+                self._receive(line)
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self._writer is not None:
+            self._writer.close()
+
+    async def _read_lines(self):
+        """Lines from stdin; a regular file (requests saved to disk) is read in a worker thread"""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=MAX_REQUEST_BYTES)
+        try:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        except ValueError:
+            while line := await loop.run_in_executor(None, sys.stdin.buffer.readline):
+                yield line
+            return
+        while line := await reader.readline():
+            yield line
+
+    def _receive(self, line: bytes):
+        """Dispatch one line: requests get a task, notifications are handled inline"""
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            asyncio.create_task(self._send_error(None, PARSE_ERROR, f"Parse error: {e}"))
+            return
+        for item in message if isinstance(message, list) else [message]:
+            if not isinstance(item, dict) or 'method' not in item:
+                continue  # Responses to server requests; this server sends none
+            if 'id' not in item:
+                self._notification(item)
+            else:
+                task = asyncio.create_task(self._handle(item))
+                self._tasks[item['id']] = task
+                task.add_done_callback(lambda _, request_id=item['id']: self._tasks.pop(request_id, None))
+
+    def _notification(self, message: Dict[str, Any]):
+        """Handle a client notification"""
+        method = message['method']
+        if method == 'notifications/initialized':
+            self.initialized = True
+        elif method == 'notifications/cancelled':
+            task = self._tasks.get((message.get('params') or {}).get('requestId'))
+            if task is not None:
+                task.cancel()
+
+    async def _handle(self, request: Dict[str, Any]):
+        """Run one request and send its response (none if it was cancelled)"""
+        request_id = request['id']
+        params = request.get('params') or {}
+        try:
+            handler = {
+                'initialize': self._initialize,
+                'ping': self._ping,
+                'tools/list': self._list_tools,
+                'tools/call': self._call_tool,
+            }.get(request['method'])
+            if handler is None:
+                await self._send_error(request_id, METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+                return
+            result = await handler(params)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            await self._send_error(request_id, INTERNAL_ERROR, str(e))
+            return
+        await self._send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    async def _initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        requested = params.get('protocolVersion')
+        result = {
+            "protocolVersion": requested if requested in PROTOCOL_VERSIONS else PROTOCOL_VERSIONS[0],
+            "capabilities": {"tools": {"listChanged": False}},
+            "serverInfo": {"name": self.name, "version": self.version},
+        }
+        if self.instructions:
+            result["instructions"] = self.instructions
+        return result
+
+    async def _ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
+    async def _list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"tools": [
+            {"name": tool.name, "description": tool.description, "inputSchema": tool.input_schema}
+            for tool in self.tools.values()
+        ]}
+
+    async def _call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a tool; its failures become error results, as in intellij-mcp-server.js"""
+        name = params.get('name')
+        start = time.perf_counter()
+        try:
+            tool = self.tools.get(name)
+            if tool is None:
+                raise ToolError(f"Unknown tool: {name}")
+            arguments = params.get('arguments') or {}
+            if inspect.iscoroutinefunction(tool.handler):
+                result = await tool.handler(**arguments)
+            else:
+                # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(tool.handler, **arguments))
+            if isinstance(result, str):
+                result = text_result(result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result = text_result(f"Error: {e}", is_error=True)
+        if self.timing_log:
+            status = 'error' if result.get('isError') else 'ok'
+            self.log(f"[timing] tool={name} ms={(time.perf_counter() - start) * 1000:.3f} status={status}")
+        return result
+
+    async def _send_error(self, request_id: Any, code: int, message: str):
+        await self._send({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+
+    async def _send(self, message: Dict[str, Any]):
+        """Write one message and wait while the client is not reading"""
+        data = json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        try:
+            if self._writer is None:
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
+            else:
+                self._writer.write(data)
+                await self._writer.drain()
+        except ConnectionError:
+            pass  # The client has gone; stdin EOF ends the server
+
+    @staticmethod
+    def log(message: str):
+        """Log to stderr (stdout carries the protocol)"""
+        print(message, file=sys.stderr, flush=True)
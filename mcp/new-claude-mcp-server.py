@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+
+"""
+new-claude MCP Server
+Serves CLAUDE.md generation from a warm process, so regenerating rules
+does not pay new-claude's start-up (imports, template loading and
+compilation) on every call
+
+Tools:
+  render_claude_md  - Render CLAUDE.md for a stack, optionally writing it
+                      (with .claude/rules.json) into the project
+  detect_stack      - Languages, frameworks, databases, cloud and tools in use
+  audit_claude_md   - Hand edits, generator version and stack drift
+  list_templates    - The templates available for each option
+
+Templates are loaded and compiled once in the background at start-up.
+Reproducible renders are cached by configuration and template bundle
+hash (rechecked at most every BUNDLE_RECHECK_SECONDS, so edited templates
+are picked up), detections by a fingerprint of the project's top-level
+directories and manifests. Tool calls run in worker threads, so a slow
+detection does not hold up renders.
+
+Run from the repository (it imports ../src):
+
+    claude mcp add new-claude -- python3 /path/to/repo/mcp/new-claude-mcp-server.py <project-path>
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mcp_stdio_server import StdioMCPServer, ToolError  # noqa: E402
+from claude_md_audit import audit_claude_md  # noqa: E402
+from config import ADDITIONAL_TOOLS, GENERATOR_VERSION, PROJECT_TYPES, write_atomic  # noqa: E402
+from rules_index import RULES_INDEX_FILE, build_rules_index, serialize_rules_index  # noqa: E402
+from stack_detect import detect_stack, stack_fingerprint  # noqa: E402
+from template_manager import TemplateManager  # noqa: E402
+
+BUNDLE_RECHECK_SECONDS = 2.0
+RENDER_CACHE_SIZE = 256
+
+STACK_KEYS = ('languages', 'frameworks', 'databases', 'additional_tools', 'performance_profiles')
+
+# Render argument -> get_available_templates key; only names with a template are accepted
+TEMPLATE_KEYS = {
+    'languages': 'languages',
+    'frameworks': 'frameworks',
+    'databases': 'databases',
+    'performance_profiles': 'performance_profiles',
+    'cloud_platform': 'cloud_platforms',
+}
+
+
+class WarmGenerator:
+    """A TemplateManager kept warm, with caches for renders, detections and the template list"""
+
+    def __init__(self, cache_size: int = RENDER_CACHE_SIZE):
+        self.template_manager = TemplateManager(on_warning=StdioMCPServer.log)
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._renders: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._stacks: Dict[Path, Tuple[Tuple, Dict[str, Any]]] = {}
+        self._available: Optional[Dict[str, List[str]]] = None
+        self._bundle_hash: Optional[str] = None
+        self._bundle_checked = 0.0
+
+    def warm(self):
+        """Load and compile every template"""
+        start = time.perf_counter()
+        self.template_manager.prefetch_templates(include_base=True, **self.available_templates())
+        StdioMCPServer.log(f"Templates warm in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def bundle_hash(self) -> str:
+        """Template bundle hash; a change drops the render and template caches"""
+        now = time.monotonic()
+        with self._lock:
+            if self._bundle_hash is not None and now - self._bundle_checked < BUNDLE_RECHECK_SECONDS:
+                return self._bundle_hash
+        bundle_hash = self.template_manager.get_template_bundle_hash()
+        with self._lock:
+            if bundle_hash != self._bundle_hash:
+                self._renders.clear()
+                self._available = None
+                self._bundle_hash = bundle_hash
+            self._bundle_checked = now
+        return bundle_hash
+
+    def available_templates(self) -> Dict[str, List[str]]:
+        """get_available_templates, cached until the bundle changes"""
+        self.bundle_hash()
+        with self._lock:
+            if self._available is not None:
+                return self._available
+        available = self.template_manager.get_available_templates()
+        with self._lock:
+            self._available = available
+        return available
+
+    def render(self, config: Dict[str, Any], project_name: str, generated_at: Optional[str] = None,
+               reproducible: bool = True) -> Tuple[str, Dict[str, Any]]:
+        """
+        Render CLAUDE.md and its rules index.
+
+        Only reproducible renders (no timestamp, or a pinned one) are cached,
+        as in the build cache.
+
+        Args:
+            config: Configuration dictionary
+            project_name: Name of the project
+            generated_at: Pinned generation timestamp
+            reproducible: Omit the volatile timestamp
+
+        Returns:
+            (CLAUDE.md content, rules index)
+        """
+        key = None
+        if reproducible or generated_at:
+            key = json.dumps([self.bundle_hash(), config, project_name, generated_at],
+                             sort_keys=True, ensure_ascii=False)
+            with self._lock:
+                cached = self._renders.get(key)
+                if cached is not None:
+                    self._renders.move_to_end(key)
+                    return cached
+
+        sections = self.template_manager.compose_claude_md_sections(
+            config, project_name, generated_at=generated_at, reproducible=reproducible
+        )
+        rendered = (self.template_manager.join_sections(sections), build_rules_index(sections))
+        if key is not None:
+            with self._lock:
+                self._renders[key] = rendered
+                while len(self._renders) > self.cache_size:
+                    self._renders.popitem(last=False)
+        return rendered
+
+    def detect(self, project_path: Path) -> Dict[str, Any]:
+        """detect_stack, cached until the project's fingerprint changes"""
+        project_path = Path(project_path).resolve()
+        with self._lock:
+            cached = self._stacks.get(project_path)
+        if cached is not None and stack_fingerprint(project_path, cached[1]) == cached[0]:
+            return cached[1]
+        detected = detect_stack(project_path)
+        with self._lock:
+            self._stacks[project_path] = (stack_fingerprint(project_path, detected), detected)
+        return detected
+
+
+def _as_list(value: Any) -> List[str]:
+    """Accept a single name where a list is expected"""
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _canonical(argument: str, values: List[str], valid: List[str]) -> List[str]:
+    """Match names case-insensitively to their canonical spelling; unknown names are an error"""
+    by_name = {name.lower(): name for name in valid}
+    unknown = [value for value in values if str(value).lower() not in by_name]
+    if unknown:
+        raise ToolError(f"Unknown {argument}: {', '.join(map(str, unknown))} (choose from {', '.join(valid)})")
+    return [by_name[str(value).lower()] for value in values]
+
+
+def build_server(generator: WarmGenerator, default_project: Path) -> StdioMCPServer:
+    """
+    Register the generation tools.
+
+    Args:
+        generator: The warm generator shared by all calls
+        default_project: Project used when a call names no directory
+
+    Returns:
+        The server, ready to run
+    """
+    server = StdioMCPServer("new-claude-mcp-server", GENERATOR_VERSION)
+
+    def project_dir(directory: Optional[str]) -> Path:
+        path = (default_project / directory) if directory else default_project
+        if not path.is_dir():
+            raise ToolError(f"Not a directory: {path}")
+        return path.resolve()
+
+    def names(choices: List[str]) -> Dict[str, Any]:
+        return {"type": "array", "items": {"type": "string", "enum": list(choices)}}
+
+    # The schema lists the templates present at start-up; calls are checked against the current ones
+    available = generator.template_manager.get_available_templates()
+    sections = {"type": "array", "items": {"type": "string"}}
+    directory_property = {"type": "string", "description": "Project directory (default: the server's project)"}
+
+    @server.tool("render_claude_md", "Render CLAUDE.md for a stack; with write, save it (and .claude/rules.json) "
+                 "into the project", {
+                     "directory": directory_property,
+                     "project_name": {"type": "string", "description": "Project name (default: directory name)"},
+                     "project_type": {"type": "string", "enum": PROJECT_TYPES},
+                     "languages": names(available['languages']),
+                     "frameworks": names(available['frameworks']),
+                     "cloud_platform": {"type": "string", "enum": available['cloud_platforms']},
+                     "databases": names(available['databases']),
+                     "additional_tools": names(ADDITIONAL_TOOLS),
+                     "performance_profiles": names(available['performance_profiles']),
+                     "include_sections": dict(sections, description="Template heading sections to keep"),
+                     "exclude_sections": dict(sections, description="Template heading sections to drop"),
+                     "benchmarks": {"type": "boolean", "description": "Add the benchmark harness commands"},
+                     "detect": {"type": "boolean", "description": "Fill unset stack fields from detect_stack"},
+                     "write": {"type": "boolean", "description": "Write the files instead of returning CLAUDE.md"},
+                     "generated_at": {"type": "string", "description": "Pinned timestamp to embed"},
+                 })
+    def render_claude_md(directory: Optional[str] = None, project_name: Optional[str] = None,
+                         project_type: Optional[str] = None, cloud_platform: Optional[str] = None,
+                         include_sections: Optional[List[str]] = None, exclude_sections: Optional[List[str]] = None,
+                         benchmarks: bool = False, detect: bool = False, write: bool = False,
+                         generated_at: Optional[str] = None, **stack: Any) -> str:
+        unknown = set(stack) - set(STACK_KEYS)
+        if unknown:
+            raise ToolError(f"Unknown arguments: {', '.join(sorted(unknown))}")
+        path = project_dir(directory)
+        templates = generator.available_templates()
+        config: Dict[str, Any] = {key: _as_list(stack.get(key)) for key in STACK_KEYS}
+        for key in STACK_KEYS:
+            valid = ADDITIONAL_TOOLS if key == 'additional_tools' else templates[TEMPLATE_KEYS[key]]
+            config[key] = _canonical(key, config[key], valid)
+        if project_type:
+            project_type = _canonical('project_type', [project_type], PROJECT_TYPES)[0]
+        if cloud_platform:
+            cloud_platform = _canonical('cloud_platform', [cloud_platform], templates['cloud_platforms'])[0]
+        config.update(project_type=project_type, cloud_platform=cloud_platform, benchmarks=benchmarks)
+        if include_sections or exclude_sections:
+            config['sections'] = {'include': _as_list(include_sections), 'exclude': _as_list(exclude_sections)}
+        if detect:
+            detected = generator.detect(path)
+            for key in ('languages', 'frameworks', 'databases', 'additional_tools'):
+                config[key] = config[key] or detected[key]
+            config['cloud_platform'] = config['cloud_platform'] or detected['cloud_platform']
+
+        content, index = generator.render(config, project_name or path.name, generated_at)
+        if not write:
+            return content
+        # The index goes last so it never describes a CLAUDE.md that was not written
+        write_atomic(path / "CLAUDE.md", content.encode('utf-8'))
+        write_atomic(path / RULES_INDEX_FILE, serialize_rules_index(index).encode('utf-8'))
+        return (f"Wrote CLAUDE.md ({len(content.encode('utf-8')):,} bytes, {len(index['sections'])} sections) "
+                f"and {RULES_INDEX_FILE} to {path}")
+
+    @server.tool("detect_stack", "Detect the languages, frameworks, databases, cloud platform and tools a project "
+                 "uses", {"directory": directory_property})
+    def detect_stack_tool(directory: Optional[str] = None) -> str:
+        return json.dumps(generator.detect(project_dir(directory)), indent=2)
+
+    @server.tool("audit_claude_md", "Check CLAUDE.md for hand edits, an outdated generator and rules that no longer "
+                 "match the project's stack", {"directory": directory_property})
+    def audit_claude_md_tool(directory: Optional[str] = None) -> str:
+        path = project_dir(directory)
+        report = audit_claude_md(path, generator.available_templates(), generator.detect(path))
+        return json.dumps(report, indent=2)
+
+    @server.tool("list_templates", "List the languages, frameworks, cloud platforms, databases and performance "
+                 "profiles that have rules templates")
+    def list_templates() -> str:
+        return json.dumps(generator.available_templates(), indent=2)
+
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MCP server for warm CLAUDE.md generation')
+    parser.add_argument('project_path', nargs='?', default='.',
+                        help='Project used when a call names no directory (default: current directory)')
+    parser.add_argument('--cache-size', type=int, default=RENDER_CACHE_SIZE,
+                        help=f'Rendered documents kept in memory (default: {RENDER_CACHE_SIZE})')
+    args = parser.parse_args()
+
+    generator = WarmGenerator(args.cache_size)
+    server = build_server(generator, Path(args.project_path).resolve())
+    # Warm up behind the handshake; calls that arrive first load what they need themselves
+    threading.Thread(target=generator.warm, daemon=True).start()
+    server.log(f"new-claude MCP server running for project: {Path(args.project_path).resolve()}")
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
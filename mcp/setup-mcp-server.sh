@@ -70,6 +70,13 @@ else
     echo -e "${YELLOW}! MCP test client not found (optional)${NC}"
 fi
 
+# Python stub server for benchmarking the client without Node (needs its shared module)
+if [ -f "$SCRIPT_DIR/mcp-stub-server.py" ] && [ -f "$SCRIPT_DIR/mcp_stdio_server.py" ]; then
+    cp "$SCRIPT_DIR/mcp-stub-server.py" "$SCRIPT_DIR/mcp_stdio_server.py" "$MCP_SERVERS_DIR/"
+    chmod +x "$MCP_SERVERS_DIR/mcp-stub-server.py"
+    echo -e "${GREEN}✓ MCP stub server copied${NC}"
+fi
+
 # Step 5: Create MCP helper scripts
 echo -e "\n${YELLOW}Step 5: Creating MCP helper scripts...${NC}"
 
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Compare benchmark results against a committed baseline.
+
+Understands pytest-benchmark JSON, JMH JSON, `go test -bench` output and
+the simple {"unit": "ns", "benchmarks": {name: time}} JSON written by the
+JavaScript/TypeScript harness. Every result is normalized to nanoseconds
+per operation.
+
+Usage:
+    python benchmarks/compare_baseline.py RESULTS            # compare, exit 1 on regression
+    python benchmarks/compare_baseline.py RESULTS --save     # record RESULTS as the new baseline
+
+The baseline for benchmarks/results/<name>.<ext> defaults to
+benchmarks/baselines/<name>.json; commit the baselines directory.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+from pathlib import Path
+
+UNIT_NS = {'ns': 1.0, 'us': 1e3, 'µs': 1e3, 'ms': 1e6, 's': 1e9, 'min': 6e10}
+GO_BENCH_LINE = re.compile(r'^(Benchmark\S+?)(?:-\d+)?\s+\d+\s+([\d.]+) ns/op')
+
+
+def load_results(path: Path) -> dict:
+    """Read a results file and return {benchmark name: nanoseconds per operation}."""
+    text = path.read_text(encoding='utf-8')
+    if path.suffix != '.json':
+        return parse_go(text)
+
+    data = json.loads(text)
+    if isinstance(data, list):
+        return parse_jmh(data)
+    if isinstance(data.get('benchmarks'), list):
+        return {bench['fullname']: bench['stats']['mean'] * 1e9 for bench in data['benchmarks']}
+    scale = UNIT_NS[data.get('unit', 'ns')]
+    return {name: value * scale for name, value in data['benchmarks'].items()}
+
+
+def parse_go(text: str) -> dict:
+    """Average repeated `go test -bench -count=N` lines per benchmark."""
+    samples = {}
+    for line in text.splitlines():
+        match = GO_BENCH_LINE.match(line.strip())
+        if match:
+            samples.setdefault(match.group(1), []).append(float(match.group(2)))
+    return {name: statistics.fmean(values) for name, values in samples.items()}
+
+
+def parse_jmh(data: list) -> dict:
+    """Convert JMH scores (time per op or ops per time) to ns/op."""
+    results = {}
+    for bench in data:
+        metric = bench['primaryMetric']
+        numerator, _, denominator = metric['scoreUnit'].partition('/')
+        if numerator == 'ops':
+            results[bench['benchmark']] = UNIT_NS[denominator] / metric['score']
+        else:
+            results[bench['benchmark']] = metric['score'] * UNIT_NS[numerator]
+    return results
+
+
+def format_ns(value: float) -> str:
+    """Format nanoseconds with a readable unit."""
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('µs', 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f} {unit}"
+    return f"{value:.1f} ns"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare benchmark results against a baseline')
+    parser.add_argument('results', help='Results file (pytest-benchmark/JMH JSON, go test output, or simple JSON)')
+    parser.add_argument('--baseline', help='Baseline file (default: benchmarks/baselines/<results name>.json)')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Allowed slowdown in percent before failing (default: 10)')
+    parser.add_argument('--save', action='store_true', help='Store the results as the new baseline')
+    args = parser.parse_args()
+
+    results_path = Path(args.results)
+    baseline_path = Path(args.baseline or f"benchmarks/baselines/{results_path.stem}.json")
+    if not results_path.exists():
+        print(f"No results at {results_path}; run the benchmarks first")
+        return 1
+    current = load_results(results_path)
+    if not current:
+        print(f"No benchmark results found in {results_path}")
+        return 1
+
+    if args.save:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline = {'unit': 'ns', 'benchmarks': dict(sorted(current.items()))}
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n", encoding='utf-8')
+        print(f"Saved {len(current)} benchmarks to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; create one with --save")
+        return 1
+    baseline = load_results(baseline_path)
+
+    regressions = 0
+    width = max(len(name) for name in current)
+    for name in sorted(current):
+        if name not in baseline:
+            print(f"{name:<{width}}  {format_ns(current[name]):>10}  (new)")
+            continue
+        change = (current[name] - baseline[name]) / baseline[name] * 100
+        status = ""
+        if change > args.threshold:
+            status = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<{width}}  {format_ns(baseline[name]):>10} -> {format_ns(current[name]):>10}  {change:+6.1f}%{status}")
+    for name in sorted(set(baseline) - set(current)):
+        print(f"{name:<{width}}  (missing from results)")
+
+    if regressions:
+        print(f"\n{regressions} benchmark(s) slower than the baseline by more than {args.threshold:g}%")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:g}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+package benchmarks
+
+import (
+	"strconv"
+	"testing"
+)
+
+// buildPayload is an example workload: replace it with the operations your users wait for.
+func buildPayload(size int) map[string]int {
+	payload := make(map[string]int, size)
+	for i := 0; i < size; i++ {
+		payload["key-"+strconv.Itoa(i)] = i
+	}
+	return payload
+}
+
+func BenchmarkBuildPayload(b *testing.B) {
+	b.ReportAllocs()
+	for i := 0; i < b.N; i++ {
+		buildPayload(1000)
+	}
+}
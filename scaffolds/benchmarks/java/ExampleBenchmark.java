@@ -0,0 +1,36 @@
+package benchmarks;
+
+import java.util.HashMap;
+import java.util.Map;
+import java.util.concurrent.TimeUnit;
+
+import org.openjdk.jmh.annotations.Benchmark;
+import org.openjdk.jmh.annotations.BenchmarkMode;
+import org.openjdk.jmh.annotations.Fork;
+import org.openjdk.jmh.annotations.Measurement;
+import org.openjdk.jmh.annotations.Mode;
+import org.openjdk.jmh.annotations.OutputTimeUnit;
+import org.openjdk.jmh.annotations.Warmup;
+
+/**
+ * Example JMH benchmark: replace buildPayload with the operations your users wait for.
+ *
+ * benchmarks/jmh/build.gradle builds it with the Gradle JMH plugin and writes JSON
+ * results where compare_baseline.py expects them: gradle -p benchmarks/jmh jmh
+ */
+@BenchmarkMode(Mode.AverageTime)
+@OutputTimeUnit(TimeUnit.NANOSECONDS)
+@Warmup(iterations = 3, time = 1)
+@Measurement(iterations = 5, time = 1)
+@Fork(1)
+public class ExampleBenchmark {
+
+    @Benchmark
+    public Map<String, Integer> buildPayload() {
+        Map<String, Integer> payload = new HashMap<>(2048);
+        for (int i = 0; i < 1000; i++) {
+            payload.put("key-" + i, i);
+        }
+        return payload;
+    }
+}
@@ -0,0 +1,27 @@
+// Example benchmark: replace the task with the operations your users wait for.
+// Uses tinybench (npm install --save-dev tinybench).
+import { mkdirSync, writeFileSync } from 'node:fs';
+import { Bench } from 'tinybench';
+
+const bench = new Bench({ time: 500 });
+
+bench.add('build payload', () => {
+  const payload = {};
+  for (let i = 0; i < 1000; i++) {
+    payload[`key-${i}`] = i;
+  }
+  return payload;
+});
+
+await bench.run();
+console.table(bench.table());
+
+// Mean latency per task in milliseconds (tinybench v3 moved it under result.latency)
+const results = Object.fromEntries(
+  bench.tasks.map((task) => [task.name, task.result.latency?.mean ?? task.result.mean])
+);
+mkdirSync('benchmarks/results', { recursive: true });
+writeFileSync(
+  'benchmarks/results/javascript.json',
+  JSON.stringify({ unit: 'ms', benchmarks: results }, null, 2) + '\n'
+);
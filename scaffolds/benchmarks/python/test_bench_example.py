@@ -0,0 +1,19 @@
+"""
+Example benchmark: replace build_payload with the operations your users wait for.
+
+Uses pytest-benchmark (pip install -r benchmarks/requirements.txt); a plain
+`pytest` run without it skips this module instead of failing.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+def build_payload(size):
+    return {f"key-{i}": i for i in range(size)}
+
+
+def test_build_payload(benchmark):
+    result = benchmark(build_payload, 1000)
+    assert len(result) == 1000
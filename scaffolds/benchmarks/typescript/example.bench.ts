@@ -0,0 +1,29 @@
+// Example benchmark: replace the task with the operations your users wait for.
+// Uses tinybench and tsx (npm install --save-dev tinybench tsx).
+import { mkdirSync, writeFileSync } from 'node:fs';
+import { Bench } from 'tinybench';
+
+const bench = new Bench({ time: 500 });
+
+bench.add('build payload', () => {
+  const payload: Record<string, number> = {};
+  for (let i = 0; i < 1000; i++) {
+    payload[`key-${i}`] = i;
+  }
+  return payload;
+});
+
+await bench.run();
+console.table(bench.table());
+
+// Mean latency per task in milliseconds (tinybench v3 moved it under result.latency)
+const results: Record<string, number> = {};
+for (const task of bench.tasks) {
+  const result = task.result as { latency?: { mean: number }; mean?: number } | undefined;
+  results[task.name] = result?.latency?.mean ?? result?.mean ?? Number.NaN;
+}
+mkdirSync('benchmarks/results', { recursive: true });
+writeFileSync(
+  'benchmarks/results/typescript.json',
+  JSON.stringify({ unit: 'ms', benchmarks: results }, null, 2) + '\n'
+);
@@ -14,11 +14,33 @@ from .prompts import PromptManager
 from .template_manager import TemplateManager
 from .file_generator import FileGenerator
 from .project_manager import ProjectManager
+from .build_cache import BuildCache
+from .renderer import render, Document, RenderError
+from .rules_index import RulesIndex
+from .rules_search import RulesSearchIndex
+from .session import SessionRecorder, SessionReplay
+from .bulk_render import BulkRenderer, ConfigSpace
+from .memory_trace import MemoryTracer
+from .stack_detect import detect_stack
+from .claude_md_audit import audit_claude_md
 
 __all__ = [
     'ClaudeProjectCreator',
     'PromptManager', 
     'TemplateManager',
     'FileGenerator',
-    'ProjectManager'
+    'ProjectManager',
+    'BuildCache',
+    'render',
+    'Document',
+    'RenderError',
+    'RulesIndex',
+    'RulesSearchIndex',
+    'SessionRecorder',
+    'SessionReplay',
+    'BulkRenderer',
+    'ConfigSpace',
+    'MemoryTracer',
+    'detect_stack',
+    'audit_claude_md'
 ]
\ No newline at end of file
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Background work that overlaps with the interactive wizard."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+
+class BackgroundPipeline:
+    """
+    Runs setup work that does not depend on the user's answers on worker
+    threads while the wizard blocks on input().
+
+    Tasks must not print (output would interleave with the prompts); they
+    report problems through ``warn``, and the collected messages are shown
+    once the wizard is finished.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="new-claude")
+        self._tasks: Dict[str, Future] = {}
+        self._warnings: List[str] = []
+        self._lock = threading.Lock()
+
+    def warn(self, message: str) -> None:
+        """Record a message to show after the wizard (safe to call from tasks)."""
+        with self._lock:
+            self._warnings.append(message)
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Start a named task.
+
+        Args:
+            name: Task name used to collect the result
+            fn: Callable to run on a worker thread
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            Future of the task
+        """
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._tasks[name] = future
+        return future
+
+    def result(self, name: str, default: Any = None) -> Any:
+        """
+        Wait for a task and get its result.
+
+        Args:
+            name: Task name given to submit
+            default: Value returned if the task was never started or failed
+
+        Returns:
+            The task's return value, or default
+        """
+        future = self._tasks.get(name)
+        if future is None:
+            return default
+        try:
+            return future.result()
+        except Exception as e:
+            self.warn(f"Warning: Background task '{name}' failed: {e}")
+            return default
+
+    def drain_warnings(self) -> List[str]:
+        """Get and clear the messages recorded so far."""
+        with self._lock:
+            warnings, self._warnings = self._warnings, []
+        return warnings
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        """
+        Wait for the pipeline's tasks to finish.
+
+        Args:
+            cancel_pending: Drop tasks that have not started yet (e.g. when the wizard was aborted)
+        """
+        if cancel_pending:
+            # Not shutdown(cancel_futures=True): that argument needs Python 3.9
+            for future in self._tasks.values():
+                future.cancel()
+        self._executor.shutdown(wait=True)
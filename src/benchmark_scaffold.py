@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark scaffolding for generated projects.
+
+With the ``benchmarks`` option, new projects get a ``benchmarks/`` tree
+with an example benchmark for each selected language in that ecosystem's
+harness (pytest-benchmark, tinybench, JMH, ``go test -bench``), a shared
+``compare_baseline.py`` that fails on regressions against a committed
+baseline, and matching entries in CLAUDE.md's Key Commands, so every
+scaffolded repository starts with a performance regression harness.
+
+The files are copied from ``scaffolds/benchmarks``; SCAFFOLD_DIGEST
+covers them so the build cache notices edits.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+from config import get_scaffolds_dir
+
+
+class BenchmarkHarness(NamedTuple):
+    """Benchmark setup for one language."""
+    tool: str
+    files: Tuple[Tuple[str, str], ...]  # (source in scaffolds/benchmarks, destination in the project)
+    commands: Tuple[Tuple[str, str], ...]  # (label, shell command) for Key Commands
+
+
+# Files every benchmark tree gets
+COMMON_FILES: Tuple[Tuple[str, str], ...] = (
+    ("compare_baseline.py", "benchmarks/compare_baseline.py"),
+    ("results.gitignore", "benchmarks/results/.gitignore"),
+)
+
+BENCHMARK_HARNESSES: Dict[str, BenchmarkHarness] = {
+    "Python": BenchmarkHarness("pytest-benchmark", (
+        ("python/test_bench_example.py", "benchmarks/test_bench_example.py"),
+        ("python/requirements.txt", "benchmarks/requirements.txt"),
+    ), (
+        ("Benchmark (Python)",
+         "pytest benchmarks/ --benchmark-only --benchmark-json=benchmarks/results/python.json"),
+        ("Compare with baseline (Python)", "python benchmarks/compare_baseline.py benchmarks/results/python.json"),
+    )),
+    "JavaScript": BenchmarkHarness("tinybench", (
+        ("javascript/example.bench.mjs", "benchmarks/example.bench.mjs"),
+    ), (
+        ("Benchmark (JavaScript)", "node benchmarks/example.bench.mjs"),
+        ("Compare with baseline (JavaScript)", "python benchmarks/compare_baseline.py benchmarks/results/javascript.json"),
+    )),
+    "TypeScript": BenchmarkHarness("tinybench", (
+        ("typescript/example.bench.ts", "benchmarks/example.bench.ts"),
+    ), (
+        ("Benchmark (TypeScript)", "npx tsx benchmarks/example.bench.ts"),
+        ("Compare with baseline (TypeScript)", "python benchmarks/compare_baseline.py benchmarks/results/typescript.json"),
+    )),
+    "Java": BenchmarkHarness("JMH", (
+        ("java/ExampleBenchmark.java", "benchmarks/jmh/benchmarks/ExampleBenchmark.java"),
+        ("java/build.gradle", "benchmarks/jmh/build.gradle"),
+        ("java/settings.gradle", "benchmarks/jmh/settings.gradle"),
+    ), (
+        ("Benchmark (Java)", "gradle -p benchmarks/jmh jmh"),
+        ("Compare with baseline (Java)", "python benchmarks/compare_baseline.py benchmarks/results/java.json"),
+    )),
+    "Go": BenchmarkHarness("go test -bench", (
+        ("go/example_test.go", "benchmarks/example_test.go"),
+    ), (
+        ("Benchmark (Go)",
+         "go test -run='^$' -bench=. -benchmem -count=5 ./benchmarks/ | tee benchmarks/results/go.txt"),
+        ("Compare with baseline (Go)", "python benchmarks/compare_baseline.py benchmarks/results/go.txt"),
+    )),
+}
+
+# A TypeScript harness covers JavaScript code as well
+SUPERSEDED_HARNESSES = {"JavaScript": "TypeScript"}
+
+
+@lru_cache(maxsize=None)
+def _read_scaffold(source: str) -> str:
+    """Read a scaffold file (cached; the files ship with the generator)."""
+    return (get_scaffolds_dir() / "benchmarks" / source).read_text(encoding='utf-8')
+
+
+def _digest_scaffolds() -> str:
+    """Hash every benchmark scaffold file that can be copied into a project."""
+    sources = {source for source, _ in COMMON_FILES}
+    sources.update(source for harness in BENCHMARK_HARNESSES.values() for source, _ in harness.files)
+    digest = hashlib.sha256()
+    for source in sorted(sources):
+        try:
+            content = _read_scaffold(source).encode('utf-8')
+        except OSError:
+            content = b''
+        digest.update(source.encode('utf-8') + b'\0' + content + b'\0')
+    return digest.hexdigest()
+
+
+SCAFFOLD_DIGEST = _digest_scaffolds()
+
+
+def harnesses_for_config(config: dict) -> List[str]:
+    """
+    Choose the languages that get a benchmark harness.
+
+    Args:
+        config: User configuration dictionary
+
+    Returns:
+        Language names in selection order; empty unless the benchmarks option is on
+    """
+    if not config.get('benchmarks'):
+        return []
+    languages = [language for language in config.get('languages') or [] if language in BENCHMARK_HARNESSES]
+    return [
+        language for language in dict.fromkeys(languages)
+        if SUPERSEDED_HARNESSES.get(language) not in languages
+    ]
+
+
+def benchmark_files(config: dict) -> Dict[str, str]:
+    """
+    Render the benchmark tree for a configuration.
+
+    Args:
+        config: User configuration dictionary
+
+    Returns:
+        Mapping of file name (relative to the project) to content; empty when not enabled
+    """
+    languages = harnesses_for_config(config)
+    if not languages:
+        return {}
+
+    files = {}
+    for source, destination in COMMON_FILES:
+        files[destination] = _read_scaffold(source)
+    for language in languages:
+        for source, destination in BENCHMARK_HARNESSES[language].files:
+            files[destination] = _read_scaffold(source)
+    return files
+
+
+def benchmark_destinations() -> List[str]:
+    """
+    List every file the benchmark tree can add to a project.
+
+    Returns:
+        File names relative to the project, for any configuration
+    """
+    destinations = [destination for _, destination in COMMON_FILES]
+    for harness in BENCHMARK_HARNESSES.values():
+        destinations += [destination for _, destination in harness.files]
+    return list(dict.fromkeys(destinations))
+
+
+def benchmark_commands(config: dict) -> List[str]:
+    """
+    Get the Key Commands lines for the benchmark tree.
+
+    Args:
+        config: User configuration dictionary
+
+    Returns:
+        Commented command lines for CLAUDE.md, without duplicates
+    """
+    languages = harnesses_for_config(config)
+    lines = []
+    for language in languages:
+        lines.extend(f"# {label}: {command}" for label, command in BENCHMARK_HARNESSES[language].commands)
+    if languages:
+        lines.append("# Save new baseline: python benchmarks/compare_baseline.py <results file> --save")
+    return list(dict.fromkeys(lines))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Content-addressed build cache for generated project files."""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from config import Colors, GENERATOR_VERSION, get_cache_dir, write_atomic
+from rules_index import RULES_INDEX_FILE
+from gitignore import FRAGMENTS_DIGEST
+from benchmark_scaffold import SCAFFOLD_DIGEST
+
+
+class BuildCache:
+    """
+    Stores rendered CLAUDE.md, rules index, README.md, .gitignore and benchmark scaffold outputs.
+
+    Artifacts are stored once per content hash under ``objects/`` and a
+    manifest per build key under ``manifests/`` maps artifact names to
+    those objects. A build key is derived from the template bundle hash,
+    the canonical configuration, the generator version, the .gitignore
+    fragments and the benchmark scaffold files, so a repeated scaffold
+    becomes a manifest lookup plus a file copy.
+    """
+
+    ARTIFACTS = ("CLAUDE.md", RULES_INDEX_FILE, "README.md", ".gitignore")
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir() / "builds"
+        self.objects_dir = self.cache_dir / "objects"
+        self.manifests_dir = self.cache_dir / "manifests"
+        self.colors = Colors()
+
+    def compute_key(self, bundle_hash: str, config: dict, project_name: str,
+                    generated_at: Optional[str] = None, rule_imports: Optional[dict] = None) -> str:
+        """
+        Compute the build key for a render.
+
+        Args:
+            bundle_hash: Hash of the template bundle (see TemplateManager.get_template_bundle_hash)
+            config: User configuration dictionary
+            project_name: Name of the project (embedded in README.md)
+            generated_at: Pinned timestamp embedded in CLAUDE.md, if any
+            rule_imports: Installed rules state for import mode (see TemplateManager.rule_imports_state)
+
+        Returns:
+            Hex SHA-256 build key
+        """
+        key_material = {
+            'bundle': bundle_hash,
+            'config': config,
+            'project_name': project_name,
+            'generated_at': generated_at,
+            'rule_imports': rule_imports,
+            'generator_version': GENERATOR_VERSION,
+            'gitignore_fragments': FRAGMENTS_DIGEST,
+            'benchmark_scaffold': SCAFFOLD_DIGEST,
+        }
+        canonical = json.dumps(key_material, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _object_path(self, content_hash: str) -> Path:
+        """Get the storage path for an object hash."""
+        return self.objects_dir / content_hash[:2] / content_hash
+
+    def _manifest_path(self, key: str) -> Path:
+        """Get the storage path for a build manifest."""
+        return self.manifests_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Path]]:
+        """
+        Look up the cached artifacts for a build key.
+
+        Args:
+            key: Build key from compute_key
+
+        Returns:
+            Mapping of artifact name to cached object path, or None on a miss
+        """
+        try:
+            with open(self._manifest_path(key), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        artifacts = {}
+        for name, content_hash in manifest.get('artifacts', {}).items():
+            object_path = self._object_path(content_hash)
+            if not object_path.is_file():
+                return None
+            artifacts[name] = object_path
+        return artifacts
+
+    def put(self, key: str, artifacts: Dict[str, str]) -> bool:
+        """
+        Store rendered artifacts under a build key.
+
+        Args:
+            key: Build key from compute_key
+            artifacts: Mapping of artifact name to rendered content
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            manifest = {'generator_version': GENERATOR_VERSION, 'artifacts': {}}
+            for name, content in artifacts.items():
+                data = content.encode('utf-8')
+                content_hash = hashlib.sha256(data).hexdigest()
+                object_path = self._object_path(content_hash)
+                if not object_path.exists():
+                    write_atomic(object_path, data)
+                manifest['artifacts'][name] = content_hash
+
+            manifest_data = json.dumps(manifest, sort_keys=True, indent=2).encode('utf-8')
+            write_atomic(self._manifest_path(key), manifest_data)
+            return True
+        except OSError as e:
+            print(f"{self.colors.YELLOW}Warning: Could not write build cache: {e}{self.colors.NC}")
+            return False
+
+    def copy_to(self, key: str, project_path: Path, names: Iterable[str]) -> bool:
+        """
+        Copy cached artifacts into a project directory.
+
+        Args:
+            key: Build key from compute_key
+            project_path: Path to the project directory
+            names: Artifact names to copy
+
+        Returns:
+            True if every requested artifact was copied, False otherwise
+        """
+        artifacts = self.get(key)
+        if artifacts is None:
+            return False
+
+        try:
+            for name in names:
+                if name not in artifacts:
+                    return False
+                destination = project_path / name
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(artifacts[name], destination)
+            return True
+        except OSError as e:
+            print(f"{self.colors.YELLOW}Warning: Could not copy cached build output: {e}{self.colors.NC}")
+            return False
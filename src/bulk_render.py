@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Bulk rendering of CLAUDE.md over the configuration space.
+
+Template changes are checked by rendering every meaningful combination of
+project type, languages, frameworks, cloud platform and databases. Rather
+than composing each document from scratch, the space is walked as a trie
+in document order: each level fixes one configuration field, and each
+CLAUDE.md stage is rendered at the shallowest node whose fixed fields
+cover everything the stage depends on (TemplateManager.stage_dependencies).
+Children inherit the rendered stages and a copy of the running SHA-256 of
+the document prefix, so a leaf only renders and hashes what differs from
+its siblings.
+
+Results stream to a JSONL file (configuration, SHA-256 and size of each
+document), optionally alongside the documents themselves stored by hash;
+subtrees are rendered in worker processes. A MemoryTracer can watch a
+(then in-process) run phase by phase and every N documents.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+from config import (
+    PROJECT_TYPES, PROJECT_TYPE_LANGUAGES, ALL_LANGUAGES, LANGUAGE_FRAMEWORKS,
+    CLOUD_PLATFORMS, DATABASES, write_atomic
+)
+from memory_trace import MemoryTracer
+from section_tree import SectionSelection
+from template_manager import SECTION_SEPARATOR, TemplateManager
+
+
+# Trie levels in document order: the configuration field each level fixes
+LEVEL_FIELDS = ('project_type', 'languages', 'frameworks', 'cloud_platform', 'databases')
+
+_SEPARATOR_BYTES = SECTION_SEPARATOR.encode('utf-8')
+
+
+def _freeze(config: Dict[str, Any], fields) -> tuple:
+    """Hashable snapshot of some configuration fields."""
+    return tuple(tuple(value) if isinstance(value, list) else value
+                 for value in (config.get(field_name) for field_name in fields))
+
+
+def _real(options: List[str]) -> List[str]:
+    """Drop the 'Other/Custom' placeholder, which renders like a skipped answer."""
+    return [option for option in options if option != "Other/Custom"]
+
+
+def _subsets(options: List[str], max_size: int) -> List[List[str]]:
+    """All selections of up to max_size options, smallest first, in option order."""
+    return [list(combination) for size in range(max_size + 1)
+            for combination in itertools.combinations(options, size)]
+
+
+@dataclass(frozen=True)
+class ConfigSpace:
+    """The configurations a bulk render covers."""
+
+    max_languages: int = 2
+    max_frameworks: int = 1
+    max_databases: int = 1
+    suggested_languages: bool = True  # Offer a project type's suggested languages, as the wizard does
+
+    def options(self, field_name: str, config: Dict[str, Any]) -> List[Any]:
+        """
+        Get the values a level can take below a partial configuration.
+
+        Args:
+            field_name: One of LEVEL_FIELDS
+            config: Configuration with the previous levels fixed
+
+        Returns:
+            Values in a deterministic order
+        """
+        if field_name == 'project_type':
+            return [None] + _real(PROJECT_TYPES)
+        if field_name == 'languages':
+            suggested = PROJECT_TYPE_LANGUAGES.get(config.get('project_type')) if self.suggested_languages else None
+            return _subsets(_real(suggested or ALL_LANGUAGES), self.max_languages)
+        if field_name == 'frameworks':
+            offered = sorted({fw for language in config['languages'] for fw in LANGUAGE_FRAMEWORKS.get(language, [])})
+            return _subsets(offered, self.max_frameworks)
+        if field_name == 'cloud_platform':
+            return [None] + _real(CLOUD_PLATFORMS)
+        if field_name == 'databases':
+            return _subsets(_real(DATABASES), self.max_databases)
+        raise ValueError(f"Unknown level field: {field_name}")
+
+    def prefixes(self, depth: int) -> Iterator[Dict[str, Any]]:
+        """
+        Enumerate the partial configurations at a trie depth, in walk order.
+
+        Args:
+            depth: Number of leading LEVEL_FIELDS to fix
+
+        Yields:
+            Configurations with the first depth levels fixed
+        """
+        def walk(config: Dict[str, Any], level: int) -> Iterator[Dict[str, Any]]:
+            if level == depth:
+                yield config
+                return
+            field_name = LEVEL_FIELDS[level]
+            for value in self.options(field_name, config):
+                yield from walk({**config, field_name: value}, level + 1)
+
+        yield from walk({}, 0)
+
+    def count(self) -> int:
+        """Count the configurations without rendering them."""
+        last = LEVEL_FIELDS[-1]
+        return sum(len(self.options(last, prefix)) for prefix in self.prefixes(len(LEVEL_FIELDS) - 1))
+
+
+class _Prefix(NamedTuple):
+    """Rendered state of a trie node."""
+    texts: Tuple[Optional[Tuple[str, ...]], ...]  # Section texts per stage; None until the stage is decided
+    digest: Any  # SHA-256 of the document up to stage `hashed`
+    hashed: int  # Number of leading stages folded into digest
+    size: int  # Bytes folded into digest
+    sections: int  # Sections folded into digest
+
+
+class BulkRenderSummary(NamedTuple):
+    """Outcome of a bulk render."""
+    documents: int
+    distinct: int
+    bytes: int
+    seconds: float
+
+
+class BulkRenderer:
+    """Renders every configuration of a ConfigSpace with prefix sharing."""
+
+    def __init__(self, space: Optional[ConfigSpace] = None, base_config: Optional[Dict[str, Any]] = None,
+                 project_name: str = "project", generated_at: Optional[str] = None,
+                 documents_dir: Optional[Path] = None, tracer: Optional[MemoryTracer] = None):
+        """
+        Args:
+            space: Configurations to cover
+            base_config: Fields shared by every configuration (additional_tools, sections, ...);
+                rules are always inlined
+            project_name: Project name embedded in every document
+            generated_at: Pinned timestamp to embed; None renders reproducibly without one
+            documents_dir: Also store each distinct document as <sha256>.md under this directory
+            tracer: Started MemoryTracer to notify of phases and rendered documents
+        """
+        self.space = space or ConfigSpace()
+        self.base_config = {key: value for key, value in (base_config or {}).items()
+                            if key not in LEVEL_FIELDS and key not in ('rules_mode', 'rules_dir')}
+        self.project_name = project_name
+        self.generated_at = generated_at
+        self.documents_dir = Path(documents_dir) if documents_dir else None
+        self.tracer = tracer
+        self.template_manager = TemplateManager(on_warning=lambda message: None)
+        self.selection = SectionSelection.from_config(self.base_config)
+        self._stages = list(TemplateManager.SECTION_STAGES)
+        # Rendered stages by (stage, values of its selecting fields) -> {dependencies: {their values: texts}}
+        self._stage_memo: Dict[Tuple[str, tuple], Dict[Tuple[str, ...], Dict[tuple, Tuple[str, ...]]]] = {}
+
+    def render_subtree(self, prefix: Dict[str, Any], out: TextIO) -> Tuple[List[str], int]:
+        """
+        Render every configuration below a partial configuration.
+
+        Args:
+            prefix: Values for the leading LEVEL_FIELDS (see ConfigSpace.prefixes)
+            out: Stream receiving one JSON line per document
+
+        Returns:
+            (document hashes in walk order, total bytes)
+        """
+        node = _Prefix((None,) * len(self._stages), hashlib.sha256(), 0, 0, 0)
+        config = dict(self.base_config)
+        depth = 0
+        node = self._advance(node, config, depth)
+        for field_name in LEVEL_FIELDS:
+            if field_name not in prefix:
+                break
+            config[field_name] = prefix[field_name]
+            depth += 1
+            node = self._advance(node, config, depth)
+        hashes: List[str] = []
+        size = self._walk(node, config, depth, out, hashes)
+        return hashes, size
+
+    def _walk(self, node: _Prefix, config: Dict[str, Any], depth: int, out: TextIO, hashes: List[str]) -> int:
+        """Depth-first walk below a node; returns the bytes rendered."""
+        if depth == len(LEVEL_FIELDS):
+            hashes.append(self._emit(node, config, out))
+            if self.tracer is not None:
+                self.tracer.document_done()
+            return node.size
+        size = 0
+        field_name = LEVEL_FIELDS[depth]
+        for value in self.space.options(field_name, config):
+            child_config = {**config, field_name: value}
+            size += self._walk(self._advance(node, child_config, depth + 1), child_config, depth + 1, out, hashes)
+        return size
+
+    def _advance(self, parent: _Prefix, config: Dict[str, Any], depth: int) -> _Prefix:
+        """Render the stages that became decidable at this depth and extend the prefix hash."""
+        unfixed = set(LEVEL_FIELDS[depth:])
+        texts = list(parent.texts)
+        context = None
+        for index, (stage, stage_fields) in enumerate(self._stages):
+            if texts[index] is not None or unfixed.intersection(stage_fields):
+                continue
+
+            # Stages recur with the same inputs all over the trie (every leaf picks from
+            # the same few database sets), so renders are memoized by what they read
+            memo = self._stage_memo.setdefault((stage, _freeze(config, stage_fields)), {})
+            for dependencies, renders in memo.items():
+                if not unfixed.intersection(dependencies):
+                    texts[index] = renders.get(_freeze(config, dependencies))
+                    if texts[index] is not None:
+                        break
+            if texts[index] is not None:
+                continue
+
+            if context is None:
+                context = self.template_manager.build_template_context(config, self.project_name, self.generated_at)
+            sections = self.template_manager.render_stage(stage, context, self.selection)
+            dependencies = tuple(sorted(self.template_manager.stage_dependencies(stage, sections)))
+            if not unfixed.intersection(dependencies):
+                texts[index] = tuple(section.text for section in sections)
+                memo.setdefault(dependencies, {})[_freeze(config, dependencies)] = texts[index]
+
+        digest, hashed, size, count = parent.digest, parent.hashed, parent.size, parent.sections
+        if hashed < len(texts) and texts[hashed] is not None:
+            digest = digest.copy()
+            while hashed < len(texts) and texts[hashed] is not None:
+                for text in texts[hashed]:
+                    data = text.encode('utf-8')
+                    if count:
+                        digest.update(_SEPARATOR_BYTES)
+                        size += len(_SEPARATOR_BYTES)
+                    digest.update(data)
+                    size += len(data)
+                    count += 1
+                hashed += 1
+        return _Prefix(tuple(texts), digest, hashed, size, count)
+
+    def _emit(self, node: _Prefix, config: Dict[str, Any], out: TextIO) -> str:
+        """Write the record (and optionally the document) for a leaf; returns its hash."""
+        content_hash = node.digest.hexdigest()
+        record = {
+            'config': {field_name: config[field_name] for field_name in LEVEL_FIELDS},
+            'sha256': content_hash,
+            'bytes': node.size,
+        }
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if self.documents_dir is not None:
+            document_path = self.documents_dir / content_hash[:2] / f"{content_hash}.md"
+            if not document_path.exists():
+                content = SECTION_SEPARATOR.join(text for stage_texts in node.texts for text in stage_texts)
+                write_atomic(document_path, content.encode('utf-8'))
+        return content_hash
+
+    def render_all(self, output_path: Path, workers: Optional[int] = None, split_depth: int = 2) -> BulkRenderSummary:
+        """
+        Render the whole space into a JSONL file.
+
+        Subtrees below split_depth are rendered by worker processes; records
+        are written in walk order regardless of the number of workers.
+        With a tracer the render runs in-process, where tracemalloc can see it.
+
+        Args:
+            output_path: JSONL file to write
+            workers: Worker processes (default: CPU count; 1 renders in-process)
+            split_depth: Trie depth at which the space is divided into tasks
+
+        Returns:
+            Summary of the run
+        """
+        workers = 1 if self.tracer is not None else workers or os.cpu_count() or 1
+        start = time.perf_counter()
+        prefixes = list(self.space.prefixes(min(split_depth, len(LEVEL_FIELDS))))
+        if self.tracer is not None:
+            self.tracer.checkpoint("phase: enumerate")
+        documents = total_bytes = 0
+        hashes = set()
+
+        with open(output_path, 'w', encoding='utf-8') as out:
+            def collect(results: Iterator[Tuple[str, List[str], int]]) -> None:
+                nonlocal documents, total_bytes
+                for chunk, chunk_hashes, size in results:
+                    out.write(chunk)
+                    hashes.update(chunk_hashes)
+                    documents += len(chunk_hashes)
+                    total_bytes += size
+
+            if workers == 1:
+                collect(_render_chunk(self, prefix) for prefix in prefixes)
+                if self.tracer is not None:
+                    self.tracer.checkpoint("phase: render")
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self,)) as executor:
+                    collect(executor.map(_render_in_worker, prefixes, chunksize=4))
+
+        return BulkRenderSummary(documents, len(hashes), total_bytes, time.perf_counter() - start)
+
+    def __getstate__(self) -> dict:
+        # The template manager is rebuilt in each worker process
+        state = dict(self.__dict__)
+        state['template_manager'] = None
+        state['tracer'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.template_manager = TemplateManager(on_warning=lambda message: None)
+
+
+class _ChunkWriter:
+    """Minimal text sink collecting JSON lines."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+
+
+def _render_chunk(renderer: BulkRenderer, prefix: Dict[str, Any]) -> Tuple[str, List[str], int]:
+    """Render one subtree to a block of JSON lines."""
+    writer = _ChunkWriter()
+    hashes, size = renderer.render_subtree(prefix, writer)
+    return ''.join(writer.parts), hashes, size
+
+
+_worker: Optional[BulkRenderer] = None
+
+
+def _init_worker(renderer: BulkRenderer) -> None:
+    """Keep one renderer (and its warm template cache) per worker process."""
+    global _worker
+    _worker = renderer
+
+
+def _render_in_worker(prefix: Dict[str, Any]) -> Tuple[str, List[str], int]:
+    """Worker entry point."""
+    return _render_chunk(_worker, prefix)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Audit a project's CLAUDE.md against its rules index and its code.
+
+The rules index records which templates each section came from and the
+section hashes, so without re-rendering anything an audit can tell which
+sections were edited by hand, whether the document was written by an
+older generator, and which templates no longer match the stack the
+project actually uses (languages, frameworks, databases and cloud
+platform detected by stack_detect).
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from config import CLOUD_FILES, DATABASE_FILES, FRAMEWORK_FILES, GENERATOR_VERSION, LANGUAGE_FILES
+from rules_index import RulesIndex
+from stack_detect import detect_stack
+
+
+# Rules index section prefix -> (configuration key, template name -> display name)
+STACK_SECTIONS = {
+    'languages/': ('languages', {name: label for label, name in LANGUAGE_FILES.items()}),
+    'frameworks/': ('frameworks', {name: label for label, name in FRAMEWORK_FILES.items()}),
+    'databases/': ('databases', {name: label for label, name in DATABASE_FILES.items()}),
+    'cloud/': ('cloud_platform', {name: label for label, name in CLOUD_FILES.items()}),
+}
+
+
+def indexed_stack(index: RulesIndex) -> Dict[str, List[str]]:
+    """
+    Read the stack a CLAUDE.md was generated for from its rules index.
+
+    Args:
+        index: The project's rules index
+
+    Returns:
+        Display names per configuration key ('cloud_platform' as a list)
+    """
+    stack: Dict[str, List[str]] = {key: [] for key, _ in STACK_SECTIONS.values()}
+    for section_id in index.section_ids():
+        for prefix, (key, names) in STACK_SECTIONS.items():
+            if section_id.startswith(prefix):
+                name = section_id[len(prefix):]
+                stack[key].append(names.get(name, name))
+    return stack
+
+
+def audit_claude_md(project_path: Path, available: Optional[Dict[str, List[str]]] = None,
+                    detected: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Audit CLAUDE.md in a project.
+
+    Args:
+        project_path: Project root
+        available: TemplateManager.get_available_templates(); only detected
+            values that have a template are reported as missing
+        detected: detect_stack result, if already computed
+
+    Returns:
+        Report with 'ok', 'findings' (one line each) and the details behind them
+    """
+    project_path = Path(project_path)
+    claude_md = project_path / "CLAUDE.md"
+    if not claude_md.is_file():
+        return {'ok': False, 'findings': ["No CLAUDE.md in the project"]}
+
+    index = RulesIndex.load(project_path)
+    if index is None:
+        return {
+            'ok': False,
+            'findings': ["CLAUDE.md has no readable rules index (.claude/rules.json); regenerate it to audit"],
+        }
+
+    findings = []
+    generator_version = index.index.get('generator_version')
+    if generator_version != GENERATOR_VERSION:
+        findings.append(f"Generated by new-claude {generator_version}; the current version is {GENERATOR_VERSION}")
+
+    edited = []
+    document_hash = hashlib.sha256(claude_md.read_bytes()).hexdigest()
+    if document_hash != index.index.get('document_sha256'):
+        edited = [section_id for section_id in index.section_ids() if index.read_section(section_id) is None]
+        if edited:
+            findings.append(f"Edited by hand since generation: {', '.join(edited)}")
+        else:
+            findings.append("CLAUDE.md was changed outside the indexed sections")
+
+    if detected is None:
+        detected = detect_stack(project_path)
+    configured = indexed_stack(index)
+    templates = {
+        'languages': (available or {}).get('languages'),
+        'frameworks': (available or {}).get('frameworks'),
+        'databases': (available or {}).get('databases'),
+        'cloud_platform': (available or {}).get('cloud_platforms'),
+    }
+    # Absence only counts where there was something to look at; cloud platforms often leave no marker
+    judged = {
+        'languages': bool(detected.get('file_counts')),
+        'frameworks': bool(detected.get('manifests')),
+        'databases': bool(detected.get('manifests')),
+        'cloud_platform': False,
+    }
+    missing: Dict[str, List[str]] = {}
+    unused: Dict[str, List[str]] = {}
+    for key, names in configured.items():
+        found = detected.get(key) or []
+        if isinstance(found, str):
+            found = [found]
+        with_template = templates[key]
+        missing[key] = [value for value in found
+                        if value not in names and (with_template is None or value in with_template)]
+        unused[key] = [value for value in names if value not in found] if judged[key] else []
+        if missing[key]:
+            findings.append(f"Project uses {', '.join(missing[key])} but CLAUDE.md has no rules for it")
+        if unused[key]:
+            findings.append(f"CLAUDE.md has rules for {', '.join(unused[key])}, which the project does not appear to use")
+
+    return {
+        'ok': not findings,
+        'findings': findings,
+        'generator_version': generator_version,
+        'edited_sections': edited,
+        'configured': configured,
+        'detected': {key: detected.get(key) for key in configured},
+        'missing': {key: values for key, values in missing.items() if values},
+        'unused': {key: values for key, values in unused.items() if values},
+    }
@@ -2,9 +2,13 @@
 """Configuration and constants for the Claude project creator."""
 
 import os
+import tempfile
 from pathlib import Path
 from typing import Dict, List
 
+# Generator version - part of the build cache key, keep in sync with __init__.py
+GENERATOR_VERSION = "2.0.0"
+
 # Colors for terminal output
 class Colors:
     GREEN = '\033[0;32m'
@@ -86,6 +90,12 @@ ADDITIONAL_TOOLS = [
     "Jenkins", "Terraform", "Ansible", "Nginx", "Apache", "Other/Custom"
 ]
 
+# Performance profiles
+PERFORMANCE_PROFILES = [
+    "Latency Budgets", "Profiling", "Benchmarking", "Memory Limits",
+    "Async I/O", "Connection Pooling", "Vectorization", "Other/Custom"
+]
+
 # File name mappings for templates
 LANGUAGE_FILES: Dict[str, str] = {
     "Python": "python",
@@ -155,6 +165,16 @@ DATABASE_FILES: Dict[str, str] = {
     "InfluxDB": "influxdb"
 }
 
+PERFORMANCE_FILES: Dict[str, str] = {
+    "Latency Budgets": "latency-budgets",
+    "Profiling": "profiling",
+    "Benchmarking": "benchmarking",
+    "Memory Limits": "memory-limits",
+    "Async I/O": "async-io",
+    "Connection Pooling": "connection-pooling",
+    "Vectorization": "vectorization"
+}
+
 # Framework dependencies - which base frameworks to include
 FRAMEWORK_DEPENDENCIES: Dict[str, List[str]] = {
     "Next.js": ["React"],
@@ -170,4 +190,33 @@ def get_script_dir() -> Path:
 
 def get_prompt_rules_dir() -> Path:
     """Get the prompt rules directory."""
-    return get_script_dir() / "prompt_rules"
\ No newline at end of file
+    return get_script_dir() / "prompt_rules"
+
+def get_scaffolds_dir() -> Path:
+    """Get the directory of files copied into generated projects (benchmark harnesses)."""
+    return get_script_dir() / "scaffolds"
+
+def get_cache_dir() -> Path:
+    """Get the build cache directory (honours XDG_CACHE_HOME)."""
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    base_dir = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return base_dir / "new-claude"
+
+def get_installed_rules_root() -> Path:
+    """Get the directory versioned rule bundles are installed into for @imports."""
+    return Path.home() / ".claude" / "rules" / "new-claude"
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write data to path via a temporary file so readers never see partial content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -2,15 +2,27 @@
 """File generation for the Claude project creator."""
 
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
 from config import Colors
+from template_manager import TemplateManager
+from rules_index import RULES_INDEX_FILE
+from gitignore import compose_gitignore
+from benchmark_scaffold import benchmark_files
 
 
 class FileGenerator:
     """Handles creation of project files."""
     
-    def __init__(self):
+    def __init__(self, template_manager: Optional[TemplateManager] = None,
+                 input_source: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            template_manager: Template manager used to render README.md; one is created if omitted
+            input_source: Callable used instead of input() for confirmation prompts
+        """
         self.colors = Colors()
+        self.template_manager = template_manager or TemplateManager()
+        self.input = input_source or input
     
     def create_claude_md(self, project_path: Path, content: str) -> bool:
         """
@@ -32,6 +44,50 @@ class FileGenerator:
             print(f"{self.colors.RED}Error creating CLAUDE.md: {e}{self.colors.NC}")
             return False
     
+    def create_project_file(self, project_path: Path, filename: str, content: str) -> bool:
+        """
+        Create a generated project file with pre-rendered content.
+        
+        Args:
+            project_path: Path to the project directory
+            filename: Name of the file to create
+            content: Content for the file
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            file_path = project_path / filename
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            return True
+        except Exception as e:
+            print(f"{self.colors.RED}Error creating {filename}: {e}{self.colors.NC}")
+            return False
+    
+    def render_project_files(self, project_name: str, config: Dict[str, Any], claude_md_content: str,
+                             rules_index_content: Optional[str] = None) -> Dict[str, str]:
+        """
+        Render every generated project file without touching the filesystem.
+        
+        Args:
+            project_name: Name of the project
+            config: Project configuration dictionary
+            claude_md_content: Rendered CLAUDE.md content
+            rules_index_content: Serialized rules index for CLAUDE.md, if any
+            
+        Returns:
+            Mapping of file name (relative to the project) to rendered content
+        """
+        files = {"CLAUDE.md": claude_md_content}
+        if rules_index_content is not None:
+            files[RULES_INDEX_FILE] = rules_index_content
+        files["README.md"] = self._generate_readme_content(project_name, config)
+        files[".gitignore"] = self._generate_gitignore_content(config)
+        files.update(benchmark_files(config))
+        return files
+    
     def create_readme_md(self, project_path: Path, project_name: str, config: Dict[str, Any]) -> bool:
         """
         Create a README.md file based on the project configuration.
@@ -54,18 +110,19 @@ class FileGenerator:
             print(f"{self.colors.RED}Error creating README.md: {e}{self.colors.NC}")
             return False
     
-    def create_gitignore(self, project_path: Path) -> bool:
+    def create_gitignore(self, project_path: Path, config: Optional[Dict[str, Any]] = None) -> bool:
         """
-        Create a comprehensive .gitignore file.
+        Create a .gitignore file tailored to the project's stack.
         
         Args:
             project_path: Path to the project directory
+            config: Project configuration dictionary (None for the common patterns only)
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            gitignore_content = self._generate_gitignore_content()
+            gitignore_content = self._generate_gitignore_content(config)
             gitignore_path = project_path / ".gitignore"
             with open(gitignore_path, 'w', encoding='utf-8') as f:
                 f.write(gitignore_content)
@@ -85,123 +142,29 @@ class FileGenerator:
         Returns:
             README.md content as string
         """
-        content = f"""# {project_name}
-
-## Description
-[Add project description here]
-"""
-        
-        # Add project type if specified
-        if config.get('project_type') and config['project_type'] != "Other/Custom":
-            content += f"\n**Project Type:** {config['project_type']}\n"
-        
-        content += "\n## Tech Stack\n"
-        
-        # Filter out "Other/Custom" entries for README
-        filtered_languages = [lang for lang in config.get('languages', []) if lang != "Other/Custom"]
-        filtered_frameworks = [fw for fw in config.get('frameworks', []) if fw != "Other/Custom"]
-        filtered_databases = [db for db in config.get('databases', []) if db != "Other/Custom"]
-        filtered_tools = [tool for tool in config.get('additional_tools', []) if tool != "Other/Custom"]
-        
-        # Add tech stack information
-        if filtered_languages:
-            content += f"- **Languages:** {', '.join(filtered_languages)}\n"
-        
-        if filtered_frameworks:
-            content += f"- **Frameworks:** {', '.join(filtered_frameworks)}\n"
-        
-        if config.get('cloud_platform') and config['cloud_platform'] != "Other/Custom":
-            content += f"- **Cloud Platform:** {config['cloud_platform']}\n"
-        
-        if filtered_databases:
-            content += f"- **Databases:** {', '.join(filtered_databases)}\n"
-        
-        if filtered_tools:
-            content += f"- **Additional Tools:** {', '.join(filtered_tools)}\n"
-        
-        # Add standard sections
-        content += """
-## Setup
-See CLAUDE.md for development guidelines and project conventions.
-
-## Installation
-[Add installation instructions here]
-
-## Usage
-[Add usage instructions here]
-
-## Development
-[Add development instructions here]
-
-## License
-[Add license information here]
-"""
-        
-        return content
+        context = self.template_manager.build_template_context(config, project_name)
+        return self.template_manager.render_partial("readme", context)
     
-    def _generate_gitignore_content(self) -> str:
+    def _generate_gitignore_content(self, config: Optional[Dict[str, Any]] = None) -> str:
         """
-        Generate comprehensive .gitignore content.
+        Generate .gitignore content from the fragments for the selected stack.
         
+        Args:
+            config: Project configuration dictionary (None for the common patterns only)
+            
         Returns:
             .gitignore content as string
         """
-        return """# Dependencies
-node_modules/
-venv/
-env/
-.env
-.env.local
-.env.production
-.env.development
-
-# Build outputs
-dist/
-build/
-out/
-*.pyc
-__pycache__/
-*.class
-target/
-
-# IDE
-.idea/
-.vscode/
-*.swp
-*.swo
-*.sublime-*
-
-# OS
-.DS_Store
-Thumbs.db
-
-# Logs
-*.log
-logs/
-
-# Testing
-coverage/
-.coverage
-.pytest_cache/
-.nyc_output/
-
-# Temporary files
-*.tmp
-*.temp
-.cache/
-
-# Package managers
-package-lock.json
-yarn.lock
-Pipfile.lock
-"""
+        return compose_gitignore(config)
     
-    def create_directory_structure(self, project_path: Path) -> bool:
+    def create_directory_structure(self, project_path: Path,
+                                   on_warning: Optional[Callable[[str], None]] = None) -> bool:
         """
         Create basic directory structure for a new project.
         
         Args:
             project_path: Path to the project directory
+            on_warning: Report errors through this callback instead of printing them
             
         Returns:
             True if successful, False otherwise
@@ -218,46 +181,50 @@ Pipfile.lock
             
             return True
         except Exception as e:
-            print(f"{self.colors.RED}Error creating directory structure: {e}{self.colors.NC}")
+            self._report(f"Error creating directory structure: {e}", self.colors.RED, on_warning)
             return False
     
-    def initialize_git_repository(self, project_path: Path) -> bool:
+    def initialize_git_repository(self, project_path: Path,
+                                  on_warning: Optional[Callable[[str], None]] = None) -> bool:
         """
         Initialize a git repository in the project directory.
         
         Args:
             project_path: Path to the project directory
+            on_warning: Report warnings through this callback instead of printing them
             
         Returns:
             True if successful, False otherwise
         """
         try:
             import subprocess
-            import os
-            
-            # Change to project directory
-            original_cwd = os.getcwd()
-            os.chdir(project_path)
             
             try:
-                # Initialize git repository
-                result = subprocess.run(['git', 'init'], 
-                                      capture_output=True, 
-                                      text=True, 
-                                      check=True)
+                # Initialize git repository (run in the project directory
+                # without changing the process-wide working directory)
+                subprocess.run(['git', 'init'],
+                               cwd=project_path,
+                               capture_output=True,
+                               text=True,
+                               check=True)
                 return True
             except subprocess.CalledProcessError as e:
-                print(f"{self.colors.YELLOW}Warning: Could not initialize git repository: {e}{self.colors.NC}")
+                self._report(f"Warning: Could not initialize git repository: {e}", self.colors.YELLOW, on_warning)
                 return False
-            finally:
-                # Change back to original directory
-                os.chdir(original_cwd)
                 
         except Exception as e:
-            print(f"{self.colors.YELLOW}Warning: Git initialization failed: {e}{self.colors.NC}")
+            self._report(f"Warning: Git initialization failed: {e}", self.colors.YELLOW, on_warning)
             return False
     
-    def show_file_creation_summary(self, project_path: Path, project_name: str, is_new_project: bool) -> None:
+    def _report(self, message: str, color: str, on_warning: Optional[Callable[[str], None]]) -> None:
+        """Print a message in color, or hand it to a callback when one is given."""
+        if on_warning is not None:
+            on_warning(message)
+        else:
+            print(f"{color}{message}{self.colors.NC}")
+    
+    def show_file_creation_summary(self, project_path: Path, project_name: str, is_new_project: bool,
+                                   has_benchmarks: bool = False) -> None:
         """
         Show a summary of created files.
         
@@ -265,6 +232,7 @@ Pipfile.lock
             project_path: Path to the project directory
             project_name: Name of the project
             is_new_project: Whether this is a new project or existing
+            has_benchmarks: Whether a benchmarks/ tree was generated
         """
         print(f"\n{self.colors.GREEN}✅ CLAUDE.md file created successfully!{self.colors.NC}")
         
@@ -273,10 +241,13 @@ Pipfile.lock
             print(f"\nProject structure:")
             print(f"  {project_name}/")
             print(f"  ├── CLAUDE.md      # Project guidelines for Claude")
+            print(f"  ├── .claude/       # Rules index (rules.json) for tooling")
             print(f"  ├── README.md      # Project documentation")
             print(f"  ├── .gitignore     # Git ignore file")
             print(f"  ├── src/           # Source code directory")
             print(f"  ├── tests/         # Test files directory")
+            if has_benchmarks:
+                print(f"  ├── benchmarks/    # Benchmarks and baseline comparison")
             print(f"  └── docs/          # Documentation directory")
         else:
             print(f"\nFile location: {self.colors.BLUE}{project_path / 'CLAUDE.md'}{self.colors.NC}")
@@ -333,7 +304,7 @@ Pipfile.lock
         
         while True:
             try:
-                choice = input("👉 Overwrite existing CLAUDE.md? [y/N/0]: ").strip().lower()
+                choice = self.input("👉 Overwrite existing CLAUDE.md? [y/N/0]: ").strip().lower()
                 if choice in ['y', 'yes']:
                     return True
                 elif choice in ['n', 'no', '']:
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Stack-aware .gitignore composition.
+
+The generated .gitignore is assembled from fragments: a common set that
+every project gets, plus fragments chosen by the selected languages,
+frameworks, cloud platform and tools (.venv/, .next/, .terraform/,
+.gradle/, vendor/, ...). Ignoring the heavy build and dependency trees of
+the actual stack keeps `git status` and IDE indexers from crawling them.
+
+The merged pattern set is minimized: a pattern is dropped when a broader
+pattern already ignores everything it would (``crash.log`` under
+``*.log``, ``vendor/bundle/`` under ``vendor/``, duplicates across
+fragments). Fragments are parsed once and composed results are memoized
+per stack.
+"""
+
+import hashlib
+import json
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+# Fragment key -> (section title, patterns)
+GITIGNORE_FRAGMENTS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    # Common fragments (every project)
+    'dependencies': ("Dependencies", (
+        "node_modules/", "venv/", "env/", ".env", ".env.local", ".env.production", ".env.development",
+    )),
+    'build': ("Build outputs", ("dist/", "build/", "out/", "*.pyc", "__pycache__/", "*.class", "target/")),
+    'ide': ("IDE", (".idea/", ".vscode/", "*.swp", "*.swo", "*.sublime-*")),
+    'os': ("OS", (".DS_Store", "Thumbs.db")),
+    'logs': ("Logs", ("*.log", "logs/")),
+    'testing': ("Testing", ("coverage/", ".coverage", ".pytest_cache/", ".nyc_output/")),
+    'temporary': ("Temporary files", ("*.tmp", "*.temp", ".cache/")),
+    'package_managers': ("Package managers", ("package-lock.json", "yarn.lock", "Pipfile.lock")),
+
+    # Languages
+    'python': ("Python", (
+        ".venv/", "venv/", "__pycache__/", "*.py[cod]", "*.egg-info/", ".eggs/", ".mypy_cache/",
+        ".ruff_cache/", ".pytype/", ".tox/", ".nox/", ".pytest_cache/", ".hypothesis/", "htmlcov/",
+        ".benchmarks/", ".asv/",
+    )),
+    'node': ("Node.js", (
+        "node_modules/", ".npm/", ".pnpm-store/", ".yarn/cache/", ".yarn/install-state.gz",
+        ".eslintcache", ".turbo/", ".parcel-cache/", "npm-debug.log*", "yarn-error.log",
+    )),
+    'typescript': ("TypeScript", ("*.tsbuildinfo",)),
+    'jvm': ("JVM (Gradle/Maven)", (".gradle/", "build/", "target/", "out/", ".kotlin/", "*.class", "hs_err_pid*.log")),
+    'go': ("Go", ("vendor/", "bin/", "*.test", "coverage.out", "go.work.sum")),
+    'rust': ("Rust", ("target/", "**/*.rs.bk")),
+    'dotnet': (".NET", ("bin/", "obj/", ".vs/", "*.user", "TestResults/")),
+    'cpp': ("C/C++", ("build/", "cmake-build-*/", "CMakeFiles/", "CMakeCache.txt", "*.o", "*.obj")),
+    'ruby': ("Ruby", (".bundle/", "vendor/bundle/", "tmp/", "log/")),
+    'php': ("PHP", ("vendor/", ".phpunit.cache/", ".phpunit.result.cache")),
+    'swift': ("Swift / Xcode", (".build/", ".swiftpm/", "DerivedData/", "xcuserdata/", "*.xcuserstate", "Pods/")),
+    'dart': ("Dart / Flutter", (".dart_tool/", ".pub-cache/", ".flutter-plugins", ".flutter-plugins-dependencies", "build/")),
+    'r': ("R", (".Rhistory", ".RData", ".Rproj.user/")),
+    'julia': ("Julia", ("*.jl.cov", "*.jl.mem")),
+
+    # Frameworks
+    'nextjs': ("Next.js", (".next/", "out/", "next-env.d.ts")),
+    'angular': ("Angular", (".angular/",)),
+    'svelte': ("SvelteKit", (".svelte-kit/",)),
+    'jupyter': ("Jupyter", (".ipynb_checkpoints/",)),
+    'streamlit': ("Streamlit", (".streamlit/secrets.toml",)),
+    'django': ("Django", ("staticfiles/", "media/", "db.sqlite3")),
+    'android': ("Android", (".gradle/", "local.properties", ".cxx/", "captures/", "*.apk", "*.aab")),
+
+    # Cloud platforms
+    'aws': ("AWS", (".aws-sam/", "cdk.out/", ".serverless/")),
+    'vercel': ("Vercel", (".vercel/",)),
+    'netlify': ("Netlify", (".netlify/",)),
+
+    # Tools
+    'terraform': ("Terraform", (".terraform/", "*.tfstate", "*.tfstate.*", "crash.log")),
+    'ansible': ("Ansible", ("*.retry",)),
+}
+
+COMMON_FRAGMENTS = ('dependencies', 'build', 'ide', 'os', 'logs', 'testing', 'temporary', 'package_managers')
+
+LANGUAGE_GITIGNORE = {
+    "Python": ('python',),
+    "JavaScript": ('node',),
+    "TypeScript": ('node', 'typescript'),
+    "Java": ('jvm',),
+    "Kotlin": ('jvm',),
+    "Go": ('go',),
+    "Rust": ('rust',),
+    "C#": ('dotnet',),
+    "C++": ('cpp',),
+    "Ruby": ('ruby',),
+    "PHP": ('php',),
+    "Swift": ('swift',),
+    "Dart": ('dart',),
+    "R": ('r',),
+    "Julia": ('julia',),
+}
+
+FRAMEWORK_GITIGNORE = {
+    "Django": ('python', 'django'),
+    "Flask": ('python',),
+    "FastAPI": ('python',),
+    "Streamlit": ('python', 'streamlit'),
+    "Jupyter": ('python', 'jupyter'),
+    "Express": ('node',),
+    "React": ('node',),
+    "Vue": ('node',),
+    "Angular": ('node', 'angular'),
+    "Next.js": ('node', 'nextjs'),
+    "NestJS": ('node', 'typescript'),
+    "Svelte": ('node', 'svelte'),
+    "Node.js": ('node',),
+    "Spring": ('jvm',),
+    "Spring-Boot": ('jvm',),
+    "Android": ('jvm', 'android'),
+    "Gin": ('go',),
+    "Echo": ('go',),
+    "Fiber": ('go',),
+    "Actix": ('rust',),
+    "Rocket": ('rust',),
+    "Warp": ('rust',),
+    "ASP.NET": ('dotnet',),
+    "Blazor": ('dotnet',),
+    "SwiftUI": ('swift',),
+    "UIKit": ('swift',),
+    "Flutter": ('dart',),
+}
+
+CLOUD_GITIGNORE = {
+    "AWS": ('aws',),
+    "Vercel": ('vercel',),
+    "Netlify": ('netlify',),
+}
+
+TOOL_GITIGNORE = {
+    "Terraform": ('terraform',),
+    "Ansible": ('ansible',),
+}
+
+
+# Changes whenever the fragments or their selection change (part of the build cache key)
+FRAGMENTS_DIGEST = hashlib.sha256(json.dumps(
+    [GITIGNORE_FRAGMENTS, COMMON_FRAGMENTS, LANGUAGE_GITIGNORE, FRAMEWORK_GITIGNORE, CLOUD_GITIGNORE, TOOL_GITIGNORE],
+    sort_keys=True
+).encode('utf-8')).hexdigest()
+
+
+class GitignorePattern(NamedTuple):
+    """A parsed .gitignore pattern."""
+    text: str                   # Pattern as written
+    parts: Tuple[str, ...]      # Path components (leading "/", "**/" and trailing "/" removed)
+    anchored: bool              # Relative to the repository root (leading or inner "/")
+    directory_only: bool        # Trailing "/"
+    negated: bool               # Leading "!"
+
+
+def parse_pattern(text: str) -> GitignorePattern:
+    """Parse one .gitignore line (not a comment or blank)."""
+    negated = text.startswith('!')
+    body = text[1:] if negated else text
+    directory_only = body.endswith('/')
+    body = body.rstrip('/')
+    if body.endswith('/**'):
+        body, directory_only = body[:-3], True
+    any_depth = body.startswith('**/')
+    while body.startswith('**/'):
+        body = body[3:]
+    anchored = not any_depth and (body.startswith('/') or '/' in body.lstrip('/'))
+    parts = tuple(part for part in body.strip('/').split('/') if part)
+    return GitignorePattern(text, parts, anchored, directory_only, negated)
+
+
+@lru_cache(maxsize=None)
+def compile_fragment(key: str) -> Tuple[str, Tuple[GitignorePattern, ...]]:
+    """
+    Parse a fragment once.
+
+    Returns:
+        Tuple of (section title, parsed patterns)
+    """
+    title, patterns = GITIGNORE_FRAGMENTS[key]
+    return title, tuple(parse_pattern(pattern) for pattern in patterns)
+
+
+def _glob_subset(narrow: str, broad: str) -> bool:
+    """Check that every name matched by glob `narrow` is matched by glob `broad` (conservatively)."""
+    if narrow == broad:
+        return True
+    if not any(char in narrow for char in '*?['):
+        return fnmatchcase(narrow, broad)
+    # "*<literal>" is covered by "*<glob>" when the literal matches the glob
+    tail = narrow[1:]
+    if narrow.startswith('*') and broad.startswith('*') and not any(char in tail for char in '*?['):
+        return fnmatchcase(tail, broad[1:])
+    return False
+
+
+def covers(broad: GitignorePattern, narrow: GitignorePattern) -> bool:
+    """
+    Check whether `broad` already ignores everything `narrow` would.
+
+    Only single-component, unanchored patterns are treated as broader than
+    others (they match at any depth); anything else only covers an
+    equivalent pattern.
+    """
+    if broad.negated or narrow.negated:
+        return False
+    if (broad.parts, broad.anchored, broad.directory_only) == (narrow.parts, narrow.anchored, narrow.directory_only):
+        return True
+    if broad.anchored or len(broad.parts) != 1:
+        return False
+
+    name = broad.parts[0]
+    # Anything inside an ignored directory is ignored with it
+    if any(_glob_subset(part, name) for part in narrow.parts[:-1]):
+        return True
+    # The last component itself: a directory-only pattern cannot cover files
+    if broad.directory_only and not narrow.directory_only:
+        return False
+    return _glob_subset(narrow.parts[-1], name)
+
+
+def fragments_for_config(config: dict) -> Tuple[str, ...]:
+    """
+    Choose the fragments for a configuration.
+
+    Args:
+        config: User configuration dictionary
+
+    Returns:
+        Fragment keys, common fragments first, without duplicates
+    """
+    keys: List[str] = list(COMMON_FRAGMENTS)
+    for language in config.get('languages') or []:
+        keys.extend(LANGUAGE_GITIGNORE.get(language, ()))
+    for framework in config.get('frameworks') or []:
+        keys.extend(FRAMEWORK_GITIGNORE.get(framework, ()))
+    keys.extend(CLOUD_GITIGNORE.get(config.get('cloud_platform') or '', ()))
+    for tool in config.get('additional_tools') or []:
+        keys.extend(TOOL_GITIGNORE.get(tool, ()))
+    return tuple(dict.fromkeys(keys))
+
+
+def minimize(patterns: Iterable[GitignorePattern]) -> List[GitignorePattern]:
+    """
+    Drop patterns that another pattern in the set already covers.
+
+    Of two equivalent patterns the first is kept. Negations are kept
+    as-is; compose_gitignore emits them last so they still take effect.
+    """
+    patterns = list(patterns)
+    # Only unanchored single-component patterns can be broader than another.
+    # A literal one (e.g. "vendor") can only cover a component equal to it,
+    # so those are looked up by name instead of being tested one by one.
+    literal_broad: Dict[str, List[Tuple[int, GitignorePattern]]] = {}
+    wildcard_broad: List[Tuple[int, GitignorePattern]] = []
+    for index, pattern in enumerate(patterns):
+        if not pattern.negated and not pattern.anchored and len(pattern.parts) == 1:
+            name = pattern.parts[0]
+            if any(char in name for char in '*?['):
+                wildcard_broad.append((index, pattern))
+            else:
+                literal_broad.setdefault(name, []).append((index, pattern))
+
+    seen = set()
+    kept = []
+    for index, pattern in enumerate(patterns):
+        key = (pattern.parts, pattern.anchored, pattern.directory_only, pattern.negated)
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates = wildcard_broad + [entry for part in pattern.parts for entry in literal_broad.get(part, ())]
+        redundant = any(
+            covers(other, pattern) and (not covers(pattern, other) or other_index < index)
+            for other_index, other in candidates
+            if other_index != index
+        )
+        if not redundant:
+            kept.append(pattern)
+    return kept
+
+
+@lru_cache(maxsize=256)
+def compose_fragments(keys: Tuple[str, ...]) -> str:
+    """
+    Render the .gitignore for a set of fragments (memoized per stack).
+
+    Args:
+        keys: Fragment keys in output order
+
+    Returns:
+        .gitignore content
+    """
+    compiled = [compile_fragment(key) for key in keys]
+    all_patterns = [pattern for _, patterns in compiled for pattern in patterns]
+    kept = {id(pattern) for pattern in minimize(all_patterns)}
+
+    sections = []
+    negations = []
+    for title, patterns in compiled:
+        lines = []
+        for pattern in patterns:
+            if id(pattern) not in kept:
+                continue
+            if pattern.negated:
+                negations.append(pattern.text)
+            else:
+                lines.append(pattern.text)
+        if lines:
+            sections.append(f"# {title}\n" + "\n".join(lines) + "\n")
+    if negations:
+        sections.append("# Re-included\n" + "\n".join(negations) + "\n")
+    return "\n".join(sections)
+
+
+def compose_gitignore(config: Optional[dict] = None) -> str:
+    """
+    Compose the .gitignore for a project configuration.
+
+    Args:
+        config: User configuration dictionary (None for the common fragments only)
+
+    Returns:
+        .gitignore content
+    """
+    return compose_fragments(fragments_for_config(config or {}))
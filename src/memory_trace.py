@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+tracemalloc instrumentation for long generation runs.
+
+A MemoryTracer records a snapshot at the end of every named phase and
+after every N documents, and reports per checkpoint the traced memory,
+the peak since the previous checkpoint and the allocation sites that grew
+the most. Growth that keeps appearing at the same site across document
+checkpoints is a leak; growth that stops after the first checkpoint is a
+warm-up cache.
+
+Only the latest snapshot is kept, so tracing a long run costs time but
+not memory proportional to its length. tracemalloc only sees the current
+process: trace in-process renders.
+"""
+
+import linecache
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Allocations made by the tracer itself and by imports are not interesting
+_IGNORED_FILES = (__file__, tracemalloc.__file__, linecache.__file__, "<frozen importlib._bootstrap>",
+                  "<frozen importlib._bootstrap_external>", "<unknown>")
+
+# tracemalloc.reset_peak() is new in Python 3.9
+_HAS_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+def _format_site(statistic_diff: tracemalloc.StatisticDiff) -> str:
+    """file:line of an allocation site (the innermost frame)."""
+    frame = statistic_diff.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryTracer:
+    """Takes tracemalloc snapshots per phase and every N documents."""
+
+    def __init__(self, every: int = 0, top: int = 10, frames: int = 1):
+        """
+        Args:
+            every: Take a snapshot after every `every` documents (0 disables document checkpoints)
+            top: Allocation sites reported per checkpoint
+            frames: Traceback depth stored per allocation (more frames cost more memory)
+        """
+        self.every = every
+        self.top = top
+        self.frames = frames
+        self.documents = 0
+        self.checkpoints: List[Dict[str, Any]] = []
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+        self._start_time = 0.0
+        self._peak = 0
+        self._last_peak = 0  # Process-wide peak at the previous checkpoint (without reset_peak)
+        self._last_current = 0  # Traced memory at the previous checkpoint
+
+    def start(self) -> None:
+        """Start tracing (if not already) and take the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._reset_peak()
+        self._start_time = time.perf_counter()
+        self._snapshot = self._take_snapshot()
+
+    def stop(self) -> None:
+        """Stop tracing if this tracer started it."""
+        self._snapshot = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> "MemoryTracer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Checkpoint when a pipeline phase ends."""
+        try:
+            yield
+        finally:
+            self.checkpoint(f"phase: {name}")
+
+    def document_done(self, count: int = 1) -> None:
+        """Count rendered documents; checkpoint every `every` documents."""
+        if not self.every:
+            self.documents += count
+            return
+        for _ in range(count):
+            self.documents += 1
+            if self.documents % self.every == 0:
+                self.checkpoint(f"{self.documents:,} documents")
+
+    def checkpoint(self, label: str) -> Dict[str, Any]:
+        """
+        Snapshot memory and compare it with the previous checkpoint.
+
+        Args:
+            label: Name of the checkpoint in the report
+
+        Returns:
+            The checkpoint record
+        """
+        if self._snapshot is None:
+            raise RuntimeError("MemoryTracer.checkpoint() called before start()")
+
+        current, peak = self._interval_peak()
+        self._peak = max(self._peak, peak)
+        snapshot = self._take_snapshot()
+        statistics = snapshot.compare_to(self._snapshot, 'lineno')
+        statistics.sort(key=lambda stat: (-stat.size_diff, -stat.size))
+        growth = [stat for stat in statistics if stat.size_diff > 0][:self.top]
+
+        record = {
+            'label': label,
+            'seconds': round(time.perf_counter() - self._start_time, 3),
+            'documents': self.documents,
+            'current_bytes': current,
+            'peak_bytes': peak,
+            'delta_bytes': sum(stat.size_diff for stat in statistics),
+            'top_sites': [
+                {
+                    'site': _format_site(stat),
+                    'size_bytes': stat.size,
+                    'size_diff_bytes': stat.size_diff,
+                    'count_diff': stat.count_diff,
+                }
+                for stat in growth
+            ],
+        }
+        self.checkpoints.append(record)
+
+        # Replace rather than accumulate snapshots; reset the peak so each checkpoint reports its own
+        self._snapshot = snapshot
+        self._reset_peak()
+        return record
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize the run.
+
+        Returns:
+            Peak traced memory, growth across document checkpoints and every checkpoint record
+        """
+        documents = [record for record in self.checkpoints if not record['label'].startswith("phase: ")]
+        steady_growth = None
+        if len(documents) >= 2:
+            # The first document checkpoint absorbs warm-up (template caches, memo tables)
+            first, last = documents[0], documents[-1]
+            steady_growth = last['current_bytes'] - first['current_bytes']
+        return {
+            'documents': self.documents,
+            'peak_bytes': max([self._peak] + [record['peak_bytes'] for record in self.checkpoints]),
+            'final_bytes': self.checkpoints[-1]['current_bytes'] if self.checkpoints else 0,
+            'steady_growth_bytes': steady_growth,
+            'checkpoints': self.checkpoints,
+        }
+
+    def format_report(self, sites: int = 3) -> List[str]:
+        """
+        Render the checkpoints as text lines.
+
+        Args:
+            sites: Allocation sites shown per checkpoint
+
+        Returns:
+            Lines for the terminal
+        """
+        lines = []
+        for record in self.checkpoints:
+            lines.append(
+                f"{record['label']:>20}  current {record['current_bytes'] / 1e6:8.2f} MB  "
+                f"peak {record['peak_bytes'] / 1e6:8.2f} MB  delta {record['delta_bytes'] / 1e6:+8.2f} MB"
+            )
+            for site in record['top_sites'][:sites]:
+                lines.append(f"{'':>22}{site['size_diff_bytes'] / 1e3:+10.1f} kB  {site['site']}")
+        summary = self.report()
+        lines.append(f"Peak traced memory: {summary['peak_bytes'] / 1e6:.2f} MB")
+        if summary['steady_growth_bytes'] is not None:
+            lines.append(f"Growth after the first document checkpoint: {summary['steady_growth_bytes'] / 1e6:+.2f} MB")
+        return lines
+
+    def _reset_peak(self) -> None:
+        """Start a new peak interval."""
+        if _HAS_RESET_PEAK:
+            tracemalloc.reset_peak()
+        else:
+            self._last_current, self._last_peak = tracemalloc.get_traced_memory()
+
+    def _interval_peak(self) -> Tuple[int, int]:
+        """
+        Traced memory now and its peak since the last _reset_peak().
+
+        Without reset_peak() the process-wide peak is only attributed to this
+        interval if it rose during it; otherwise the interval's high-water
+        mark is taken as the larger of its start and end values.
+
+        Returns:
+            Tuple of (current bytes, peak bytes)
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        if _HAS_RESET_PEAK:
+            return current, peak
+        interval_peak = peak if peak > self._last_peak else max(self._last_current, current)
+        return current, interval_peak
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        """Snapshot without the tracer's own and import-time allocations."""
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+        )
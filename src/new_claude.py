@@ -7,7 +7,9 @@ A tool to create intelligent project templates with customized AI guidelines.
 
 import sys
 import argparse
+import hashlib
 from pathlib import Path
+from typing import Callable, List, Optional
 
 # Add the src directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -16,22 +18,37 @@ from prompts import PromptManager
 from template_manager import TemplateManager
 from file_generator import FileGenerator
 from project_manager import ProjectManager
-from config import Colors
+from build_cache import BuildCache
+from rules_index import RULES_INDEX_FILE, build_rules_index, serialize_rules_index
+from rules_search import RulesSearchIndex
+from background import BackgroundPipeline
+from session import SessionRecorder
+from bulk_render import BulkRenderer, ConfigSpace
+from memory_trace import MemoryTracer
+from benchmark_scaffold import BENCHMARK_HARNESSES, benchmark_destinations, benchmark_files, harnesses_for_config
+from config import Colors, PROJECT_TYPE_LANGUAGES, LANGUAGE_FRAMEWORKS
 
 
 class ClaudeProjectCreator:
     """Main application class for the Claude project creator."""
     
-    def __init__(self):
-        self.prompt_manager = PromptManager()
+    def __init__(self, input_source: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            input_source: Callable used instead of input() for every prompt
+                (see session.SessionRecorder / SessionReplay)
+        """
+        self.prompt_manager = PromptManager(input_source=input_source)
         self.template_manager = TemplateManager()
-        self.file_generator = FileGenerator()
+        self.file_generator = FileGenerator(input_source=input_source)
         self.project_manager = ProjectManager()
+        self.build_cache = BuildCache()
         self.colors = Colors()
     
     def show_usage(self) -> None:
         """Display usage information."""
-        print(f"{self.colors.BLUE}Usage: new-claude <directory-name-or-path>{self.colors.NC}")
+        print(f"{self.colors.BLUE}Usage: new-claude [options] <directory-name-or-path>{self.colors.NC}")
+        print(f"{self.colors.BLUE}       new-claude rules <command>{self.colors.NC}")
         print()
         print("Creates a customized CLAUDE.md file for a project")
         print()
@@ -44,6 +61,28 @@ class ClaudeProjectCreator:
         print("  new-claude my-app              # Creates ./my-app/ with CLAUDE.md")
         print("  new-claude projects/my-app     # Creates ./projects/my-app/ with CLAUDE.md")
         print("  new-claude /home/user/my-app   # Adds CLAUDE.md to existing directory")
+        print()
+        print("Options:")
+        print("  --reproducible      Omit the generation timestamp so identical inputs give identical files")
+        print("  --timestamp TEXT    Pin the generation timestamp embedded in CLAUDE.md")
+        print("  --no-cache          Always render, bypassing the build cache")
+        print("  --include-section S Only keep template sections matching S (repeatable)")
+        print("  --exclude-section S Drop template sections matching S (repeatable)")
+        print("                      S is a heading ('Testing'), a heading path ('Python-Specific Guidelines > Testing'),")
+        print("                      a tag ('tag:security'), optionally scoped to a template ('databases/postgresql:Security')")
+        print("  --import-rules      Reference shared rules with @imports instead of inlining them")
+        print("  --rules-dir DIR     Installed rules directory for --import-rules (default: versioned dir in ~/.claude/rules)")
+        print("  --record-session F  Save your answers to session file F (replay with benchmarks/replay_sessions.py)")
+        print("  --benchmarks        Add a benchmarks/ harness for the selected languages (new projects only)")
+        print()
+        print("Rules commands:")
+        print("  new-claude rules install [--dir DIR]   Install the shared rules referenced by --import-rules")
+        print("  new-claude rules search <query> [--limit N]")
+        print("                                         Search the prompt rules (e.g. 'connection pooling')")
+        print("  new-claude rules render-all <out.jsonl> [--workers N] [--max-languages N] [--max-frameworks N]")
+        print("                           [--max-databases N] [--documents DIR] [--trace-memory N]")
+        print("                                         Render every configuration; write hashes and sizes")
+        print("                                         (--trace-memory: tracemalloc report every N documents, in-process)")
     
     def run(self, args: list) -> int:
         """
@@ -55,12 +94,24 @@ class ClaudeProjectCreator:
         Returns:
             Exit code (0 for success, 1 for error)
         """
+        if args and args[0] == "rules":
+            return self.run_rules_command(args[1:])
+        
         parser = argparse.ArgumentParser(
             description="Create intelligent project templates with customized AI guidelines",
             add_help=False
         )
         parser.add_argument('directory', nargs='?', help='Directory name or path')
         parser.add_argument('-h', '--help', action='store_true', help='Show help message')
+        parser.add_argument('--reproducible', action='store_true', help='Omit volatile timestamps')
+        parser.add_argument('--timestamp', help='Pinned generation timestamp')
+        parser.add_argument('--no-cache', action='store_true', help='Bypass the build cache')
+        parser.add_argument('--include-section', action='append', default=[], help='Template section to keep')
+        parser.add_argument('--exclude-section', action='append', default=[], help='Template section to drop')
+        parser.add_argument('--import-rules', action='store_true', help='Reference shared rules with @imports')
+        parser.add_argument('--rules-dir', help='Installed rules directory for --import-rules')
+        parser.add_argument('--record-session', help='Save the answers to a session file')
+        parser.add_argument('--benchmarks', action='store_true', help='Generate a benchmarks/ harness')
         
         try:
             parsed_args = parser.parse_args(args)
@@ -78,14 +129,222 @@ class ClaudeProjectCreator:
             self.show_usage()
             return 1
         
-        return self.create_project(parsed_args.directory)
+        # Options that extend the configuration gathered by the wizard
+        config_overrides = {}
+        if parsed_args.include_section or parsed_args.exclude_section:
+            config_overrides['sections'] = {
+                'include': parsed_args.include_section,
+                'exclude': parsed_args.exclude_section,
+            }
+        if parsed_args.import_rules:
+            config_overrides['rules_mode'] = 'import'
+            if parsed_args.rules_dir:
+                config_overrides['rules_dir'] = str(Path(parsed_args.rules_dir).expanduser().resolve())
+        if parsed_args.benchmarks:
+            config_overrides['benchmarks'] = True
+        
+        options = {
+            'reproducible': parsed_args.reproducible,
+            'generated_at': parsed_args.timestamp,
+            'use_cache': not parsed_args.no_cache,
+            'config_overrides': config_overrides,
+        }
+        
+        if parsed_args.record_session:
+            return self.record_session(parsed_args.directory, Path(parsed_args.record_session), options)
+        
+        return self.create_project(parsed_args.directory, **options)
+    
+    def record_session(self, input_path: str, session_path: Path, options: dict) -> int:
+        """
+        Create a project while recording every answer to a session file.
+        
+        Recording uses the numbered prompts so the answers can be replayed
+        verbatim. When the render is reproducible, hashes of the generated
+        files are stored too, letting a replay detect output regressions.
+        
+        Args:
+            input_path: User-provided path
+            session_path: Session file to write
+            options: Keyword arguments for create_project
+            
+        Returns:
+            Exit code of create_project
+        """
+        recorder = SessionRecorder()
+        self.prompt_manager = PromptManager(input_source=recorder)
+        self.file_generator.input = recorder
+        
+        exit_code = self.create_project(input_path, **options)
+        
+        target_path, project_name, _ = self.project_manager.parse_project_path(input_path)
+        outputs = {}
+        if exit_code == 0 and (options.get('reproducible') or options.get('generated_at')):
+            outputs = self.hash_generated_files(target_path)
+        try:
+            recorder.save(session_path, project_name, options, outputs)
+            self.prompt_manager.print_success(f"📼 Session recorded: {session_path}")
+        except OSError as e:
+            self.prompt_manager.print_error(f"Could not write session file: {e}")
+            return 1
+        return exit_code
+    
+    @staticmethod
+    def hash_generated_files(target_path: Path) -> dict:
+        """Get the SHA-256 of each generated file (benchmark tree included) present in a project."""
+        hashes = {}
+        for name in BuildCache.ARTIFACTS + tuple(benchmark_destinations()):
+            try:
+                hashes[name] = hashlib.sha256((target_path / name).read_bytes()).hexdigest()
+            except OSError:
+                pass
+        return hashes
+    
+    def run_rules_command(self, args: list) -> int:
+        """
+        Handle the 'new-claude rules ...' subcommands.
+        
+        Args:
+            args: Arguments after 'rules'
+            
+        Returns:
+            Exit code (0 for success, 1 for error)
+        """
+        parser = argparse.ArgumentParser(prog="new-claude rules", add_help=False)
+        parser.add_argument('command', nargs='?')
+        parser.add_argument('query', nargs='*')
+        parser.add_argument('--dir', help='Target directory')
+        parser.add_argument('--limit', type=int, default=10, help='Maximum search results')
+        parser.add_argument('--workers', type=int, help='Worker processes for render-all')
+        parser.add_argument('--max-languages', type=int, default=2, help='Largest language selection for render-all')
+        parser.add_argument('--max-frameworks', type=int, default=1, help='Largest framework selection for render-all')
+        parser.add_argument('--max-databases', type=int, default=1, help='Largest database selection for render-all')
+        parser.add_argument('--documents', help='Directory to store rendered documents by hash')
+        parser.add_argument('--trace-memory', type=int, metavar='N',
+                            help='Snapshot memory with tracemalloc every N documents during render-all')
+        
+        try:
+            parsed_args = parser.parse_args(args)
+        except SystemExit:
+            return 1
+        
+        if parsed_args.command == "search":
+            return self.search_rules(" ".join(parsed_args.query), parsed_args.limit)
+        
+        if parsed_args.command == "render-all":
+            if len(parsed_args.query) != 1:
+                self.prompt_manager.print_error("Error: render-all needs exactly one output file")
+                return 1
+            space = ConfigSpace(parsed_args.max_languages, parsed_args.max_frameworks, parsed_args.max_databases)
+            documents_dir = Path(parsed_args.documents).expanduser() if parsed_args.documents else None
+            return self.render_all_rules(Path(parsed_args.query[0]), space, parsed_args.workers, documents_dir,
+                                         parsed_args.trace_memory)
+        
+        if parsed_args.command == "install":
+            try:
+                target_dir = Path(parsed_args.dir).expanduser() if parsed_args.dir else None
+                installed_dir = self.template_manager.install_rules(target_dir)
+            except OSError as e:
+                self.prompt_manager.print_error(f"Error installing rules: {e}")
+                return 1
+            self.prompt_manager.print_success(f"✅ Rules installed at: {installed_dir}")
+            return 0
+        
+        self.prompt_manager.print_error(f"Unknown rules command: {parsed_args.command or '(none)'}")
+        self.show_usage()
+        return 1
     
-    def create_project(self, input_path: str) -> int:
+    def search_rules(self, query: str, limit: int = 10) -> int:
+        """
+        Search the prompt rules and print the best matching sections.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+        
+        Returns:
+            Exit code (0 for success, 1 for error)
+        """
+        if not query.strip():
+            self.prompt_manager.print_error("Error: A search query is required")
+            return 1
+        
+        index = RulesSearchIndex()
+        index.load()
+        index.update()
+        try:
+            index.save()
+        except OSError as e:
+            self.prompt_manager.print_warning(f"Could not save search index: {e}")
+        
+        results = index.search(query, limit)
+        if not results:
+            print(f"No rules found for: {query}")
+            return 0
+        
+        for result in results:
+            location = f"{result.template} › {result.section}" if result.section else result.template
+            print(f"{self.colors.GREEN}{result.score:7.2f}{self.colors.NC}  {self.colors.CYAN}{location}{self.colors.NC}")
+            snippet = index.snippet(result)
+            if snippet:
+                print(f"         {snippet}")
+        return 0
+    
+    def render_all_rules(self, output_path: Path, space: ConfigSpace, workers: Optional[int] = None,
+                         documents_dir: Optional[Path] = None, trace_every: Optional[int] = None) -> int:
+        """
+        Render CLAUDE.md for every configuration in a space (template QA).
+        
+        Args:
+            output_path: JSONL file receiving each configuration's hash and size
+            space: Configurations to render
+            workers: Worker processes (default: CPU count)
+            documents_dir: Also store each distinct document under this directory
+            trace_every: Trace memory in-process, snapshotting every this many documents
+        
+        Returns:
+            Exit code (0 for success, 1 for error)
+        """
+        tracer = MemoryTracer(every=trace_every) if trace_every else None
+        if tracer is not None and workers not in (None, 1):
+            self.prompt_manager.print_warning("Memory tracing renders in-process; ignoring --workers")
+        
+        print(f"Rendering {space.count():,} configurations...")
+        try:
+            if tracer is not None:
+                tracer.start()
+            summary = BulkRenderer(space, documents_dir=documents_dir, tracer=tracer).render_all(output_path, workers)
+        except OSError as e:
+            self.prompt_manager.print_error(f"Error writing bulk render output: {e}")
+            return 1
+        finally:
+            if tracer is not None:
+                tracer.stop()
+        
+        if tracer is not None:
+            for line in tracer.format_report():
+                print(line)
+        
+        rate = summary.documents / summary.seconds if summary.seconds else 0
+        self.prompt_manager.print_success(
+            f"✅ {summary.documents:,} documents ({summary.distinct:,} distinct, "
+            f"{summary.bytes / 1e6:,.1f} MB) in {summary.seconds:.1f}s ({rate:,.0f}/s) → {output_path}"
+        )
+        return 0
+    
+    def create_project(self, input_path: str, reproducible: bool = False,
+                       generated_at: Optional[str] = None, use_cache: bool = True,
+                       config_overrides: Optional[dict] = None) -> int:
         """
         Create a project with the given path.
         
         Args:
             input_path: User-provided path
+            reproducible: Omit volatile timestamps from generated files
+            generated_at: Pinned generation timestamp for CLAUDE.md
+            use_cache: Serve reproducible renders from the build cache
+            config_overrides: Settings merged into the wizard's configuration
+                (e.g. 'sections', 'rules_mode', 'rules_dir')
             
         Returns:
             Exit code (0 for success, 1 for error)
@@ -117,38 +376,67 @@ class ClaudeProjectCreator:
             # Show welcome message
             self.prompt_manager.show_welcome(str(target_path), should_create)
             
-            # Create project directory if needed
             if should_create:
                 self.project_manager.show_path_info(target_path, project_name, should_create)
-                if not self.project_manager.create_project_directory(target_path):
-                    return 1
-            
-            # Get project configuration through interactive prompts
-            config = self.prompt_manager.get_project_configuration()
             
-            # Generate CLAUDE.md content
-            claude_md_content = self.template_manager.build_claude_md_content(config, project_name)
+            # Get project configuration through interactive prompts, overlapping
+            # directory setup and template loading with the user's typing
+            pipeline = BackgroundPipeline()
+            try:
+                warm_manager = TemplateManager(on_warning=pipeline.warn)
+                self.start_background_setup(pipeline, warm_manager, target_path, should_create,
+                                            need_bundle_hash=use_cache and (reproducible or bool(generated_at)))
+                config = self.prompt_manager.get_project_configuration(
+                    on_answer=lambda key, value: self.prefetch_for_answer(pipeline, warm_manager, key, value)
+                )
+            except BaseException:
+                pipeline.shutdown(cancel_pending=True)
+                raise
+            pipeline.shutdown()
             
-            # Create CLAUDE.md file
-            if not self.file_generator.create_claude_md(target_path, claude_md_content):
+            project_ready = pipeline.result('project_directory', default=False) if should_create else True
+            bundle_hash = pipeline.result('bundle_hash')
+            for warning in pipeline.drain_warnings():
+                self.prompt_manager.print_warning(warning)
+            if not project_ready:
                 return 1
             
-            # For new projects, create additional files and structure
+            # Scaffold only once the wizard has finished, so cancelling it
+            # leaves at most an empty directory behind
             if should_create:
-                # Create basic directory structure
                 self.file_generator.create_directory_structure(target_path)
-                
-                # Create README.md
-                self.file_generator.create_readme_md(target_path, project_name, config)
-                
-                # Create .gitignore
-                self.file_generator.create_gitignore(target_path)
-                
-                # Initialize git repository
                 self.file_generator.initialize_git_repository(target_path)
             
+            config.update(config_overrides or {})
+            
+            # The benchmark harness is only scaffolded into new projects
+            if config.get('benchmarks'):
+                if not should_create:
+                    self.prompt_manager.print_warning("--benchmarks only applies to new projects; skipping the benchmarks/ tree")
+                    del config['benchmarks']
+                elif not harnesses_for_config(config):
+                    self.prompt_manager.print_warning(
+                        f"No benchmark harness for the selected languages (available: {', '.join(BENCHMARK_HARNESSES)})"
+                    )
+                    del config['benchmarks']
+            
+            # Make sure the shared rules referenced by @imports are installed
+            if config.get('rules_mode') == 'import':
+                try:
+                    self.template_manager.install_rules(config.get('rules_dir'))
+                except OSError as e:
+                    self.prompt_manager.print_warning(f"Could not install shared rules ({e}); rules will be inlined")
+            
+            # Generate CLAUDE.md (plus README.md and .gitignore for new projects)
+            file_names = list(BuildCache.ARTIFACTS) if should_create else ["CLAUDE.md", RULES_INDEX_FILE]
+            file_names += list(benchmark_files(config))
+            if not self.write_generated_files(target_path, project_name, config, file_names,
+                                              reproducible, generated_at, use_cache, bundle_hash):
+                return 1
+            
             # Show summary
-            self.file_generator.show_file_creation_summary(target_path, project_name, should_create)
+            self.file_generator.show_file_creation_summary(target_path, project_name, should_create,
+                                                           has_benchmarks=bool(config.get('benchmarks')))
             self.prompt_manager.show_configuration_summary(config)
             self.file_generator.show_next_steps(target_path, should_create)
             
@@ -161,6 +449,108 @@ class ClaudeProjectCreator:
             self.prompt_manager.print_error(f"Unexpected error: {e}")
             return 1
 
+    
+    def start_background_setup(self, pipeline: BackgroundPipeline, warm_manager: TemplateManager,
+                               target_path: Path, should_create: bool, need_bundle_hash: bool = False) -> None:
+        """
+        Start the setup work that does not depend on the wizard's answers.
+        
+        Args:
+            pipeline: Pipeline to run the work on
+            warm_manager: Template manager whose warnings go to the pipeline
+            target_path: Path to the project directory
+            should_create: Whether this is a new project (creates its directory)
+            need_bundle_hash: Precompute the template bundle hash for the build cache
+        """
+        if should_create:
+            pipeline.submit('project_directory', self.project_manager.create_project_directory,
+                            target_path, on_warning=pipeline.warn)
+        pipeline.submit('warm_templates', warm_manager.prefetch_templates, include_base=True)
+        if need_bundle_hash:
+            pipeline.submit('bundle_hash', warm_manager.get_template_bundle_hash)
+    
+    def prefetch_for_answer(self, pipeline: BackgroundPipeline, warm_manager: TemplateManager,
+                            key: str, value) -> None:
+        """
+        Speculatively load the templates an answer makes likely.
+        
+        Once the project type is known its suggested languages are loaded;
+        once languages are chosen, every framework offered for them is loaded
+        before the framework step is even shown.
+        
+        Args:
+            pipeline: Pipeline to run the prefetch on
+            warm_manager: Template manager whose warnings go to the pipeline
+            key: Configuration key that was just answered
+            value: The answer
+        """
+        if key == 'project_type' and value in PROJECT_TYPE_LANGUAGES:
+            pipeline.submit('prefetch:project_type', warm_manager.prefetch_templates,
+                            languages=PROJECT_TYPE_LANGUAGES[value])
+        elif key == 'languages' and value:
+            frameworks = [fw for language in value for fw in LANGUAGE_FRAMEWORKS.get(language, [])]
+            pipeline.submit('prefetch:languages', warm_manager.prefetch_templates,
+                            languages=value, frameworks=frameworks)
+        elif key == 'cloud_platform' and value:
+            pipeline.submit('prefetch:cloud_platform', warm_manager.prefetch_templates, cloud_platforms=[value])
+        elif key == 'databases' and value:
+            pipeline.submit('prefetch:databases', warm_manager.prefetch_templates, databases=value)
+        elif key == 'performance_profiles' and value:
+            pipeline.submit('prefetch:performance_profiles', warm_manager.prefetch_templates,
+                            performance_profiles=value)
+    
+    def write_generated_files(self, target_path: Path, project_name: str, config: dict,
+                              file_names: List[str], reproducible: bool = False,
+                              generated_at: Optional[str] = None, use_cache: bool = True,
+                              bundle_hash: Optional[str] = None) -> bool:
+        """
+        Write generated files, serving them from the build cache when possible.
+        
+        Only reproducible renders (no timestamp, or a pinned one) are cached,
+        since a render embedding the current time can never be reused.
+        
+        Args:
+            target_path: Path to the project directory
+            project_name: Name of the project
+            config: User configuration dictionary
+            file_names: Generated files to write (CLAUDE.md must come first)
+            reproducible: Omit volatile timestamps from generated files
+            generated_at: Pinned generation timestamp for CLAUDE.md
+            use_cache: Serve reproducible renders from the build cache
+            bundle_hash: Precomputed template bundle hash, if available
+            
+        Returns:
+            True if CLAUDE.md was written, False otherwise
+        """
+        cache_key = None
+        if use_cache and (reproducible or generated_at):
+            cache_key = self.build_cache.compute_key(
+                bundle_hash or self.template_manager.get_template_bundle_hash(), config, project_name, generated_at,
+                self.template_manager.rule_imports_state(config)
+            )
+            if self.build_cache.copy_to(cache_key, target_path, file_names):
+                return True
+        
+        sections = self.template_manager.compose_claude_md_sections(
+            config, project_name, generated_at=generated_at, reproducible=reproducible
+        )
+        claude_md_content = self.template_manager.join_sections(sections)
+        rules_index_content = serialize_rules_index(build_rules_index(sections))
+        rendered_files = self.file_generator.render_project_files(
+            project_name, config, claude_md_content, rules_index_content
+        )
+        
+        if not self.file_generator.create_claude_md(target_path, claude_md_content):
+            return False
+        for file_name in file_names:
+            if file_name != "CLAUDE.md":
+                self.file_generator.create_project_file(target_path, file_name, rendered_files[file_name])
+        
+        if cache_key:
+            self.build_cache.put(cache_key, rendered_files)
+        
+        return True
+
 
 def main():
     """Main entry point when run as a script."""
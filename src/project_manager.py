@@ -2,7 +2,7 @@
 """Project management for the Claude project creator."""
 
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Callable, Optional, Tuple
 from config import Colors
 
 
@@ -112,12 +112,14 @@ class ProjectManager:
         except (PermissionError, OSError):
             return False
     
-    def create_project_directory(self, target_path: Path) -> bool:
+    def create_project_directory(self, target_path: Path,
+                                 on_warning: Optional[Callable[[str], None]] = None) -> bool:
         """
         Create the project directory.
         
         Args:
             target_path: Path where to create the directory
+            on_warning: Report errors through this callback instead of printing them
             
         Returns:
             True if successful, False otherwise
@@ -126,7 +128,11 @@ class ProjectManager:
             target_path.mkdir(parents=True, exist_ok=True)
             return True
         except Exception as e:
-            print(f"{self.colors.RED}Error creating directory {target_path}: {e}{self.colors.NC}")
+            message = f"Error creating directory {target_path}: {e}"
+            if on_warning is not None:
+                on_warning(message)
+            else:
+                print(f"{self.colors.RED}{message}{self.colors.NC}")
             return False
     
     def show_path_info(self, target_path: Path, project_name: str, should_create: bool) -> None:
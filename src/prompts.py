@@ -1,15 +1,32 @@
 #!/usr/bin/env python3
 """Interactive prompts for the Claude project creator."""
 
-from typing import List, Optional, Tuple
-from config import Colors, PROJECT_TYPES, PROJECT_TYPE_LANGUAGES, ALL_LANGUAGES, CLOUD_PLATFORMS, DATABASES, ADDITIONAL_TOOLS, LANGUAGE_FRAMEWORKS
+from typing import Callable, List, Optional, Tuple
+from config import Colors, PROJECT_TYPES, PROJECT_TYPE_LANGUAGES, ALL_LANGUAGES, CLOUD_PLATFORMS, DATABASES, ADDITIONAL_TOOLS, PERFORMANCE_PROFILES, LANGUAGE_FRAMEWORKS
+from terminal_ui import InteractiveMenu, supports_interactive_menus
 
 
 class PromptManager:
     """Manages all user interactions and prompts."""
     
-    def __init__(self):
+    def __init__(self, interactive: Optional[bool] = None,
+                 input_source: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            interactive: Use arrow-key menus with type-ahead filtering; by default
+                they are used when stdin and stdout are capable terminals
+            input_source: Callable used instead of input() for the numbered
+                prompts (e.g. a session recorder or replay); implies plain prompts
+        """
         self.colors = Colors()
+        self.input = input_source or input
+        if interactive is None:
+            interactive = input_source is None and supports_interactive_menus()
+        self.menu = InteractiveMenu() if interactive else None
+    
+    def colored(self, text: str, color: str) -> str:
+        """Wrap text in a color code."""
+        return f"{color}{text}{self.colors.NC}"
     
     def print_colored(self, text: str, color: str = Colors.NC) -> None:
         """Print text with color."""
@@ -48,7 +65,7 @@ class PromptManager:
             self.print_success(f"for your existing project at: {project_path}")
         
         self.print_colored("\nLet's configure your project step by step...", self.colors.MAGENTA)
-        self.print_colored("This will take you through 6 quick steps to customize your project setup.", self.colors.BROWN)
+        self.print_colored("This will take you through 7 quick steps to customize your project setup.", self.colors.BROWN)
         self.print_colored("You can always select 'Other/Custom' or skip questions with '0'.", self.colors.BROWN)
     
     def select_single_option(self, title: str, options: List[str], allow_skip: bool = True) -> Optional[str]:
@@ -63,22 +80,27 @@ class PromptManager:
         Returns:
             Selected option or None if skipped
         """
-        self.print_header(f"\n{title}")
-        print()
+        if self.menu is not None:
+            print()
+            return self.menu.select_single(title, options, allow_skip)
+        
+        # Compose the whole menu and write it at once
+        lines = [self.colored(f"\n{title}", self.colors.BLUE), ""]
         
         # Show options with numbers
         for i, option in enumerate(options, 1):
-            print(f"  {i}) {option}")
+            lines.append(f"  {i}) {option}")
         
         if allow_skip:
-            print()
-            self.print_colored("  0) Skip this question", self.colors.RED)
+            lines.append("")
+            lines.append(self.colored("  0) Skip this question", self.colors.RED))
         
-        print()
+        lines.append("")
+        print("\n".join(lines))
         
         while True:
             try:
-                choice = input(f"👉 Enter your choice (1-{len(options)}{', 0 to skip' if allow_skip else ''}): ").strip()
+                choice = self.input(f"👉 Enter your choice (1-{len(options)}{', 0 to skip' if allow_skip else ''}): ").strip()
                 
                 if allow_skip and choice == "0":
                     return None
@@ -108,35 +130,43 @@ class PromptManager:
         Returns:
             List of selected options
         """
-        self.print_header(f"\n{title}")
-        self.print_colored("📝 Instructions: Select options one at a time", self.colors.BROWN)
-        self.print_colored("   • Type a number and press Enter", self.colors.BROWN)
-        self.print_colored("   • Repeat for each additional choice", self.colors.BROWN)
-        self.print_colored("   • Type 0 when done", self.colors.BROWN)
-        print()
+        if self.menu is not None:
+            print()
+            return self.menu.select_multiple(title, options)
+        
+        print("\n".join([
+            self.colored(f"\n{title}", self.colors.BLUE),
+            self.colored("📝 Instructions: Select options one at a time", self.colors.BROWN),
+            self.colored("   • Type a number and press Enter", self.colors.BROWN),
+            self.colored("   • Repeat for each additional choice", self.colors.BROWN),
+            self.colored("   • Type 0 when done", self.colors.BROWN),
+            "",
+        ]))
         
         selected = []
         
         while True:
-            # Show available options
+            # Show available options (composed into a single write)
+            lines = []
             for i, option in enumerate(options, 1):
                 status = "✅" if option in selected else "  "
-                print(f"  {status} {i}) {option}")
+                lines.append(f"  {status} {i}) {option}")
             
-            print()
-            self.print_colored("  0) Done selecting", self.colors.GREEN)
+            lines.append("")
+            lines.append(self.colored("  0) Done selecting", self.colors.GREEN))
             
             # Show currently selected
             if selected:
-                print()
-                self.print_success("✅ Currently selected:")
+                lines.append("")
+                lines.append(self.colored("✅ Currently selected:", self.colors.GREEN))
                 for item in selected:
-                    self.print_colored(f"   {item}", self.colors.GREEN)
+                    lines.append(self.colored(f"   {item}", self.colors.GREEN))
             
-            print()
+            lines.append("")
+            print("\n".join(lines))
             
             try:
-                choice = input(f"👉 Enter your choice (1-{len(options)}, 0 when done): ").strip()
+                choice = self.input(f"👉 Enter your choice (1-{len(options)}, 0 when done): ").strip()
                 
                 if choice == "0":
                     break
@@ -162,15 +192,23 @@ class PromptManager:
         
         return selected
     
-    def get_project_configuration(self) -> dict:
+    def get_project_configuration(self, on_answer: Optional[Callable[[str, object], None]] = None) -> dict:
         """
         Walk through all configuration steps and return the complete configuration.
         
+        Args:
+            on_answer: Called with (key, value) as soon as each step is answered,
+                so callers can start work that depends on it while later steps run
+        
         Returns:
             Dictionary containing all user selections
         """
         config = {}
         
+        def answered(key: str) -> None:
+            if on_answer is not None:
+                on_answer(key, config[key])
+        
         # Step 1: Project Type
         self.print_header("\n============================================")
         self.print_header("📋 Step 1: Project Type")
@@ -180,6 +218,7 @@ class PromptManager:
             "🎯 What type of project are you building?",
             PROJECT_TYPES
         )
+        answered('project_type')
         
         # Step 2: Languages
         self.print_header("\n============================================")
@@ -204,6 +243,7 @@ class PromptManager:
             "🔧 Which programming languages will you use?",
             languages_to_show
         )
+        answered('languages')
         
         # Step 3: Frameworks
         self.print_header("\n============================================")
@@ -226,6 +266,7 @@ class PromptManager:
             )
         else:
             config['frameworks'] = []
+        answered('frameworks')
         
         # Step 4: Cloud Platform
         self.print_header("\n============================================")
@@ -237,6 +278,7 @@ class PromptManager:
             "☁️ Which cloud platform will you use for deployment?",
             CLOUD_PLATFORMS
         )
+        answered('cloud_platform')
         
         # Step 5: Databases
         self.print_header("\n============================================")
@@ -250,6 +292,7 @@ class PromptManager:
             "🗄️ Which databases will your project use?",
             DATABASES
         )
+        answered('databases')
         
         # Step 6: Additional Tools
         self.print_header("\n============================================")
@@ -263,6 +306,21 @@ class PromptManager:
             "🛠️ Additional tools and services you'll use:",
             ADDITIONAL_TOOLS
         )
+        answered('additional_tools')
+        
+        # Step 7: Performance Profiles
+        self.print_header("\n============================================")
+        self.print_header("⚡ Step 7: Performance Profiles")
+        self.print_header("============================================")
+        
+        self.print_colored("💡 Selected profiles add concrete performance guidance to CLAUDE.md", self.colors.BROWN)
+        self.print_colored("   Example: Latency Budgets + Profiling for a web API", self.colors.BROWN)
+        
+        config['performance_profiles'] = self.select_multiple_options(
+            "⚡ Which performance concerns matter for this project?",
+            PERFORMANCE_PROFILES
+        )
+        answered('performance_profiles')
         
         # Final summary
         self.print_header("\n============================================")
@@ -299,4 +357,9 @@ class PromptManager:
         if config.get('additional_tools'):
             filtered_tools = [tool for tool in config['additional_tools'] if tool != "Other/Custom"]
             if filtered_tools:
-                self.print_colored(f"  🛠️ Tools: {', '.join(filtered_tools)}", self.colors.CYAN)
\ No newline at end of file
+                self.print_colored(f"  🛠️ Tools: {', '.join(filtered_tools)}", self.colors.CYAN)
+        
+        if config.get('performance_profiles'):
+            filtered_profiles = [profile for profile in config['performance_profiles'] if profile != "Other/Custom"]
+            if filtered_profiles:
+                self.print_colored(f"  ⚡ Performance: {', '.join(filtered_profiles)}", self.colors.CYAN)
\ No newline at end of file
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Embeddable rendering API for the Claude project creator.
+
+Unlike the interactive flow, nothing here prints, prompts or changes the
+working directory, so ``render`` can be called concurrently from a
+long-running service.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from config import (
+    PROJECT_TYPES, ALL_LANGUAGES, LANGUAGE_FRAMEWORKS, CLOUD_PLATFORMS,
+    DATABASES, ADDITIONAL_TOOLS, PERFORMANCE_PROFILES
+)
+from template_manager import TemplateManager
+from file_generator import FileGenerator
+from rules_index import RULES_INDEX_FILE, build_rules_index, serialize_rules_index
+from benchmark_scaffold import benchmark_files
+
+
+# Configuration fields and the options each one accepts
+_STRING_FIELDS: Dict[str, List[str]] = {
+    'project_type': PROJECT_TYPES,
+    'cloud_platform': CLOUD_PLATFORMS,
+}
+
+_LIST_FIELDS: Dict[str, List[str]] = {
+    'languages': ALL_LANGUAGES + ["Other/Custom"],
+    'frameworks': sorted({fw for fws in LANGUAGE_FRAMEWORKS.values() for fw in fws}) + ["Other/Custom"],
+    'databases': DATABASES,
+    'additional_tools': ADDITIONAL_TOOLS,
+    'performance_profiles': PERFORMANCE_PROFILES,
+}
+
+
+class RenderError(Exception):
+    """Structured error raised when a configuration cannot be rendered."""
+
+    def __init__(self, code: str, message: str, field: Optional[str] = None):
+        """
+        Args:
+            code: Machine-readable error code (e.g. 'invalid_type', 'unknown_option')
+            message: Human-readable description
+            field: Configuration field the error refers to, if any
+        """
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.field = field
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the error for API responses."""
+        return {'code': self.code, 'message': self.message, 'field': self.field}
+
+
+@dataclass(frozen=True)
+class Document:
+    """Rendered project files for one configuration."""
+
+    claude_md: str
+    rules_index: str
+    readme_md: str
+    gitignore: str
+    warnings: Tuple[str, ...] = field(default_factory=tuple)
+    benchmark_files: Tuple[Tuple[str, str], ...] = field(default_factory=tuple)
+
+    def files(self) -> Dict[str, str]:
+        """Get the rendered files keyed by file name."""
+        return {
+            "CLAUDE.md": self.claude_md,
+            RULES_INDEX_FILE: self.rules_index,
+            "README.md": self.readme_md,
+            ".gitignore": self.gitignore,
+            **dict(self.benchmark_files),
+        }
+
+
+def validate_config(config: Dict[str, Any]) -> List[str]:
+    """
+    Validate a configuration dictionary.
+
+    Args:
+        config: Configuration dictionary as produced by PromptManager
+
+    Returns:
+        List of warnings for options without a known value
+
+    Raises:
+        RenderError: If the configuration has the wrong shape
+    """
+    if not isinstance(config, dict):
+        raise RenderError('invalid_type', f"Configuration must be a dict, got {type(config).__name__}")
+
+    warnings = []
+    for field_name, options in _STRING_FIELDS.items():
+        value = config.get(field_name)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            raise RenderError('invalid_type', f"'{field_name}' must be a string or None", field_name)
+        if value not in options:
+            warnings.append(f"Unknown {field_name}: {value}")
+
+    for field_name, options in _LIST_FIELDS.items():
+        values = config.get(field_name, [])
+        if not isinstance(values, (list, tuple)):
+            raise RenderError('invalid_type', f"'{field_name}' must be a list of strings", field_name)
+        for value in values:
+            if not isinstance(value, str):
+                raise RenderError('invalid_type', f"'{field_name}' must be a list of strings", field_name)
+            if value not in options:
+                warnings.append(f"Unknown {field_name} entry: {value}")
+
+    sections = config.get('sections') or {}
+    if not isinstance(sections, dict):
+        raise RenderError('invalid_type', "'sections' must be a dict with 'include'/'exclude' lists", 'sections')
+    for key in ('include', 'exclude'):
+        selectors = sections.get(key) or []
+        if not isinstance(selectors, (list, tuple)) or not all(isinstance(s, str) for s in selectors):
+            raise RenderError('invalid_type', f"'sections.{key}' must be a list of strings", 'sections')
+
+    rules_mode = config.get('rules_mode', 'inline')
+    if rules_mode not in ('inline', 'import'):
+        raise RenderError('invalid_option', "'rules_mode' must be 'inline' or 'import'", 'rules_mode')
+    if config.get('rules_dir') is not None and not isinstance(config['rules_dir'], str):
+        raise RenderError('invalid_type', "'rules_dir' must be a string", 'rules_dir')
+    if not isinstance(config.get('benchmarks', False), bool):
+        raise RenderError('invalid_type', "'benchmarks' must be a boolean", 'benchmarks')
+
+    return warnings
+
+
+def render(config: Dict[str, Any], project_name: str = "project",
+           generated_at: Optional[str] = None, reproducible: bool = True,
+           strict: bool = False) -> Document:
+    """
+    Render all project files for a configuration.
+
+    Args:
+        config: Configuration dictionary as produced by PromptManager
+        project_name: Name of the project
+        generated_at: Pinned generation timestamp for CLAUDE.md
+        reproducible: Omit the volatile timestamp (default for library use)
+        strict: Raise instead of collecting warnings
+
+    Returns:
+        Rendered Document
+
+    Raises:
+        RenderError: If the configuration is invalid, or on any warning in strict mode
+    """
+    if not isinstance(project_name, str) or not project_name.strip():
+        raise RenderError('invalid_project_name', "Project name must be a non-empty string", 'project_name')
+
+    warnings = validate_config(config)
+    template_manager = TemplateManager(on_warning=warnings.append)
+    sections = template_manager.compose_claude_md_sections(
+        config, project_name, generated_at=generated_at, reproducible=reproducible
+    )
+    claude_md = template_manager.join_sections(sections)
+    rules_index = serialize_rules_index(build_rules_index(sections))
+    file_generator = FileGenerator(template_manager=template_manager)
+    files = file_generator.render_project_files(project_name, config, claude_md, rules_index)
+
+    if strict and warnings:
+        raise RenderError('render_warning', warnings[0])
+
+    return Document(
+        claude_md=files["CLAUDE.md"],
+        rules_index=files[RULES_INDEX_FILE],
+        readme_md=files["README.md"],
+        gitignore=files[".gitignore"],
+        warnings=tuple(warnings),
+        benchmark_files=tuple(sorted(benchmark_files(config).items())),
+    )
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Machine-readable index of the rules in a generated CLAUDE.md.
+
+The index (``.claude/rules.json``) lists every section of CLAUDE.md with
+the templates it came from, a content hash and its byte span, so tools
+can answer "which rules apply here" by reading the small index and then
+seeking straight to the section they need.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from config import GENERATOR_VERSION
+from template_manager import RenderedSection, SECTION_SEPARATOR
+
+
+RULES_INDEX_FILE = ".claude/rules.json"
+RULES_INDEX_VERSION = 1
+
+
+def build_rules_index(sections: List[RenderedSection], document_name: str = "CLAUDE.md") -> Dict[str, Any]:
+    """
+    Build the rules index for a rendered CLAUDE.md.
+
+    Args:
+        sections: Sections from TemplateManager.compose_claude_md_sections
+        document_name: File name of the indexed document
+
+    Returns:
+        Index dictionary
+    """
+    separator_size = len(SECTION_SEPARATOR.encode('utf-8'))
+    document_hash = hashlib.sha256()
+    entries = []
+    offset = 0
+
+    for position, section in enumerate(sections):
+        if position:
+            document_hash.update(SECTION_SEPARATOR.encode('utf-8'))
+            offset += separator_size
+        data = section.text.encode('utf-8')
+        document_hash.update(data)
+        entries.append({
+            'id': section.id,
+            'sources': list(section.sources),
+            'offset': offset,
+            'length': len(data),
+            'sha256': hashlib.sha256(data).hexdigest(),
+        })
+        offset += len(data)
+
+    return {
+        'version': RULES_INDEX_VERSION,
+        'generator_version': GENERATOR_VERSION,
+        'document': document_name,
+        'document_size': offset,
+        'document_sha256': document_hash.hexdigest(),
+        'sections': entries,
+    }
+
+
+def serialize_rules_index(index: Dict[str, Any]) -> str:
+    """Serialize an index compactly (one section per line for readable diffs)."""
+    header = {key: value for key, value in index.items() if key != 'sections'}
+    lines = [json.dumps(section, separators=(',', ':'), sort_keys=True) for section in index['sections']]
+    header_json = json.dumps(header, separators=(',', ':'), sort_keys=True)
+    return header_json[:-1] + ',"sections":[\n' + ',\n'.join(lines) + '\n]}\n'
+
+
+class RulesIndex:
+    """Reader for a project's rules index."""
+
+    def __init__(self, project_path: Path, index: Dict[str, Any]):
+        self.project_path = Path(project_path)
+        self.index = index
+        self._by_id = {section['id']: section for section in index.get('sections', [])}
+
+    @classmethod
+    def load(cls, project_path: Path) -> Optional['RulesIndex']:
+        """
+        Load the rules index of a project.
+
+        Args:
+            project_path: Path to the project directory
+
+        Returns:
+            RulesIndex, or None if the project has no readable index
+        """
+        try:
+            with open(Path(project_path) / RULES_INDEX_FILE, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get('version') != RULES_INDEX_VERSION:
+            return None
+        return cls(project_path, index)
+
+    def section_ids(self) -> List[str]:
+        """Get all section IDs in document order."""
+        return [section['id'] for section in self.index.get('sections', [])]
+
+    def find(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Find sections by ID prefix or source template.
+
+        Args:
+            query: Section ID prefix (e.g. 'languages/') or template path (e.g. 'frameworks/react.md')
+
+        Returns:
+            Matching index entries in document order
+        """
+        return [
+            section for section in self.index.get('sections', [])
+            if section['id'].startswith(query) or query in section['sources']
+        ]
+
+    def read_section(self, section_id: str, verify: bool = True) -> Optional[str]:
+        """
+        Read one section of CLAUDE.md with a single seek and read.
+
+        Args:
+            section_id: Section ID from the index
+            verify: Check the section hash to detect a hand-edited CLAUDE.md
+
+        Returns:
+            Section text, or None if the section is unknown or stale
+        """
+        section = self._by_id.get(section_id)
+        if section is None:
+            return None
+
+        try:
+            with open(self.project_path / self.index['document'], 'rb') as f:
+                f.seek(section['offset'])
+                data = f.read(section['length'])
+        except OSError:
+            return None
+
+        if verify and hashlib.sha256(data).hexdigest() != section['sha256']:
+            return None
+        return data.decode('utf-8')
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Full-text search over the prompt rules corpus.
+
+An inverted index maps each (lightly stemmed) term to the templates,
+heading sections and positions it occurs at. The index is persisted in
+the cache directory and refreshed incrementally: only templates whose
+size or modification time changed are re-tokenized. Queries touch only
+the posting lists of their terms and are ranked with BM25 over heading
+sections, with a bonus for terms appearing next to each other.
+
+The index is an SQLite database keyed by term, so a query reads only the
+rows for its own terms and an up-to-date index is never rewritten.
+"""
+
+import json
+import math
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from config import get_cache_dir, get_prompt_rules_dir
+from section_tree import SectionTree
+
+
+INDEX_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE documents (
+    template TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sections TEXT NOT NULL,
+    section_lengths TEXT NOT NULL,
+    section_count INTEGER NOT NULL,
+    token_count INTEGER NOT NULL
+);
+CREATE TABLE postings (
+    term TEXT NOT NULL,
+    template TEXT NOT NULL,
+    entries TEXT NOT NULL,
+    PRIMARY KEY (term, template)
+) WITHOUT ROWID;
+CREATE INDEX postings_template ON postings (template);
+"""
+
+# Generator scaffolding rather than rules
+EXCLUDED_DIRS = ("partials",)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset("""
+a an and are as at be by for from in into is it of on or that the this to use with
+""".split())
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+_ADJACENCY_BONUS = 0.5
+
+
+def stem(term: str) -> str:
+    """
+    Reduce a term to a crude stem so 'pooling', 'pools' and 'pool' match.
+
+    A plural "s" is dropped (not after "ss" or "us"), and so is a final "e",
+    so that 'cache', 'caches', 'cached' and 'caching' share one stem.
+    """
+    for suffix in ("ing", "ies", "ed"):
+        if len(term) > len(suffix) + 3 and term.endswith(suffix):
+            term = term[:-len(suffix)]
+            return term + "y" if suffix == "ies" else term
+    if len(term) > 3 and term.endswith("s") and not term.endswith(("ss", "us")):
+        term = term[:-1]
+    if len(term) > 3 and term.endswith("e"):
+        term = term[:-1]
+    return term
+
+
+def tokenize(text: str) -> List[Tuple[str, int]]:
+    """
+    Split text into (stemmed term, character offset) pairs.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms with the offset of the original word, stopwords removed
+    """
+    return [
+        (stem(match.group()), match.start())
+        for match in _TOKEN_PATTERN.finditer(text.lower())
+        if match.group() not in _STOPWORDS
+    ]
+
+
+class SearchResult(NamedTuple):
+    """One ranked search hit."""
+    template: str
+    section: str
+    score: float
+    offset: int
+
+
+class RulesSearchIndex:
+    """Persistent inverted index over prompt_rules/*.md."""
+
+    def __init__(self, rules_dir: Optional[Path] = None, index_path: Optional[Path] = None):
+        self.rules_dir = Path(rules_dir) if rules_dir else get_prompt_rules_dir()
+        self.index_path = Path(index_path) if index_path else get_cache_dir() / "search-index.sqlite3"
+        self._connection: Optional[sqlite3.Connection] = None
+        self._dirty = False
+        # template -> (sections, section_lengths) for documents read by this instance
+        self._documents: Dict[str, Tuple[List[str], List[int]]] = {}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The index database, opened (or created in memory) on first use."""
+        if self._connection is None:
+            self.load()
+        return self._connection
+
+    def load(self) -> bool:
+        """
+        Open the persisted index.
+
+        An index written by another version or for another rules directory
+        is discarded. If the cache cannot be opened the index lives in
+        memory for this run.
+
+        Returns:
+            True if an index for this rules directory was opened
+        """
+        self.close()
+        connection = None
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.index_path))
+            tables = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            if 'meta' in tables:
+                meta = dict(connection.execute("SELECT key, value FROM meta"))
+                if meta.get('version') == str(INDEX_VERSION) and meta.get('rules_dir') == str(self.rules_dir):
+                    self._connection = connection
+                    return True
+            connection.executescript("""
+                DROP TABLE IF EXISTS meta;
+                DROP TABLE IF EXISTS documents;
+                DROP TABLE IF EXISTS postings;
+            """)
+            self._create_schema(connection)
+        except (OSError, sqlite3.Error) as e:
+            if connection is not None:
+                connection.close()
+            if type(e) is sqlite3.DatabaseError:
+                # Not a database: let the next run start over
+                try:
+                    self.index_path.unlink()
+                except OSError:
+                    pass
+            # Unreadable, busy or read-only cache: index in memory for this run
+            connection = sqlite3.connect(":memory:")
+            self._create_schema(connection)
+        self._connection = connection
+        return False
+
+    def _create_schema(self, connection: sqlite3.Connection) -> None:
+        """Create empty tables tagged with the index version and rules directory."""
+        connection.executescript(_SCHEMA)
+        connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                               [('version', str(INDEX_VERSION)), ('rules_dir', str(self.rules_dir))])
+        connection.commit()
+
+    def save(self) -> None:
+        """
+        Commit the changes made by update(), if there were any.
+
+        Raises:
+            OSError: If the index cannot be written
+        """
+        if not self._dirty or self._connection is None:
+            return
+        try:
+            self._connection.commit()
+        except sqlite3.Error as e:
+            self._connection.rollback()
+            raise OSError(f"Could not write {self.index_path}: {e}") from e
+        self._dirty = False
+
+    def close(self) -> None:
+        """Close the database, discarding uncommitted changes."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self._documents.clear()
+        self._dirty = False
+
+    def update(self) -> Tuple[int, int]:
+        """
+        Bring the index up to date with the templates on disk.
+
+        Returns:
+            Tuple of (templates re-indexed, templates removed)
+        """
+        current = {}
+        for template_path in self.rules_dir.rglob("*.md"):
+            relative_path = template_path.relative_to(self.rules_dir).as_posix()
+            if relative_path.split('/', 1)[0] in EXCLUDED_DIRS:
+                continue
+            stat = template_path.stat()
+            current[relative_path] = (template_path, stat.st_mtime_ns, stat.st_size)
+
+        indexed = {
+            template: (mtime_ns, size)
+            for template, mtime_ns, size in self.connection.execute(
+                "SELECT template, mtime_ns, size FROM documents")
+        }
+        removed = [template for template in indexed if template not in current]
+        changed = [
+            template for template, (_, mtime_ns, size) in current.items()
+            if indexed.get(template) != (mtime_ns, size)
+        ]
+
+        stale = [(template,) for template in removed + changed if template in indexed]
+        if stale:
+            self.connection.executemany("DELETE FROM postings WHERE template = ?", stale)
+            self.connection.executemany("DELETE FROM documents WHERE template = ?", stale)
+            self._dirty = True
+
+        for template in changed:
+            template_path, mtime_ns, size = current[template]
+            self._index_document(template, template_path.read_text(encoding='utf-8'), mtime_ns, size)
+
+        if stale or changed:
+            self._documents.clear()
+        return len(changed), len(removed)
+
+    def _index_document(self, template: str, text: str, mtime_ns: int, size: int) -> None:
+        """Tokenize one template and add its postings."""
+        tree = SectionTree(text)
+        boundaries = [node.start for node in tree.nodes]
+        sections = [""] + [" > ".join(node.path) for node in tree.nodes]
+        section_lengths = [0] * len(sections)
+        postings: Dict[str, List[int]] = {}
+
+        section = 0
+        for position, (term, offset) in enumerate(tokenize(text)):
+            while section < len(boundaries) and boundaries[section] <= offset:
+                section += 1
+            section_lengths[section] += 1
+            postings.setdefault(term, []).extend((section, position, offset))
+
+        self.connection.execute(
+            "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (template, mtime_ns, size, json.dumps(sections), json.dumps(section_lengths),
+             len(sections), sum(section_lengths)))
+        self.connection.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?)",
+            [(term, template, json.dumps(entries, separators=(',', ':'))) for term, entries in postings.items()])
+        self._dirty = True
+
+    def _document(self, template: str) -> Tuple[List[str], List[int]]:
+        """Get a template's section paths and per-section token counts."""
+        if template not in self._documents:
+            sections, section_lengths = self.connection.execute(
+                "SELECT sections, section_lengths FROM documents WHERE template = ?", (template,)).fetchone()
+            self._documents[template] = (json.loads(sections), json.loads(section_lengths))
+        return self._documents[template]
+
+    def search(self, query: str, limit: int = 10) -> List[SearchResult]:
+        """
+        Rank heading sections against a query.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+
+        Returns:
+            Results ordered by descending score
+        """
+        terms = list(dict.fromkeys(term for term, _ in tokenize(query)))
+        if not terms:
+            return []
+
+        total_sections, total_length = self.connection.execute(
+            "SELECT TOTAL(section_count), TOTAL(token_count) FROM documents").fetchone()
+        total_sections = total_sections or 1
+        average_length = total_length / total_sections or 1.0
+
+        scores: Dict[Tuple[str, int], float] = {}
+        first_offsets: Dict[Tuple[str, int], int] = {}
+        positions: Dict[Tuple[str, int], Dict[str, set]] = {}
+
+        for term in terms:
+            term_postings = self.connection.execute(
+                "SELECT template, entries FROM postings WHERE term = ?", (term,))
+            frequencies: Dict[Tuple[str, int], int] = {}
+            for template, entries in term_postings:
+                flat = json.loads(entries)
+                for i in range(0, len(flat), 3):
+                    key = (template, flat[i])
+                    frequencies[key] = frequencies.get(key, 0) + 1
+                    if key not in first_offsets or flat[i + 2] < first_offsets[key]:
+                        first_offsets[key] = flat[i + 2]
+                    positions.setdefault(key, {}).setdefault(term, set()).add(flat[i + 1])
+
+            if not frequencies:
+                continue
+            idf = math.log(1 + (total_sections - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+            for key, frequency in frequencies.items():
+                length = self._document(key[0])[1][key[1]]
+                norm = _K1 * (1 - _B + _B * length / average_length)
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (_K1 + 1) / (frequency + norm)
+
+        # Reward sections where consecutive query terms appear side by side
+        for key in scores:
+            term_positions = positions[key]
+            for left, right in zip(terms, terms[1:]):
+                if left in term_positions and right in term_positions:
+                    if any(p + 1 in term_positions[right] for p in term_positions[left]):
+                        scores[key] += _ADJACENCY_BONUS
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [
+            SearchResult(template, self._document(template)[0][section], round(score, 4),
+                         first_offsets[(template, section)])
+            for (template, section), score in ranked
+        ]
+
+    def snippet(self, result: SearchResult, width: int = 100) -> str:
+        """Get the line around a result's first match."""
+        try:
+            with open(self.rules_dir / result.template, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            return ""
+        line_start = text.rfind('\n', 0, result.offset) + 1
+        line_end = text.find('\n', result.offset)
+        line = text[line_start:line_end if line_end != -1 else len(text)].strip()
+        return line if len(line) <= width else line[:width - 1] + "…"
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Heading-level section trees for markdown templates.
+
+A template is parsed once into a tree of headings with character spans
+into its text. Selecting sections is then a matter of looking nodes up by
+title or tag and slicing the original text, without rescanning it.
+
+Selectors (config['sections']['include'] / ['exclude']):
+    Performance                             Any heading titled "Performance"
+    Python-Specific Guidelines > Testing    Heading path (matched as a suffix)
+    tag:security                            Headings tagged "security"
+    languages/python:Performance            Limit a selector to one template
+
+Tags are declared in an HTML comment on the line after a heading:
+    ### Connection Handling
+    <!-- tags: performance, databases -->
+The comment lines only feed selectors: extracted text never contains them.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+
+TAG_COMMENT_PREFIX = "<!-- tags:"
+PATH_SEPARATOR = ">"
+
+
+class HeadingNode:
+    """A heading and the span of text it owns (up to the next heading of the same or higher level)."""
+
+    __slots__ = ('title', 'level', 'path', 'tags', 'start', 'heading_end', 'end', 'parent', 'children')
+
+    def __init__(self, title: str, level: int, start: int, heading_end: int,
+                 parent: Optional['HeadingNode'] = None):
+        self.title = title
+        self.level = level
+        self.start = start
+        self.heading_end = heading_end
+        self.end = heading_end
+        self.parent = parent
+        self.children: List['HeadingNode'] = []
+        self.tags: Tuple[str, ...] = ()
+        parent_path = parent.path if parent is not None else ()
+        self.path: Tuple[str, ...] = parent_path + (title,) if level else ()
+
+    def ancestors(self) -> List['HeadingNode']:
+        """Get the enclosing headings, outermost first (excluding the root)."""
+        chain = []
+        node = self.parent
+        while node is not None and node.level:
+            chain.append(node)
+            node = node.parent
+        return chain[::-1]
+
+
+class SectionTree:
+    """Parsed heading tree of one template."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.root = HeadingNode("", 0, 0, 0)
+        self.root.end = len(text)
+        self.nodes: List[HeadingNode] = []
+        self._by_title: Dict[str, List[HeadingNode]] = {}
+        self._by_tag: Dict[str, List[HeadingNode]] = {}
+        self.tag_spans: List[Tuple[int, int]] = []  # Tag comment lines, left out of extracted text
+        self._parse()
+
+    def _parse(self) -> None:
+        """Build the tree with a single line scan, skipping fenced code blocks."""
+        text = self.text
+        stack = [self.root]
+        in_fence = False
+        previous: Optional[HeadingNode] = None
+        position = 0
+        length = len(text)
+
+        while position < length:
+            line_end = text.find('\n', position)
+            next_position = length if line_end == -1 else line_end + 1
+            line = text[position:line_end if line_end != -1 else length]
+            stripped = line.strip()
+
+            if stripped.startswith('```') or stripped.startswith('~~~'):
+                in_fence = not in_fence
+            elif not in_fence and line.startswith('#'):
+                level = len(line) - len(line.lstrip('#'))
+                if level <= 6 and (len(line) == level or line[level] == ' '):
+                    title = line[level:].strip().rstrip('#').strip()
+                    while stack[-1].level >= level:
+                        stack.pop().end = position
+                    node = HeadingNode(title, level, position, next_position, stack[-1])
+                    stack[-1].children.append(node)
+                    stack.append(node)
+                    self.nodes.append(node)
+                    self._by_title.setdefault(title.lower(), []).append(node)
+                    previous = node
+                    position = next_position
+                    continue
+            if previous is not None and stripped.startswith(TAG_COMMENT_PREFIX) and stripped.endswith('-->'):
+                tags = stripped[len(TAG_COMMENT_PREFIX):-3].split(',')
+                previous.tags = tuple(tag.strip().lower() for tag in tags if tag.strip())
+                for tag in previous.tags:
+                    self._by_tag.setdefault(tag, []).append(previous)
+                self.tag_spans.append((position, next_position))
+                if previous.heading_end == position:
+                    # Part of the heading, like the blank line below it
+                    previous.heading_end = next_position
+                position = next_position
+                continue
+            if stripped:
+                previous = None
+            elif previous is not None and previous.heading_end == position:
+                # Keep the blank line under a heading with the heading itself
+                previous.heading_end = next_position
+            position = next_position
+
+        while len(stack) > 1:
+            stack.pop().end = length
+
+    def find(self, selector: str) -> List[HeadingNode]:
+        """
+        Find the headings matching a selector.
+
+        Args:
+            selector: Heading title, heading path ("A > B") or "tag:<name>"
+
+        Returns:
+            Matching nodes in document order
+        """
+        selector = selector.strip()
+        if selector.lower().startswith('tag:'):
+            return list(self._by_tag.get(selector[4:].strip().lower(), []))
+
+        path = [part.strip().lower() for part in selector.split(PATH_SEPARATOR)]
+        candidates = self._by_title.get(path[-1], [])
+        if len(path) == 1:
+            return list(candidates)
+        return [
+            node for node in candidates
+            if len(node.path) >= len(path)
+            and [title.lower() for title in node.path[-len(path):]] == path
+        ]
+
+    def extract(self, include: List[str], exclude: List[str]) -> str:
+        """
+        Slice the selected sections out of the text.
+
+        With include selectors only the matching headings (plus the heading
+        lines of their ancestors, for context) are kept; exclude selectors
+        then remove matching subtrees. Cost is proportional to the number of
+        selected sections, not the size of the text.
+
+        Args:
+            include: Selectors to keep (empty keeps everything)
+            exclude: Selectors to drop
+
+        Returns:
+            Extracted text without tag comments (empty if nothing was included)
+        """
+        text = self.text
+        if include:
+            spans: List[Tuple[int, int]] = []
+            emitted_headings = set()
+            selected = sorted({id(n): n for s in include for n in self.find(s)}.values(), key=lambda n: n.start)
+            covered_until = -1
+            for node in selected:
+                if node.start < covered_until:
+                    continue  # Inside an already selected subtree
+                for ancestor in node.ancestors():
+                    if id(ancestor) not in emitted_headings:
+                        emitted_headings.add(id(ancestor))
+                        spans.append((ancestor.start, ancestor.heading_end))
+                spans.append((node.start, node.end))
+                covered_until = node.end
+        else:
+            spans = [(0, len(text))]
+
+        if exclude:
+            removed = sorted(((n.start, n.end) for s in exclude for n in self.find(s)))
+            spans = _subtract_spans(spans, removed)
+        if self.tag_spans:
+            spans = _subtract_spans(spans, self.tag_spans)
+
+        return ''.join(text[start:end] for start, end in spans)
+
+
+def _subtract_spans(spans: List[Tuple[int, int]], removed: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Remove sorted spans from a sorted list of spans."""
+    result = []
+    for start, end in spans:
+        for removed_start, removed_end in removed:
+            if removed_end <= start or removed_start >= end:
+                continue
+            if removed_start > start:
+                result.append((start, removed_start))
+            start = max(start, removed_end)
+            if start >= end:
+                break
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+class SectionSelection:
+    """Include/exclude selectors from config['sections'], grouped by template."""
+
+    def __init__(self, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        self._include: Dict[Optional[str], List[str]] = {}
+        self._exclude: Dict[Optional[str], List[str]] = {}
+        for selector in include or []:
+            self._add(self._include, selector)
+        for selector in exclude or []:
+            self._add(self._exclude, selector)
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['SectionSelection']:
+        """
+        Build a selection from a configuration dictionary.
+
+        Returns:
+            SectionSelection, or None if the config selects everything
+        """
+        sections = config.get('sections') or {}
+        include = sections.get('include') or []
+        exclude = sections.get('exclude') or []
+        if not include and not exclude:
+            return None
+        return cls(include, exclude)
+
+    @staticmethod
+    def _add(target: Dict[Optional[str], List[str]], selector: str) -> None:
+        """File a selector under its template scope (None for all templates)."""
+        scope, separator, rest = selector.partition(':')
+        if separator and ('/' in scope or scope.strip() == 'base'):
+            target.setdefault(scope.strip(), []).append(rest)
+        else:
+            target.setdefault(None, []).append(selector)
+
+    def for_template(self, template_id: str) -> Tuple[List[str], List[str]]:
+        """
+        Get the selectors that apply to one template.
+
+        Args:
+            template_id: Template path without extension (e.g. 'languages/python')
+
+        Returns:
+            Tuple of (include selectors, exclude selectors)
+        """
+        include = self._include.get(None, []) + self._include.get(template_id, [])
+        exclude = self._exclude.get(None, []) + self._exclude.get(template_id, [])
+        return include, exclude
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Record and replay wizard sessions.
+
+PromptManager (and FileGenerator's overwrite prompt) read answers from an
+injectable input source, any callable with the signature of ``input()``.
+SessionRecorder wraps the real source and writes every answer to a session
+file; SessionReplay feeds those answers back without a human and times how
+long the program spends between prompts, so the full create_project flow
+can be benchmarked and regression-tested headlessly.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+SESSION_VERSION = 1
+
+
+class SessionExhausted(EOFError):
+    """Raised when a replayed program asks for more answers than were recorded."""
+
+
+class SessionRecorder:
+    """Input source that forwards to another source and records the answers."""
+
+    def __init__(self, source: Optional[Callable[[str], str]] = None):
+        self.source = source or input
+        self.steps: List[Dict[str, Any]] = []
+
+    def __call__(self, prompt: str = "") -> str:
+        start = time.perf_counter()
+        answer = self.source(prompt)
+        self.steps.append({
+            'prompt': prompt,
+            'answer': answer,
+            'think_seconds': round(time.perf_counter() - start, 3),
+        })
+        return answer
+
+    def to_dict(self, project_name: str, options: Optional[dict] = None,
+                outputs: Optional[Dict[str, str]] = None) -> dict:
+        """
+        Build the session document.
+
+        Args:
+            project_name: Name of the created project
+            options: create_project keyword arguments (reproducible, generated_at, ...)
+            outputs: SHA-256 of generated files, for replay verification
+
+        Returns:
+            Session dictionary
+        """
+        return {
+            'version': SESSION_VERSION,
+            'project_name': project_name,
+            'options': options or {},
+            'steps': self.steps,
+            'outputs': outputs or {},
+        }
+
+    def save(self, path: Path, project_name: str, options: Optional[dict] = None,
+             outputs: Optional[Dict[str, str]] = None) -> None:
+        """Write the session file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(project_name, options, outputs), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+class SessionReplay:
+    """Input source that feeds recorded answers back and times each step."""
+
+    def __init__(self, answers: List[str], echo: bool = False):
+        self.answers = answers
+        self.echo = echo
+        self.prompts: List[str] = []
+        self.step_seconds: List[float] = []
+        self._position = 0
+        self._last = time.perf_counter()
+
+    @classmethod
+    def from_session(cls, session: dict, echo: bool = False) -> 'SessionReplay':
+        """Create a replay from a session dictionary."""
+        return cls([step['answer'] for step in session['steps']], echo)
+
+    def restart(self) -> None:
+        """Rewind to the first answer and clear the timings."""
+        self.prompts = []
+        self.step_seconds = []
+        self._position = 0
+        self._last = time.perf_counter()
+
+    def __call__(self, prompt: str = "") -> str:
+        # Time spent by the program since the previous answer (or restart)
+        now = time.perf_counter()
+        self.step_seconds.append(now - self._last)
+        self.prompts.append(prompt)
+
+        if self._position >= len(self.answers):
+            raise SessionExhausted(f"Session has no answer for prompt {self._position + 1}: {prompt.strip()}")
+        answer = self.answers[self._position]
+        self._position += 1
+        if self.echo:
+            print(f"{prompt}{answer}")
+        self._last = time.perf_counter()
+        return answer
+
+    def finish(self) -> None:
+        """Record the time from the last answer to the end of the run."""
+        self.step_seconds.append(time.perf_counter() - self._last)
+
+    @property
+    def remaining(self) -> int:
+        """Number of recorded answers that were not consumed."""
+        return len(self.answers) - self._position
+
+
+def load_session(path: Path) -> dict:
+    """
+    Load a session file.
+
+    Raises:
+        ValueError: If the file is not a supported session
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        session = json.load(f)
+    if session.get('version') != SESSION_VERSION or 'steps' not in session:
+        raise ValueError(f"Unsupported session file: {path}")
+    return session
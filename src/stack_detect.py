@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Detect the technology stack of an existing project.
+
+Languages are counted by source file extension; frameworks, databases,
+cloud platforms and tools are recognized from dependency manifests and
+marker files. The result uses the same names and keys as the interactive
+configuration, so it can be passed to TemplateManager directly.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+LANGUAGE_EXTENSIONS: Dict[str, str] = {
+    ".py": "Python", ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript", ".java": "Java", ".go": "Go", ".rs": "Rust", ".cs": "C#",
+    ".cpp": "C++", ".cc": "C++", ".cxx": "C++", ".hpp": "C++", ".rb": "Ruby", ".php": "PHP",
+    ".swift": "Swift", ".kt": "Kotlin", ".kts": "Kotlin", ".dart": "Dart", ".r": "R", ".jl": "Julia",
+    ".sh": "Bash",
+}
+
+# Dependency manifests whose text is searched for framework and database names
+MANIFEST_NAMES = (
+    "package.json", "requirements.txt", "requirements-dev.txt", "pyproject.toml", "Pipfile", "setup.py",
+    "setup.cfg", "pom.xml", "build.gradle", "build.gradle.kts", "go.mod", "Cargo.toml", "pubspec.yaml",
+    "Gemfile", "composer.json", "docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml",
+)
+
+FRAMEWORK_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("Django", r"\bdjango\b"),
+    ("Flask", r"\bflask\b"),
+    ("FastAPI", r"\bfastapi\b"),
+    ("Streamlit", r"\bstreamlit\b"),
+    ("Next.js", r'"next"\s*:'),
+    ("React", r'"react"\s*:'),
+    ("Vue", r'"vue"\s*:'),
+    ("Angular", r'"@angular/core"\s*:'),
+    ("NestJS", r'"@nestjs/core"\s*:'),
+    ("Svelte", r'"svelte"\s*:'),
+    ("Express", r'"express"\s*:'),
+    ("Spring-Boot", r"spring-boot"),
+    ("Spring", r"springframework"),
+    ("Gin", r"gin-gonic/gin"),
+    ("Echo", r"labstack/echo"),
+    ("Fiber", r"gofiber/fiber"),
+    ("Actix", r"\bactix-web\b"),
+    ("Rocket", r"^\s*rocket\s*="),
+    ("Flutter", r"\bflutter\b"),
+)
+
+DATABASE_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("PostgreSQL", r"\b(postgres|postgresql|psycopg2?|asyncpg|pg)\b"),
+    ("MySQL", r"\b(mysql|mysqlclient|pymysql|mysql2|mariadb)\b"),
+    ("MongoDB", r"\b(mongo|mongodb|pymongo|mongoose|motor)\b"),
+    ("SQLite", r"\b(sqlite|sqlite3|better-sqlite3)\b"),
+    ("Redis", r"\b(redis|ioredis)\b"),
+    ("Elasticsearch", r"\b(elasticsearch|@elastic/elasticsearch)\b"),
+    ("DynamoDB", r"\bdynamodb\b"),
+    ("Firestore", r"\bfirestore\b"),
+    ("Cassandra", r"\b(cassandra|cassandra-driver)\b"),
+    ("InfluxDB", r"\binfluxdb"),
+)
+
+# Marker file (relative to the project root) -> (configuration key, value)
+MARKER_FILES: Tuple[Tuple[str, str, str], ...] = (
+    ("vercel.json", "cloud_platform", "Vercel"),
+    ("netlify.toml", "cloud_platform", "Netlify"),
+    ("fly.toml", "cloud_platform", "Fly.io"),
+    ("app.yaml", "cloud_platform", "Google Cloud Platform (GCP)"),
+    ("cloudbuild.yaml", "cloud_platform", "Google Cloud Platform (GCP)"),
+    ("serverless.yml", "cloud_platform", "AWS"),
+    ("cdk.json", "cloud_platform", "AWS"),
+    ("samconfig.toml", "cloud_platform", "AWS"),
+    ("azure-pipelines.yml", "cloud_platform", "Microsoft Azure"),
+    ("Procfile", "cloud_platform", "Heroku"),
+    ("Dockerfile", "additional_tools", "Docker"),
+    ("docker-compose.yml", "additional_tools", "Docker"),
+    (".github/workflows", "additional_tools", "GitHub Actions"),
+    (".gitlab-ci.yml", "additional_tools", "GitLab CI"),
+    ("Jenkinsfile", "additional_tools", "Jenkins"),
+    ("ansible.cfg", "additional_tools", "Ansible"),
+    ("nginx.conf", "additional_tools", "Nginx"),
+)
+
+SKIPPED_DIRS = {"node_modules", "venv", "env", "__pycache__", "target", "build", "dist", "vendor", "out"}
+
+MANIFEST_MAX_BYTES = 512 * 1024
+
+
+def _walk(project_path: Path, max_files: int):
+    """Yield (relative path, file name) for up to max_files files, skipping hidden and dependency dirs."""
+    seen = 0
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in SKIPPED_DIRS)
+        relative_root = os.path.relpath(root, project_path)
+        for name in sorted(files):
+            yield (name if relative_root == '.' else f"{relative_root}/{name}"), name
+            seen += 1
+            if seen >= max_files:
+                return
+
+
+def detect_stack(project_path: Path, max_files: int = 20000) -> Dict[str, Any]:
+    """
+    Detect languages, frameworks, databases, cloud platform and tools.
+
+    Args:
+        project_path: Project root
+        max_files: Stop counting source files after this many files
+
+    Returns:
+        Configuration-style dictionary ('languages' ordered by file count,
+        'frameworks', 'databases', 'cloud_platform', 'additional_tools') plus
+        'evidence' (value -> file that revealed it) and 'manifests' (files read)
+    """
+    project_path = Path(project_path)
+    counts: Dict[str, int] = {}
+    manifests: List[str] = []
+    evidence: Dict[str, str] = {}
+
+    for relative_path, name in _walk(project_path, max_files):
+        language = LANGUAGE_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+        if language:
+            counts[language] = counts.get(language, 0) + 1
+            evidence.setdefault(language, relative_path)
+        if (name in MANIFEST_NAMES or name.startswith("requirements")) and relative_path.count('/') <= 1:
+            manifests.append(relative_path)
+        if name.endswith(".tf"):
+            evidence.setdefault("Terraform", relative_path)
+
+    frameworks: List[str] = []
+    databases: List[str] = []
+    for relative_path in manifests:
+        try:
+            with open(project_path / relative_path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read(MANIFEST_MAX_BYTES)
+        except OSError:
+            continue
+        if relative_path.endswith("package.json"):
+            text = _package_dependencies(text)
+        for found, patterns in ((frameworks, FRAMEWORK_PATTERNS), (databases, DATABASE_PATTERNS)):
+            for value, pattern in patterns:
+                if value not in found and re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
+                    found.append(value)
+                    evidence.setdefault(value, relative_path)
+
+    cloud_platform: Optional[str] = None
+    additional_tools: List[str] = ["Terraform"] if "Terraform" in evidence else []
+    for marker, key, value in MARKER_FILES:
+        if not (project_path / marker).exists():
+            continue
+        if key == "cloud_platform" and cloud_platform is None:
+            cloud_platform = value
+        elif key == "additional_tools" and value not in additional_tools:
+            additional_tools.append(value)
+        else:
+            continue
+        evidence.setdefault(value, marker)
+
+    return {
+        'languages': sorted(counts, key=lambda language: (-counts[language], language)),
+        'frameworks': frameworks,
+        'databases': databases,
+        'cloud_platform': cloud_platform,
+        'additional_tools': additional_tools,
+        'file_counts': counts,
+        'evidence': evidence,
+        'manifests': manifests,
+    }
+
+
+def _package_dependencies(text: str) -> str:
+    """Only the dependency sections of package.json (names in scripts or descriptions don't count)."""
+    try:
+        package = json.loads(text)
+    except ValueError:
+        return text
+    names = {}
+    for key in ("dependencies", "devDependencies", "peerDependencies"):
+        section = package.get(key)
+        if isinstance(section, dict):
+            names.update(section)
+    return json.dumps(names)
+
+
+def stack_fingerprint(project_path: Path, detected: Optional[Dict[str, Any]] = None) -> Tuple:
+    """
+    Cheap change check for a cached detection.
+
+    Covers the modification times of the project root, its top-level
+    directories and the manifests the detection read; a file added deep in
+    the tree is only noticed once its parent at the top level changes.
+
+    Args:
+        project_path: Project root
+        detected: Earlier detect_stack result whose manifests to include
+
+    Returns:
+        Tuple that changes when the project (probably) changed
+    """
+    project_path = Path(project_path)
+    entries = []
+    try:
+        with os.scandir(project_path) as scan:
+            for entry in scan:
+                if entry.is_dir(follow_symlinks=False) and entry.name not in SKIPPED_DIRS:
+                    entries.append((entry.name, entry.stat().st_mtime_ns))
+        entries.append(('.', project_path.stat().st_mtime_ns))
+    except OSError:
+        return ()
+    for relative_path in (detected or {}).get('manifests', []):
+        try:
+            stat = (project_path / relative_path).stat()
+            entries.append((relative_path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            entries.append((relative_path, None))
+    return tuple(sorted(entries, key=str))
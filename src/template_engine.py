@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Minimal template language for prompt rule templates.
+
+Syntax:
+    {{ name }}                     Placeholder (left untouched if name is unknown)
+    {{ name | join }}              Join a list with ", " (or join(" / ") for a custom separator)
+    {% if cond %} ... {% elif cond %} ... {% else %} ... {% endif %}
+    {% for item in name %} ... {% endfor %}
+    {% raw %} ... {% endraw %}     Emit the enclosed text verbatim
+
+Conditions are a context name (truthiness), optionally negated with
+``not``, or a comparison: ``name == "value"``, ``name != "value"`` or
+``"value" in name``.
+
+A block tag alone on its line is removed together with its line break,
+and ``{%-`` strips all whitespace before the tag, so templates stay
+readable without leaving blank lines in the output.
+
+Templates are compiled once into a flat segment list; rendering is a
+single walk that joins prebuilt literals and substitutions.
+"""
+
+import re
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+
+class TemplateSyntaxError(ValueError):
+    """Raised when a template cannot be compiled."""
+
+
+_TAG_PATTERN = re.compile(r'\{\{(.*?)\}\}|\{%(-?)(.*?)%\}', re.DOTALL)
+_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_STRING_PATTERN = re.compile(r'^"([^"]*)"$|^\'([^\']*)\'$')
+_FILTER_PATTERN = re.compile(r'^([a-z_]+)(?:\((.*)\))?$')
+
+_MISSING = object()
+
+# Segment kinds (a plain str segment is a literal)
+_VAR = 'var'
+_IF = 'if'
+_FOR = 'for'
+
+
+class CompiledTemplate:
+    """A template compiled to a segment list."""
+
+    __slots__ = ('name', 'segments', 'static_text', 'names')
+
+    def __init__(self, name: str, segments: list, names: FrozenSet[str] = frozenset()):
+        self.name = name
+        self.segments = segments
+        # Context names read by placeholders, conditions and loops
+        self.names = names
+        # Templates without tags render to their source text unchanged
+        self.static_text = segments[0] if len(segments) == 1 and isinstance(segments[0], str) else (
+            '' if not segments else None
+        )
+
+    @property
+    def is_static(self) -> bool:
+        """Whether the template contains no placeholders or blocks."""
+        return self.static_text is not None
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """
+        Render the template.
+
+        Args:
+            context: Values for placeholders, conditions and loops
+
+        Returns:
+            Rendered text
+        """
+        if self.static_text is not None:
+            return self.static_text
+        out: List[str] = []
+        _render_segments(self.segments, context, out)
+        return ''.join(out)
+
+
+def _render_segments(segments: list, context: Dict[str, Any], out: List[str]) -> None:
+    """Append the rendering of a segment list to out."""
+    for segment in segments:
+        if isinstance(segment, str):
+            out.append(segment)
+            continue
+
+        kind = segment[0]
+        if kind == _VAR:
+            _, name, apply_filter, source = segment
+            value = context.get(name, _MISSING)
+            if value is _MISSING:
+                out.append(source)
+            else:
+                out.append(apply_filter(value))
+        elif kind == _IF:
+            _, branches, else_segments = segment
+            for predicate, body in branches:
+                if predicate(context):
+                    _render_segments(body, context, out)
+                    break
+            else:
+                _render_segments(else_segments, context, out)
+        elif kind == _FOR:
+            _, loop_var, name, body = segment
+            items = context.get(name) or ()
+            loop_context = dict(context)
+            for item in items:
+                loop_context[loop_var] = item
+                _render_segments(body, loop_context, out)
+
+
+def _to_text(value: Any) -> str:
+    """Convert a placeholder value to text."""
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(item) for item in value)
+    return str(value)
+
+
+def _compile_filter(expression: str, template_name: str) -> Callable[[Any], str]:
+    """Compile a placeholder filter expression."""
+    match = _FILTER_PATTERN.match(expression.strip())
+    if not match:
+        raise TemplateSyntaxError(f"{template_name}: invalid filter '{expression.strip()}'")
+
+    filter_name, argument = match.groups()
+    if filter_name == 'join':
+        separator = ', '
+        if argument is not None:
+            literal = _STRING_PATTERN.match(argument.strip())
+            if not literal:
+                raise TemplateSyntaxError(f"{template_name}: join() expects a quoted separator")
+            separator = literal.group(1) if literal.group(1) is not None else literal.group(2)
+        return lambda value: separator.join(str(item) for item in (value or ()))
+    if filter_name == 'lower':
+        return lambda value: _to_text(value).lower()
+    if filter_name == 'upper':
+        return lambda value: _to_text(value).upper()
+    raise TemplateSyntaxError(f"{template_name}: unknown filter '{filter_name}'")
+
+
+def _parse_literal(text: str) -> Optional[str]:
+    """Parse a quoted string literal, returning None if text is not one."""
+    match = _STRING_PATTERN.match(text.strip())
+    if not match:
+        return None
+    return match.group(1) if match.group(1) is not None else match.group(2)
+
+
+def _compile_condition(expression: str, template_name: str) -> Tuple[Callable[[Dict[str, Any]], bool], str]:
+    """Compile an if/elif condition into a predicate over the context and the name it reads."""
+    expression = expression.strip()
+    negate = False
+    if expression.startswith('not '):
+        negate = True
+        expression = expression[4:].strip()
+
+    predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    for operator in ('==', '!='):
+        if operator in expression:
+            left, right = (part.strip() for part in expression.split(operator, 1))
+            literal = _parse_literal(right)
+            if not _NAME_PATTERN.match(left) or literal is None:
+                raise TemplateSyntaxError(f"{template_name}: invalid condition '{expression}'")
+            if operator == '==':
+                predicate = lambda context, name=left, value=literal: context.get(name) == value
+            else:
+                predicate = lambda context, name=left, value=literal: context.get(name) != value
+            read = left
+            break
+
+    if predicate is None and ' in ' in expression:
+        left, right = (part.strip() for part in expression.split(' in ', 1))
+        literal = _parse_literal(left)
+        if literal is None or not _NAME_PATTERN.match(right):
+            raise TemplateSyntaxError(f"{template_name}: invalid condition '{expression}'")
+        predicate = lambda context, name=right, value=literal: value in (context.get(name) or ())
+        read = right
+
+    if predicate is None:
+        if not _NAME_PATTERN.match(expression):
+            raise TemplateSyntaxError(f"{template_name}: invalid condition '{expression}'")
+        predicate = lambda context, name=expression: bool(context.get(name))
+        read = expression
+
+    if negate:
+        return (lambda context, inner=predicate: not inner(context)), read
+    return predicate, read
+
+
+def _tokenize(source: str) -> List[Tuple[str, str, str]]:
+    """
+    Split a template into (kind, content, source) tokens.
+
+    Kinds are 'text', 'var' and 'block'. Whitespace control for block
+    tags is applied here so the compiler only sees final literals.
+    """
+    tokens: List[Tuple[str, str, str]] = []
+    position = 0
+    in_raw = False
+
+    for match in _TAG_PATTERN.finditer(source):
+        start, end = match.span()
+        if in_raw:
+            inner = (match.group(3) or '').strip()
+            if match.group(3) is None or inner != 'endraw':
+                continue
+
+        text = source[position:start]
+        if match.group(1) is not None:
+            tokens.append(('text', text, text))
+            tokens.append(('var', match.group(1).strip(), match.group(0)))
+            position = end
+            continue
+
+        strip_before = match.group(2) == '-'
+        content = match.group(3).strip()
+
+        # A block tag alone on its line consumes its indentation and line break
+        line_start = source.rfind('\n', 0, start) + 1
+        alone = not source[line_start:start].strip() and (end == len(source) or source[end] == '\n')
+        if strip_before:
+            text = text.rstrip()
+        elif alone:
+            text = text[:len(text) - (start - max(line_start, position))]
+        if alone and end < len(source):
+            end += 1
+
+        tokens.append(('text', text, text))
+        if content == 'raw':
+            in_raw = True
+        elif content == 'endraw':
+            in_raw = False
+        else:
+            tokens.append(('block', content, match.group(0)))
+        position = end
+
+    if in_raw:
+        raise TemplateSyntaxError("unterminated {% raw %} block")
+
+    tokens.append(('text', source[position:], source[position:]))
+    return tokens
+
+
+def compile_template(source: str, name: str = '<template>') -> CompiledTemplate:
+    """
+    Compile template source into a segment list.
+
+    Args:
+        source: Template source text
+        name: Template name used in error messages
+
+    Returns:
+        CompiledTemplate
+
+    Raises:
+        TemplateSyntaxError: If the template is malformed
+    """
+    if '{{' not in source and '{%' not in source:
+        return CompiledTemplate(name, [source] if source else [])
+
+    try:
+        tokens = _tokenize(source)
+    except TemplateSyntaxError as e:
+        raise TemplateSyntaxError(f"{name}: {e}") from None
+
+    root: list = []
+    # Context names read outside the loop variables that shadow them
+    names: Set[str] = set()
+
+    def reads(read: str) -> None:
+        if not any(kind == 'for' and owner[1] == read for kind, _, owner in stack):
+            names.add(read)
+
+    # Stack of (kind, segment list being filled, owning segment)
+    stack: List[Tuple[str, list, Any]] = [('root', root, None)]
+
+    for kind, content, _source in tokens:
+        current = stack[-1][1]
+        if kind == 'text':
+            if content:
+                if current and isinstance(current[-1], str):
+                    current[-1] += content
+                else:
+                    current.append(content)
+        elif kind == 'var':
+            variable, _, filter_expression = content.partition('|')
+            variable = variable.strip()
+            if not _NAME_PATTERN.match(variable):
+                # Not ours (e.g. a Vue/Angular snippet) - keep it verbatim
+                if current and isinstance(current[-1], str):
+                    current[-1] += _source
+                else:
+                    current.append(_source)
+                continue
+            try:
+                apply_filter = _compile_filter(filter_expression, name) if filter_expression else _to_text
+            except TemplateSyntaxError:
+                apply_filter = None
+            if apply_filter is None:
+                # Unknown filter - likely a framework snippet, keep it verbatim
+                if current and isinstance(current[-1], str):
+                    current[-1] += _source
+                else:
+                    current.append(_source)
+                continue
+            current.append((_VAR, variable, apply_filter, _source))
+            reads(variable)
+        else:
+            keyword, _, argument = content.partition(' ')
+            if keyword == 'if':
+                branch_body: list = []
+                predicate, read = _compile_condition(argument, name)
+                reads(read)
+                segment = (_IF, [(predicate, branch_body)], [])
+                current.append(segment)
+                stack.append(('if', branch_body, segment))
+            elif keyword in ('elif', 'else'):
+                if stack[-1][0] not in ('if', 'elif'):
+                    raise TemplateSyntaxError(f"{name}: '{{% {keyword} %}}' without matching if")
+                segment = stack.pop()[2]
+                if keyword == 'elif':
+                    branch_body = []
+                    predicate, read = _compile_condition(argument, name)
+                    reads(read)
+                    segment[1].append((predicate, branch_body))
+                    stack.append(('elif', branch_body, segment))
+                else:
+                    stack.append(('else', segment[2], segment))
+            elif keyword == 'endif':
+                if stack[-1][0] not in ('if', 'elif', 'else'):
+                    raise TemplateSyntaxError(f"{name}: '{{% endif %}}' without matching if")
+                stack.pop()
+            elif keyword == 'for':
+                parts = argument.split()
+                if len(parts) != 3 or parts[1] != 'in' or not all(_NAME_PATTERN.match(p) for p in (parts[0], parts[2])):
+                    raise TemplateSyntaxError(f"{name}: invalid for loop '{content}'")
+                loop_body: list = []
+                segment = (_FOR, parts[0], parts[2], loop_body)
+                reads(parts[2])
+                current.append(segment)
+                stack.append(('for', loop_body, segment))
+            elif keyword == 'endfor':
+                if stack[-1][0] != 'for':
+                    raise TemplateSyntaxError(f"{name}: '{{% endfor %}}' without matching for")
+                stack.pop()
+            else:
+                raise TemplateSyntaxError(f"{name}: unknown tag '{{% {content} %}}'")
+
+    if len(stack) > 1:
+        raise TemplateSyntaxError(f"{name}: unclosed '{{% {stack[-1][0]} %}}' block")
+
+    return CompiledTemplate(name, root, frozenset(names))
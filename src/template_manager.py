@@ -1,45 +1,129 @@
 #!/usr/bin/env python3
 """Template management for the Claude project creator."""
 
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from template_engine import CompiledTemplate, TemplateSyntaxError, compile_template
+from section_tree import TAG_COMMENT_PREFIX, SectionSelection, SectionTree
+from benchmark_scaffold import benchmark_commands
 from config import (
-    get_prompt_rules_dir, LANGUAGE_FILES, FRAMEWORK_FILES, 
-    CLOUD_FILES, DATABASE_FILES, FRAMEWORK_DEPENDENCIES
+    get_prompt_rules_dir, get_installed_rules_root, LANGUAGE_FILES, FRAMEWORK_FILES,
+    CLOUD_FILES, DATABASE_FILES, PERFORMANCE_FILES, FRAMEWORK_DEPENDENCIES, GENERATOR_VERSION
 )
 from typing import Set
 
 
+# Separator placed between rendered CLAUDE.md sections
+SECTION_SEPARATOR = "\n"
+
+# Partials rendered by the partial-only CLAUDE.md stages
+STAGE_PARTIALS: Dict[str, str] = {
+    'project_type': 'project_type',
+    'additional_tools': 'additional_tools',
+    'project_specific': 'project_specific',
+}
+
+# Template context names computed from configuration fields other than their own
+DERIVED_CONTEXT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'benchmark_commands': ('benchmarks', 'languages'),
+}
+
+
+class RenderedSection(NamedTuple):
+    """One rendered section of CLAUDE.md and the templates it came from."""
+    id: str
+    sources: Tuple[str, ...]
+    text: str
+
+
+class _TemplateCacheEntry:
+    """A template's text with its compiled form and (lazily) its heading tree."""
+    
+    __slots__ = ('mtime_ns', 'size', 'content', 'compiled', '_section_tree')
+    
+    def __init__(self, mtime_ns: int, size: int, content: str, compiled: CompiledTemplate):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.content = content
+        self.compiled = compiled
+        self._section_tree: Optional[SectionTree] = None
+    
+    def section_tree(self) -> SectionTree:
+        """Get the heading tree of the template text, parsing it on first use."""
+        if self._section_tree is None:
+            self._section_tree = SectionTree(self.content)
+        return self._section_tree
+
+
 class TemplateManager:
     """Manages loading and processing of template files."""
     
-    def __init__(self):
+    # Template contents, compiled forms and heading trees, shared by all
+    # instances, keyed by path and validated against (mtime, size) so
+    # long-running processes pick up edits.
+    _template_cache: Dict[Path, _TemplateCacheEntry] = {}
+    _template_cache_lock = threading.Lock()
+    
+    # CLAUDE.md stages in document order, with the configuration fields that
+    # choose each stage's templates (rendered by render_stage)
+    SECTION_STAGES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+        ('base', ()),
+        ('project_type', ()),
+        ('languages', ('languages',)),
+        ('frameworks', ('frameworks',)),
+        ('cloud', ('cloud_platform',)),
+        ('databases', ('databases',)),
+        ('performance', ('performance_profiles', 'languages')),
+        ('additional_tools', ()),
+        ('project_specific', ()),
+    )
+    
+    def __init__(self, on_warning: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            on_warning: Callback for non-fatal problems; defaults to printing them
+        """
         self.prompt_rules_dir = get_prompt_rules_dir()
         self.base_template_path = self.prompt_rules_dir / "base.md"
+        self.partials_dir = self.prompt_rules_dir / "partials"
+        self.on_warning = on_warning or print
     
-    def load_base_template(self) -> str:
+    def load_base_template(self, context: Optional[dict] = None,
+                           selection: Optional[SectionSelection] = None) -> str:
         """
         Load the base template content.
         
+        Args:
+            context: Template context; when given the template is rendered
+            selection: Heading sections to keep; None keeps the whole template
+        
         Returns:
             Base template content as string
         """
         try:
-            with open(self.base_template_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return self._render_template_file(self.base_template_path, context, selection)
         except FileNotFoundError:
-            print(f"Warning: Base template not found at {self.base_template_path}")
+            self.on_warning(f"Warning: Base template not found at {self.base_template_path}")
             return "# Claude Project Guidelines\n\n*Base template not found - please add your guidelines here*"
         except Exception as e:
-            print(f"Error loading base template: {e}")
+            self.on_warning(f"Error loading base template: {e}")
             return "# Claude Project Guidelines\n\n*Error loading template - please add your guidelines here*"
     
-    def load_language_template(self, language: str) -> Optional[str]:
+    def load_language_template(self, language: str, context: Optional[dict] = None,
+                               selection: Optional[SectionSelection] = None) -> Optional[str]:
         """
         Load template for a specific programming language.
         
         Args:
             language: The programming language name
+            context: Template context; when given the template is rendered
+            selection: Heading sections to keep; None keeps the whole template
             
         Returns:
             Template content or None if not found
@@ -48,14 +132,17 @@ class TemplateManager:
             return None
         
         template_path = self.prompt_rules_dir / "languages" / f"{LANGUAGE_FILES[language]}.md"
-        return self._load_template_file(template_path)
+        return self._load_template_file(template_path, context, selection)
     
-    def load_framework_template(self, framework: str) -> Optional[str]:
+    def load_framework_template(self, framework: str, context: Optional[dict] = None,
+                                selection: Optional[SectionSelection] = None) -> Optional[str]:
         """
         Load template for a specific framework with hierarchical dependencies.
         
         Args:
             framework: The framework name
+            context: Template context; when given the templates are rendered
+            selection: Heading sections to keep; None keeps the whole templates
             
         Returns:
             Template content with dependencies or None if not found
@@ -70,12 +157,12 @@ class TemplateManager:
         if framework in FRAMEWORK_DEPENDENCIES:
             # Load base framework templates first
             for base_framework in FRAMEWORK_DEPENDENCIES[framework]:
-                base_template = self._load_framework_template_single(base_framework)
+                base_template = self._load_framework_template_single(base_framework, context, selection)
                 if base_template:
                     content_parts.append(f"## [Base: {base_framework}]\n\n{base_template}")
         
         # Load the main framework template
-        main_template = self._load_framework_template_single(framework)
+        main_template = self._load_framework_template_single(framework, context, selection)
         if main_template:
             # If we have dependencies, mark this as extending them
             if content_parts:
@@ -85,20 +172,24 @@ class TemplateManager:
         
         return '\n'.join(content_parts) if content_parts else None
     
-    def _load_framework_template_single(self, framework: str) -> Optional[str]:
+    def _load_framework_template_single(self, framework: str, context: Optional[dict] = None,
+                                        selection: Optional[SectionSelection] = None) -> Optional[str]:
         """Load a single framework template without dependencies."""
         if framework not in FRAMEWORK_FILES:
             return None
         
         template_path = self.prompt_rules_dir / "frameworks" / f"{FRAMEWORK_FILES[framework]}.md"
-        return self._load_template_file(template_path)
+        return self._load_template_file(template_path, context, selection)
     
-    def load_cloud_template(self, cloud_platform: str) -> Optional[str]:
+    def load_cloud_template(self, cloud_platform: str, context: Optional[dict] = None,
+                            selection: Optional[SectionSelection] = None) -> Optional[str]:
         """
         Load template for a specific cloud platform.
         
         Args:
             cloud_platform: The cloud platform name
+            context: Template context; when given the template is rendered
+            selection: Heading sections to keep; None keeps the whole template
             
         Returns:
             Template content or None if not found
@@ -107,14 +198,17 @@ class TemplateManager:
             return None
         
         template_path = self.prompt_rules_dir / "cloud" / f"{CLOUD_FILES[cloud_platform]}.md"
-        return self._load_template_file(template_path)
+        return self._load_template_file(template_path, context, selection)
     
-    def load_database_template(self, database: str) -> Optional[str]:
+    def load_database_template(self, database: str, context: Optional[dict] = None,
+                               selection: Optional[SectionSelection] = None) -> Optional[str]:
         """
         Load template for a specific database.
         
         Args:
             database: The database name
+            context: Template context; when given the template is rendered
+            selection: Heading sections to keep; None keeps the whole template
             
         Returns:
             Template content or None if not found
@@ -123,151 +217,649 @@ class TemplateManager:
             return None
         
         template_path = self.prompt_rules_dir / "databases" / f"{DATABASE_FILES[database]}.md"
-        return self._load_template_file(template_path)
+        return self._load_template_file(template_path, context, selection)
     
-    def _load_template_file(self, template_path: Path) -> Optional[str]:
+    def load_performance_template(self, profile: str, context: Optional[dict] = None,
+                                  selection: Optional[SectionSelection] = None) -> Optional[str]:
+        """
+        Load template for a cross-cutting performance profile.
+        
+        Args:
+            profile: The performance profile name (e.g. 'Async I/O')
+            context: Template context; when given the template is rendered
+            selection: Heading sections to keep; None keeps the whole template
+        
+        Returns:
+            Template content or None if not found
+        """
+        if profile not in PERFORMANCE_FILES:
+            return None
+        
+        template_path = self.prompt_rules_dir / "performance" / f"{PERFORMANCE_FILES[profile]}.md"
+        return self._load_template_file(template_path, context, selection)
+    
+    def load_language_performance_template(self, language: str, context: Optional[dict] = None,
+                                           selection: Optional[SectionSelection] = None) -> Optional[str]:
+        """
+        Load the performance guidelines for a specific language.
+        
+        Args:
+            language: The programming language name
+            context: Template context; when given the template is rendered
+            selection: Heading sections to keep; None keeps the whole template
+        
+        Returns:
+            Template content or None if not found
+        """
+        if language not in LANGUAGE_FILES:
+            return None
+        
+        template_path = self.prompt_rules_dir / "performance" / f"{LANGUAGE_FILES[language]}.md"
+        return self._load_template_file(template_path, context, selection)
+    
+    def render_partial(self, name: str, context: dict) -> str:
+        """
+        Render one of the generator's own partial templates.
+        
+        Args:
+            name: Partial name (file name in prompt_rules/partials without .md)
+            context: Template context from build_template_context
+            
+        Returns:
+            Rendered partial, or an empty string if it is missing
+        """
+        rendered = self._load_template_file(self.partials_dir / f"{name}.md", context)
+        if rendered is None:
+            self.on_warning(f"Warning: Partial template '{name}' not found in {self.partials_dir}")
+            return ""
+        return rendered
+    
+    def build_template_context(self, config: dict, project_name: str,
+                               generated_at: Optional[str] = None) -> dict:
+        """
+        Build the context that templates are rendered with.
+        
+        "Other/Custom" selections are dropped so templates only see real choices.
+        
+        Args:
+            config: User configuration dictionary
+            project_name: Name of the project
+            generated_at: Generation timestamp to embed, if any
+            
+        Returns:
+            Template context dictionary
+        """
+        def selected(key: str) -> List[str]:
+            return [item for item in config.get(key) or [] if item != "Other/Custom"]
+        
+        def chosen(key: str) -> Optional[str]:
+            value = config.get(key)
+            return value if value and value != "Other/Custom" else None
+        
+        return {
+            'project_name': project_name,
+            'project_type': chosen('project_type'),
+            'languages': selected('languages'),
+            'frameworks': selected('frameworks'),
+            'cloud_platform': chosen('cloud_platform'),
+            'databases': selected('databases'),
+            'additional_tools': selected('additional_tools'),
+            'performance_profiles': selected('performance_profiles'),
+            'benchmark_commands': benchmark_commands(config),
+            'generated_at': generated_at,
+        }
+    
+    def _load_template_file(self, template_path: Path, context: Optional[dict] = None,
+                            selection: Optional[SectionSelection] = None) -> Optional[str]:
         """
         Load a template file and return its content.
         
         Args:
             template_path: Path to the template file
+            context: Template context; when given the template is rendered
+            selection: Heading sections to keep; None keeps the whole template
             
         Returns:
             Template content or None if not found
         """
         try:
-            if template_path.exists():
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    return f.read()
+            return self._render_template_file(template_path, context, selection)
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            print(f"Warning: Could not load template {template_path}: {e}")
+            self.on_warning(f"Warning: Could not load template {template_path}: {e}")
         return None
     
-    def build_claude_md_content(self, config: dict, project_name: str) -> str:
+    def _render_template_file(self, template_path: Path, context: Optional[dict],
+                              selection: Optional[SectionSelection]) -> str:
+        """
+        Render a template and slice out the selected heading sections.
+        
+        Static templates are sliced using their cached heading tree; only
+        templates with placeholders need their rendered output parsed.
+        Tag comments are dropped from the output.
+        
+        Raises:
+            OSError: If the template cannot be read
+        """
+        entry = self._get_cache_entry(template_path)
+        text = entry.compiled.render(context) if context is not None else entry.content
+        include, exclude = ([], []) if selection is None else selection.for_template(self._template_id(template_path))
+        if not include and not exclude and TAG_COMMENT_PREFIX not in text:
+            return text
+        tree = entry.section_tree() if text is entry.content else SectionTree(text)
+        return tree.extract(include, exclude)
+    
+    def _template_id(self, template_path: Path) -> str:
+        """Get a template's ID: its path relative to prompt_rules without extension."""
+        try:
+            return template_path.relative_to(self.prompt_rules_dir).with_suffix('').as_posix()
+        except ValueError:
+            return template_path.stem
+    
+    def get_section_tree(self, template_id: str) -> Optional[SectionTree]:
+        """
+        Get the cached heading tree of a template.
+        
+        Args:
+            template_id: Template path relative to prompt_rules without extension (e.g. 'languages/python')
+            
+        Returns:
+            SectionTree or None if the template does not exist
+        """
+        try:
+            return self._get_cache_entry(self.prompt_rules_dir / f"{template_id}.md").section_tree()
+        except OSError:
+            return None
+    
+    def prefetch_templates(self, languages: Iterable[str] = (), frameworks: Iterable[str] = (),
+                           cloud_platforms: Iterable[str] = (), databases: Iterable[str] = (),
+                           performance_profiles: Iterable[str] = (), include_base: bool = False) -> int:
+        """
+        Load templates into the shared cache ahead of rendering.
+        
+        Used to warm the cache speculatively while the user is still
+        answering prompts; unknown names and missing files are ignored.
+        
+        Args:
+            languages: Language names (e.g. 'Python')
+            frameworks: Framework names, including their dependencies
+            cloud_platforms: Cloud platform names
+            databases: Database names
+            performance_profiles: Performance profile names
+            include_base: Also load base.md and the partials
+        
+        Returns:
+            Number of templates loaded or confirmed current
+        """
+        paths = []
+        if include_base:
+            paths.append(self.base_template_path)
+            if self.partials_dir.is_dir():
+                paths.extend(sorted(self.partials_dir.glob("*.md")))
+        paths += [self.prompt_rules_dir / "languages" / f"{LANGUAGE_FILES[name]}.md"
+                  for name in languages if name in LANGUAGE_FILES]
+        paths += [self.prompt_rules_dir / source
+                  for name in frameworks for source in self._framework_sources(name)]
+        paths += [self.prompt_rules_dir / "cloud" / f"{CLOUD_FILES[name]}.md"
+                  for name in cloud_platforms if name in CLOUD_FILES]
+        paths += [self.prompt_rules_dir / "databases" / f"{DATABASE_FILES[name]}.md"
+                  for name in databases if name in DATABASE_FILES]
+        paths += [self.prompt_rules_dir / "performance" / f"{PERFORMANCE_FILES[name]}.md"
+                  for name in performance_profiles if name in PERFORMANCE_FILES]
+        
+        loaded = 0
+        for template_path in dict.fromkeys(paths):
+            try:
+                self._get_cache_entry(template_path)
+                loaded += 1
+            except OSError:
+                pass
+        return loaded
+    
+    def _read_template(self, template_path: Path) -> str:
+        """
+        Read a template through the shared in-process cache.
+        
+        Args:
+            template_path: Path to the template file
+            
+        Returns:
+            Template content
+            
+        Raises:
+            OSError: If the template cannot be read
+        """
+        return self._get_cache_entry(template_path).content
+    
+    def _load_compiled(self, template_path: Path) -> CompiledTemplate:
+        """
+        Get the compiled form of a template through the shared cache.
+        
+        Args:
+            template_path: Path to the template file
+            
+        Returns:
+            Compiled template
+            
+        Raises:
+            OSError: If the template cannot be read
+        """
+        return self._get_cache_entry(template_path).compiled
+    
+    def _get_cache_entry(self, template_path: Path) -> _TemplateCacheEntry:
+        """Read and compile a template unless the cached copy is still current."""
+        stat = template_path.stat()
+        cached = self._template_cache.get(template_path)
+        if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached
+        
+        with open(template_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        try:
+            compiled = compile_template(content, template_path.name)
+        except TemplateSyntaxError as e:
+            # Fall back to the literal text so a broken template still renders
+            self.on_warning(f"Warning: Template syntax error in {template_path}: {e}")
+            compiled = CompiledTemplate(template_path.name, [content])
+        
+        entry = _TemplateCacheEntry(stat.st_mtime_ns, stat.st_size, content, compiled)
+        with self._template_cache_lock:
+            self._template_cache[template_path] = entry
+        return entry
+    
+    def build_claude_md_content(self, config: dict, project_name: str,
+                                generated_at: Optional[str] = None,
+                                reproducible: bool = False) -> str:
         """
         Build the complete CLAUDE.md content based on configuration.
         
         Args:
             config: User configuration dictionary
             project_name: Name of the project
+            generated_at: Pinned generation timestamp to embed instead of the current time
+            reproducible: Omit the volatile timestamp so identical inputs render identical bytes
             
         Returns:
             Complete CLAUDE.md content
         """
-        content_parts = []
+        sections = self.compose_claude_md_sections(config, project_name, generated_at, reproducible)
+        return self.join_sections(sections)
+    
+    @staticmethod
+    def join_sections(sections: List[RenderedSection]) -> str:
+        """Join rendered sections into the CLAUDE.md document."""
+        return SECTION_SEPARATOR.join(section.text for section in sections)
+    
+    def compose_claude_md_sections(self, config: dict, project_name: str,
+                                   generated_at: Optional[str] = None,
+                                   reproducible: bool = False) -> List[RenderedSection]:
+        """
+        Render CLAUDE.md as an ordered list of sections.
         
-        # Start with base template
-        content_parts.append(self.load_base_template())
+        Joining the section texts with SECTION_SEPARATOR yields the document;
+        the section boundaries feed the machine-readable rules index.
         
-        # Add project type context
-        if config.get('project_type') and config['project_type'] != "Other/Custom":
-            content_parts.append(f"""
-## Project Type: {config['project_type']}
-
-This project is a {config['project_type']}. Keep this context in mind when providing suggestions and code examples.
-""")
+        Args:
+            config: User configuration dictionary
+            project_name: Name of the project
+            generated_at: Pinned generation timestamp to embed instead of the current time
+            reproducible: Omit the volatile timestamp so identical inputs render identical bytes
+            
+        Returns:
+            List of rendered sections in document order
+        """
+        if generated_at is None and not reproducible:
+            generated_at = self._get_current_date()
+        context = self.build_template_context(config, project_name, generated_at)
+        selection = SectionSelection.from_config(config)
+        
+        # In import mode, shared rule templates are referenced instead of inlined
+        imports: Dict[str, str] = {}
+        if config.get('rules_mode') == 'import':
+            imports = self._resolve_rule_imports(context, selection, config.get('rules_dir'))
+        
+        sections = []
+        for stage, _ in self.SECTION_STAGES:
+            sections += self.render_stage(stage, context, selection, imports)
+        return sections
+    
+    def render_stage(self, stage: str, context: dict, selection: Optional[SectionSelection] = None,
+                     imports: Optional[Dict[str, str]] = None) -> List[RenderedSection]:
+        """
+        Render one stage of CLAUDE.md (see SECTION_STAGES).
+        
+        Args:
+            stage: Stage name
+            context: Template context from build_template_context
+            selection: Heading sections to keep; None keeps whole templates
+            imports: Import lines for templates referenced with @imports (see _resolve_rule_imports)
+            
+        Returns:
+            The stage's sections in document order (possibly none)
+        """
+        imports = imports or {}
+        
+        def imported(sources: Tuple[str, ...]) -> Optional[str]:
+            if sources and all(source in imports for source in sources):
+                return '\n'.join(imports[source] for source in sources)
+            return None
+        
+        sections = []
         
-        # Add language-specific rules
-        for language in config.get('languages', []):
-            if language != "Other/Custom":
-                template_content = self.load_language_template(language)
+        if stage == 'base':
+            # Start with base template
+            base_content = imported(("base.md",)) or self.load_base_template(context, selection)
+            sections.append(RenderedSection("base", ("base.md",), base_content))
+        
+        elif stage == 'project_type':
+            # Add project type context
+            project_type_section = self.render_partial("project_type", context)
+            if project_type_section:
+                sections.append(RenderedSection("project-type", ("partials/project_type.md",), f"\n{project_type_section}"))
+        
+        elif stage == 'languages':
+            # Add language-specific rules
+            for language in context['languages']:
+                source = f"languages/{LANGUAGE_FILES.get(language)}.md"
+                template_content = imported((source,)) or self.load_language_template(language, context, selection)
                 if template_content:
-                    content_parts.append(f"\n{template_content}")
-        
-        # Add framework-specific rules (avoid duplicates from dependencies)
-        processed_frameworks = set()
-        for framework in config.get('frameworks', []):
-            if framework != "Other/Custom" and framework not in processed_frameworks:
-                # Mark this framework and its dependencies as processed
-                processed_frameworks.add(framework)
-                if framework in FRAMEWORK_DEPENDENCIES:
-                    processed_frameworks.update(FRAMEWORK_DEPENDENCIES[framework])
-                
-                template_content = self.load_framework_template(framework)
+                    sections.append(RenderedSection(source[:-3], (source,), f"\n{template_content}"))
+        
+        elif stage == 'frameworks':
+            # Add framework-specific rules (avoid duplicates from dependencies)
+            processed_frameworks = set()
+            for framework in context['frameworks']:
+                if framework not in processed_frameworks:
+                    # Mark this framework and its dependencies as processed
+                    processed_frameworks.add(framework)
+                    if framework in FRAMEWORK_DEPENDENCIES:
+                        processed_frameworks.update(FRAMEWORK_DEPENDENCIES[framework])
+                    
+                    sources = self._framework_sources(framework)
+                    template_content = imported(sources) or self.load_framework_template(framework, context, selection)
+                    if template_content:
+                        section_id = f"frameworks/{FRAMEWORK_FILES[framework]}"
+                        sections.append(RenderedSection(section_id, sources, f"\n{template_content}"))
+        
+        elif stage == 'cloud':
+            # Add cloud-specific rules
+            if context['cloud_platform']:
+                source = f"cloud/{CLOUD_FILES.get(context['cloud_platform'])}.md"
+                template_content = imported((source,)) or self.load_cloud_template(context['cloud_platform'], context, selection)
                 if template_content:
-                    content_parts.append(f"\n{template_content}")
-        
-        # Add cloud-specific rules
-        if config.get('cloud_platform') and config['cloud_platform'] != "Other/Custom":
-            template_content = self.load_cloud_template(config['cloud_platform'])
-            if template_content:
-                content_parts.append(f"\n{template_content}")
-        
-        # Add database-specific rules
-        for database in config.get('databases', []):
-            if database != "Other/Custom":
-                template_content = self.load_database_template(database)
+                    sections.append(RenderedSection(source[:-3], (source,), f"\n{template_content}"))
+        
+        elif stage == 'databases':
+            # Add database-specific rules
+            for database in context['databases']:
+                source = f"databases/{DATABASE_FILES.get(database)}.md"
+                template_content = imported((source,)) or self.load_database_template(database, context, selection)
                 if template_content:
-                    content_parts.append(f"\n{template_content}")
+                    sections.append(RenderedSection(source[:-3], (source,), f"\n{template_content}"))
         
-        # Add additional tools context
-        tools_to_show = [tool for tool in config.get('additional_tools', []) if tool != "Other/Custom"]
-        if tools_to_show:
-            tools_section = """
-## Additional Tools & Services
-
-This project uses the following additional tools and services:
-"""
-            for tool in tools_to_show:
-                tools_section += f"- {tool}\n"
-            tools_section += "\nConsider these tools when providing suggestions and recommendations."
-            content_parts.append(tools_section)
-        
-        # Add project-specific section
-        project_specific_section = f"""
-## Project-Specific Guidelines
-
-### [Add Your Project-Specific Rules Here]
-
-<!-- 
-Add any project-specific guidelines, conventions, or requirements that are unique to this project.
-This might include:
-- Specific naming conventions used in this project
-- Custom architectural patterns
-- Integration requirements
-- Business logic constraints
-- Team-specific practices
-- External API guidelines
-- Deployment procedures
-- Special configuration needs
--->
-
-### Project Structure
-```
-# Add your actual project structure here
-```
-
-### Key Commands
-```bash
-# Add project-specific commands here
-# Install dependencies: 
-# Build: 
-# Test: 
-# Lint: 
-# Dev server: 
-# Deploy: 
-```
-
-### Environment Variables
-```
-# List required environment variables
-```
-
-### Important Notes
-<!-- Add any other important information about this project -->
-
----
-*Generated with new-claude on {self._get_current_date()}*
-"""
-        content_parts.append(project_specific_section)
+        elif stage == 'performance':
+            # Add performance rules: the chosen profiles, then guidance for each language
+            if context['performance_profiles']:
+                for profile in context['performance_profiles']:
+                    source = f"performance/{PERFORMANCE_FILES.get(profile)}.md"
+                    template_content = imported((source,)) or self.load_performance_template(profile, context, selection)
+                    if template_content:
+                        sections.append(RenderedSection(source[:-3], (source,), f"\n{template_content}"))
+                
+                for language in context['languages']:
+                    source = f"performance/{LANGUAGE_FILES.get(language)}.md"
+                    template_content = imported((source,)) or self.load_language_performance_template(language, context, selection)
+                    if template_content:
+                        sections.append(RenderedSection(source[:-3], (source,), f"\n{template_content}"))
+        
+        elif stage == 'additional_tools':
+            # Add additional tools context
+            tools_section = self.render_partial("additional_tools", context)
+            if tools_section:
+                sections.append(RenderedSection("additional-tools", ("partials/additional_tools.md",), f"\n{tools_section}"))
+        
+        elif stage == 'project_specific':
+            # Add project-specific section
+            sections.append(RenderedSection(
+                "project-specific", ("partials/project_specific.md",),
+                f"\n{self.render_partial('project_specific', context)}"
+            ))
+        
+        else:
+            raise ValueError(f"Unknown CLAUDE.md stage: {stage}")
+        
+        return sections
+    
+    def stage_dependencies(self, stage: str, sections: List[RenderedSection]) -> Set[str]:
+        """
+        Get the configuration fields a rendered stage depends on.
+        
+        These are the fields that choose the stage's templates plus every
+        field the consulted templates read, so a stage rendered from a
+        partial configuration can be reused for all configurations that
+        agree on these fields.
+        
+        Args:
+            stage: Stage name
+            sections: The stage's sections from render_stage
+            
+        Returns:
+            Configuration field names
+        """
+        sources = {source for section in sections for source in section.sources}
+        if stage in STAGE_PARTIALS:
+            sources.add(f"partials/{STAGE_PARTIALS[stage]}.md")
+        
+        dependencies = set(dict(self.SECTION_STAGES)[stage])
+        for source in sources:
+            try:
+                names = self._get_cache_entry(self.prompt_rules_dir / source).compiled.names
+            except OSError:
+                continue
+            for name in names:
+                dependencies.update(DERIVED_CONTEXT_FIELDS.get(name, (name,)))
+        return dependencies
+    
+    def _framework_sources(self, framework: str) -> Tuple[str, ...]:
+        """Get the template files a framework section is built from (dependencies first)."""
+        return tuple(
+            f"frameworks/{FRAMEWORK_FILES[fw]}.md"
+            for fw in FRAMEWORK_DEPENDENCIES.get(framework, []) + [framework]
+            if fw in FRAMEWORK_FILES
+        )
+    
+    def _resolve_rule_imports(self, context: dict, selection: Optional[SectionSelection],
+                              rules_dir: Optional[str] = None) -> Dict[str, str]:
+        """
+        Decide which rule templates can be referenced with @imports.
+        
+        A template is imported only if it renders to its own text (no
+        placeholders, no section selection applies) and the installed copy
+        exists. Existence is checked with one directory scan per category
+        rather than a stat per file.
+        
+        Args:
+            context: Template context from build_template_context
+            selection: Section selection in effect, if any
+            rules_dir: Installed rules directory; defaults to get_installed_rules_dir()
+            
+        Returns:
+            Mapping of template source path to its import line
+        """
+        installed_dir = Path(rules_dir).expanduser() if rules_dir else self.get_installed_rules_dir()
+        
+        candidates = ["base.md"]
+        candidates += [f"languages/{LANGUAGE_FILES[lang]}.md" for lang in context['languages'] if lang in LANGUAGE_FILES]
+        for framework in context['frameworks']:
+            candidates += self._framework_sources(framework)
+        if context['cloud_platform'] in CLOUD_FILES:
+            candidates.append(f"cloud/{CLOUD_FILES[context['cloud_platform']]}.md")
+        candidates += [f"databases/{DATABASE_FILES[db]}.md" for db in context['databases'] if db in DATABASE_FILES]
+        if context['performance_profiles']:
+            candidates += [f"performance/{PERFORMANCE_FILES[profile]}.md"
+                           for profile in context['performance_profiles'] if profile in PERFORMANCE_FILES]
+            candidates += [f"performance/{LANGUAGE_FILES[lang]}.md" for lang in context['languages'] if lang in LANGUAGE_FILES]
+        
+        importable = []
+        for source in dict.fromkeys(candidates):
+            try:
+                entry = self._get_cache_entry(self.prompt_rules_dir / source)
+            except OSError:
+                continue
+            if not entry.compiled.is_static:
+                continue
+            if selection is not None and any(selection.for_template(source[:-3])):
+                continue
+            importable.append(source)
+        
+        # One batched existence check: scan each installed category directory once
+        listings: Dict[str, Set[str]] = {}
+        for source in importable:
+            category = source.rpartition('/')[0]
+            if category not in listings:
+                try:
+                    with os.scandir(installed_dir / category) as entries:
+                        listings[category] = {entry.name for entry in entries if entry.is_file()}
+                except OSError:
+                    listings[category] = set()
+        
+        imports = {}
+        missing = []
+        display_dir = self._display_path(installed_dir)
+        for source in importable:
+            category, _, file_name = source.rpartition('/')
+            if file_name in listings[category]:
+                imports[source] = f"@{display_dir}/{source}"
+            else:
+                missing.append(source)
+        
+        if missing:
+            self.on_warning(
+                f"Warning: {len(missing)} rule template(s) not installed in {installed_dir}; "
+                f"inlining them instead (run 'new-claude rules install')"
+            )
+        return imports
+    
+    def rule_imports_state(self, config: dict) -> Optional[Dict[str, Any]]:
+        """
+        Describe the installed rules a render in import mode depends on.
+        
+        Whether a template is imported or inlined depends on which installed
+        copies exist (see _resolve_rule_imports), so caches of rendered
+        output must include this state in their keys.
+        
+        Args:
+            config: User configuration dictionary
+            
+        Returns:
+            The installed rules directory and the templates present in it,
+            or None if the configuration does not use import mode
+        """
+        if config.get('rules_mode') != 'import':
+            return None
+        rules_dir = config.get('rules_dir')
+        installed_dir = Path(rules_dir).expanduser() if rules_dir else self.get_installed_rules_dir()
+        installed = []
+        try:
+            with os.scandir(installed_dir) as categories:
+                for category in categories:
+                    if category.is_dir():
+                        with os.scandir(category.path) as entries:
+                            installed += [f"{category.name}/{entry.name}" for entry in entries if entry.is_file()]
+                    elif category.is_file():
+                        installed.append(category.name)
+        except OSError:
+            pass
+        return {'dir': str(installed_dir), 'installed': sorted(installed)}
+    
+    def get_installed_rules_dir(self) -> Path:
+        """
+        Get the versioned directory the current template bundle installs to.
+        
+        The version combines the generator version with a prefix of the
+        template bundle hash, so edited templates install side by side with
+        the versions existing projects already reference.
+        
+        Returns:
+            Path to the installed rules directory
+        """
+        version = f"{GENERATOR_VERSION}-{self.get_template_bundle_hash()[:12]}"
+        return get_installed_rules_root() / version
+    
+    def install_rules(self, target_dir: Optional[Path] = None) -> Path:
+        """
+        Install the template bundle into a versioned rules directory.
+        
+        Installation is idempotent and atomic: the bundle is copied to a
+        temporary sibling directory and renamed into place.
+        
+        Args:
+            target_dir: Destination; defaults to get_installed_rules_dir()
+            
+        Returns:
+            Path to the installed rules directory
+            
+        Raises:
+            OSError: If the bundle cannot be copied
+        """
+        target_dir = Path(target_dir) if target_dir else self.get_installed_rules_dir()
+        if target_dir.is_dir():
+            return target_dir
         
-        return '\n'.join(content_parts)
+        target_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=".install-", dir=target_dir.parent))
+        try:
+            for template_path in self.prompt_rules_dir.rglob("*.md"):
+                destination = staging_dir / template_path.relative_to(self.prompt_rules_dir)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                content = self._read_template(template_path)
+                if TAG_COMMENT_PREFIX in content:
+                    # Imported copies read like inlined ones: without tag comments
+                    destination.write_text(SectionTree(content).extract([], []), encoding='utf-8')
+                else:
+                    shutil.copyfile(template_path, destination)
+            os.replace(staging_dir, target_dir)
+        except OSError:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            if not target_dir.is_dir():
+                raise
+        return target_dir
+    
+    @staticmethod
+    def _display_path(path: Path) -> str:
+        """Format a path for an @import, using ~ for the home directory."""
+        try:
+            return "~/" + path.relative_to(Path.home()).as_posix()
+        except ValueError:
+            return path.as_posix()
     
     def _get_current_date(self) -> str:
-        """Get the current date in a readable format."""
-        from datetime import datetime
+        """Get the current date in a readable format (honours SOURCE_DATE_EPOCH)."""
+        source_date_epoch = os.environ.get('SOURCE_DATE_EPOCH')
+        if source_date_epoch:
+            try:
+                pinned = datetime.fromtimestamp(int(source_date_epoch), tz=timezone.utc)
+                return pinned.strftime("%Y-%m-%d %H:%M:%S")
+            except (ValueError, OverflowError, OSError):
+                pass
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
+    def get_template_bundle_hash(self) -> str:
+        """
+        Compute a content hash over every template in the prompt rules directory.
+        
+        Returns:
+            Hex SHA-256 digest of the template bundle (paths and contents)
+        """
+        digest = hashlib.sha256()
+        if self.prompt_rules_dir.exists():
+            for template_path in sorted(self.prompt_rules_dir.rglob("*.md")):
+                relative_path = template_path.relative_to(self.prompt_rules_dir).as_posix()
+                digest.update(relative_path.encode('utf-8') + b'\0')
+                digest.update(template_path.read_bytes() + b'\0')
+        return digest.hexdigest()
+    
     def get_available_templates(self) -> dict:
         """
         Get information about available templates.
@@ -279,7 +871,8 @@ This might include:
             'languages': [],
             'frameworks': [],
             'cloud_platforms': [],
-            'databases': []
+            'databases': [],
+            'performance_profiles': []
         }
         
         # Check language templates
@@ -310,4 +903,11 @@ This might include:
                 if (databases_dir / f"{db_name}.md").exists():
                     info['databases'].append(db_file)
         
+        # Check performance templates
+        performance_dir = self.prompt_rules_dir / "performance"
+        if performance_dir.exists():
+            for profile, profile_name in PERFORMANCE_FILES.items():
+                if (performance_dir / f"{profile_name}.md").exists():
+                    info['performance_profiles'].append(profile)
+        
         return info
\ No newline at end of file
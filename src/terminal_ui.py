@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Buffered, diff-redrawing terminal menus for the interactive wizard.
+
+Each screen is composed in memory and sent in a single write; only the
+lines that changed since the previous frame are rewritten (using ANSI
+cursor movement), so arrow keys and type-ahead stay responsive over slow
+SSH links. Terminals without cursor control fall back to the plain
+numbered prompts in PromptManager.
+"""
+
+import os
+import shutil
+import sys
+from contextlib import closing
+from typing import Iterator, List, Optional, TextIO
+from config import Colors
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows
+    termios = None
+    tty = None
+
+
+CLEAR_LINE = "\x1b[2K"
+CLEAR_BELOW = "\x1b[J"
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+
+KEY_UP = "up"
+KEY_DOWN = "down"
+KEY_ENTER = "enter"
+KEY_ESCAPE = "escape"
+KEY_BACKSPACE = "backspace"
+KEY_SPACE = "space"
+
+_ESCAPE_SEQUENCES = {
+    "\x1b[A": KEY_UP, "\x1bOA": KEY_UP,
+    "\x1b[B": KEY_DOWN, "\x1bOB": KEY_DOWN,
+}
+
+
+def supports_interactive_menus(stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None) -> bool:
+    """
+    Check whether the diff-redrawing menus can be used.
+
+    Requires a real terminal on both ends that understands ANSI cursor
+    control; NEW_CLAUDE_PLAIN=1 forces the numbered prompts.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    if termios is None or os.environ.get('NEW_CLAUDE_PLAIN'):
+        return False
+    if os.environ.get('TERM', 'dumb') in ('', 'dumb'):
+        return False
+    try:
+        return stdin.isatty() and stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def parse_keys(data: str) -> Iterator[str]:
+    """
+    Split raw terminal input into key names and printable characters.
+
+    A single read may hold several keys (type-ahead or paste), so the
+    whole chunk is decoded rather than just its first key.
+    """
+    position = 0
+    while position < len(data):
+        char = data[position]
+        if char == "\x1b":
+            sequence = data[position:position + 3]
+            if sequence in _ESCAPE_SEQUENCES:
+                yield _ESCAPE_SEQUENCES[sequence]
+                position += 3
+                continue
+            if len(sequence) == 3 and sequence[1] in "[O":
+                position += 3  # Other cursor/function keys are ignored
+                continue
+            yield KEY_ESCAPE
+        elif char in "\r\n":
+            yield KEY_ENTER
+        elif char in "\x7f\x08":
+            yield KEY_BACKSPACE
+        elif char == " ":
+            yield KEY_SPACE
+        elif char == "\x03":
+            raise KeyboardInterrupt
+        elif char.isprintable():
+            yield char
+        position += 1
+
+
+class ScreenRenderer:
+    """Redraws a block of lines in place, rewriting only what changed."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+        self._lines: List[str] = []
+
+    def draw(self, lines: List[str]) -> None:
+        """
+        Replace the previous frame with new lines in one write.
+
+        The cursor is kept at the start of the line below the frame.
+        """
+        previous = self._lines
+        first_changed = 0
+        while (first_changed < len(previous) and first_changed < len(lines)
+               and previous[first_changed] == lines[first_changed]):
+            first_changed += 1
+        if first_changed == len(previous) == len(lines):
+            return
+
+        buffer = []
+        rows_up = len(previous) - first_changed
+        if rows_up:
+            buffer.append(f"\x1b[{rows_up}A")
+        buffer.append("\r")
+        for row in range(first_changed, len(lines)):
+            if row < len(previous) and previous[row] == lines[row]:
+                buffer.append("\x1b[B")
+            else:
+                buffer.append(f"{CLEAR_LINE}{lines[row]}\n")
+        if len(lines) < len(previous):
+            buffer.append(CLEAR_BELOW)
+
+        self.stream.write(''.join(buffer))
+        self.stream.flush()
+        self._lines = list(lines)
+
+    def reset(self) -> None:
+        """Forget the current frame so the next one is drawn below it."""
+        self._lines = []
+
+
+class InteractiveMenu:
+    """Arrow-key menus with type-ahead filtering, drawn with ScreenRenderer."""
+
+    def __init__(self, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None):
+        self.stdin = stdin or sys.stdin
+        self.stdout = stdout or sys.stdout
+        self.renderer = ScreenRenderer(self.stdout)
+        self.colors = Colors()
+
+    def select_single(self, title: str, options: List[str], allow_skip: bool = True) -> Optional[str]:
+        """
+        Let the user pick one option.
+
+        Args:
+            title: The question/prompt title
+            options: List of options to choose from
+            allow_skip: Whether Esc (or typing 0) skips the question
+
+        Returns:
+            Selected option or None if skipped
+        """
+        hint = "Type to filter · ↑/↓ move · Enter select" + (" · Esc skip" if allow_skip else "")
+        state = _MenuState(options)
+
+        with closing(self._key_loop(lambda: self._frame(title, hint, state))) as keys:
+            for key in keys:
+                if key == KEY_ENTER:
+                    if allow_skip and state.query == "0":
+                        return self._finish(title, None)
+                    choice = state.current()
+                    if choice is not None:
+                        return self._finish(title, choice)
+                elif key == KEY_ESCAPE:
+                    if allow_skip:
+                        return self._finish(title, None)
+                    state.set_query("")
+                else:
+                    state.handle(key)
+        return None
+
+    def select_multiple(self, title: str, options: List[str]) -> List[str]:
+        """
+        Let the user pick any number of options.
+
+        Space (or Enter while filtering) toggles the highlighted option;
+        once a filter is typed, Space extends it instead so multi-word
+        options can be found. Enter with an empty filter finishes.
+
+        Args:
+            title: The question/prompt title
+            options: List of options to choose from
+
+        Returns:
+            List of selected options, in the order they were picked
+        """
+        hint = "Type to filter · ↑/↓ move · Space toggle · Enter done"
+        state = _MenuState(options)
+        selected: List[str] = []
+
+        def toggle() -> None:
+            choice = state.current()
+            if choice is None:
+                return
+            if choice in selected:
+                selected.remove(choice)
+            else:
+                selected.append(choice)
+
+        with closing(self._key_loop(lambda: self._frame(title, hint, state, selected))) as keys:
+            for key in keys:
+                if key == KEY_ENTER:
+                    if not state.query or state.query == "0":
+                        break
+                    toggle()
+                    state.set_query("")
+                elif key == KEY_SPACE and not state.query:
+                    toggle()
+                elif key == KEY_ESCAPE:
+                    state.set_query("")
+                else:
+                    state.handle(key)
+
+        self._finish(title, ", ".join(selected) if selected else None)
+        return selected
+
+    def _key_loop(self, frame) -> Iterator[str]:
+        """Yield keys in cbreak mode, redrawing the frame before each read."""
+        fd = self.stdin.fileno()
+        saved_attributes = termios.tcgetattr(fd)
+        self.stdout.write(HIDE_CURSOR + "\n")
+        self.renderer.reset()
+        try:
+            tty.setcbreak(fd)
+            while True:
+                self.renderer.draw(frame())
+                data = os.read(fd, 1024).decode('utf-8', errors='ignore')
+                if not data:
+                    return
+                for key in parse_keys(data):
+                    yield key
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved_attributes)
+            self.stdout.write(SHOW_CURSOR)
+            self.stdout.flush()
+
+    def _frame(self, title: str, hint: str, state: '_MenuState',
+               selected: Optional[List[str]] = None) -> List[str]:
+        """Compose the lines of one screen."""
+        c = self.colors
+        columns, rows = shutil.get_terminal_size((80, 24))
+        width = max(20, columns - 2)
+
+        lines = [
+            f"{c.BLUE}{_fit(title, width)}{c.NC}",
+            f"{c.BROWN}{_fit(hint, width)}{c.NC}",
+            f"👉 {state.query}{c.CYAN}▏{c.NC}",
+        ]
+
+        matches = state.matches
+        if not matches:
+            lines.append(f"{c.RED}  No matching options{c.NC}")
+        window = max(3, rows - 6 - (1 if selected else 0))
+        start = min(max(0, state.cursor - window // 2), max(0, len(matches) - window))
+        for position in range(start, min(len(matches), start + window)):
+            index = matches[position]
+            option = state.options[index]
+            mark = "✅" if selected is not None and option in selected else "  "
+            text = _fit(f"{index + 1}) {option}", width - 6)
+            if position == state.cursor:
+                lines.append(f"{c.CYAN}❯ {mark} {text}{c.NC}")
+            else:
+                lines.append(f"  {mark} {text}")
+        hidden = len(matches) - min(len(matches), window)
+        if hidden:
+            lines.append(f"{c.BROWN}  … {hidden} more (type to filter){c.NC}")
+        if selected:
+            lines.append(f"{c.GREEN}{_fit('Selected: ' + ', '.join(selected), width)}{c.NC}")
+        return lines
+
+    def _finish(self, title: str, choice: Optional[str]) -> Optional[str]:
+        """Collapse the menu to its title and the outcome."""
+        c = self.colors
+        outcome = f"{c.GREEN}✅ Selected: {choice}{c.NC}" if choice else f"{c.BROWN}Skipped{c.NC}"
+        self.renderer.draw([f"{c.BLUE}{title}{c.NC}", outcome])
+        self.renderer.reset()
+        return choice
+
+
+class _MenuState:
+    """Filter text, the options it matches and the highlighted match."""
+
+    def __init__(self, options: List[str]):
+        self.options = options
+        self._lowered = [option.lower() for option in options]
+        self.query = ""
+        self.matches = list(range(len(options)))
+        self.cursor = 0
+
+    def set_query(self, query: str) -> None:
+        """Change the filter and recompute matches."""
+        self.query = query
+        if query.isdigit():
+            # A number jumps to that option, as in the numbered prompts
+            number = int(query)
+            self.matches = list(range(len(self.options)))
+            self.cursor = number - 1 if 1 <= number <= len(self.options) else 0
+            return
+        needle = query.lower()
+        self.matches = [index for index, option in enumerate(self._lowered) if needle in option]
+        self.cursor = 0
+
+    def handle(self, key: str) -> None:
+        """Apply a movement or editing key."""
+        if key == KEY_UP:
+            self.cursor = max(0, self.cursor - 1)
+        elif key == KEY_DOWN:
+            self.cursor = min(len(self.matches) - 1, self.cursor + 1) if self.matches else 0
+        elif key == KEY_BACKSPACE:
+            self.set_query(self.query[:-1])
+        elif key == KEY_SPACE:
+            self.set_query(self.query + " ")
+        elif len(key) == 1:
+            self.set_query(self.query + key)
+
+    def current(self) -> Optional[str]:
+        """Get the highlighted option."""
+        if not self.matches:
+            return None
+        return self.options[self.matches[self.cursor]]
+
+
+def _fit(text: str, width: int) -> str:
+    """Truncate text so a frame line never wraps (wrapping would break redraws)."""
+    return text if len(text) <= width else text[:width - 1] + "…"